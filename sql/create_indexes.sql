@@ -1,8 +1,8 @@
 -- ÍNDICES
+-- Projetados para as consultas da camada Gold
+-- (planos conferidos por src/pipeline/manage_indexes.py a cada execução)
 
-CREATE INDEX IF NOT EXISTS idx_fato_tempo ON FatoDesmatamento (id_tempo);
-CREATE INDEX IF NOT EXISTS idx_fato_localidade ON FatoDesmatamento (id_localidade);
-CREATE INDEX IF NOT EXISTS idx_fato_tipo ON FatoDesmatamento (id_tipo);
-CREATE INDEX IF NOT EXISTS idx_dimtempo_ano ON DimTempo (ano);
-CREATE INDEX IF NOT EXISTS idx_dimlocalidade_estado ON DimLocalidade (estado);
-CREATE INDEX IF NOT EXISTS idx_dimtipo_tipo ON DimTipoDegradacao (tipo_degradacao);
\ No newline at end of file
+-- Composto e de cobertura: atende sem ler a tabela fato
+--   * a agregação da Gold (GROUP BY id_tempo, id_localidade, id_tipo + SUM(area_km))
+--   * o filtro da atualização incremental da Gold (id_tempo, id_localidade, id_tipo)
+CREATE INDEX IF NOT EXISTS idx_fato_tempo_localidade_tipo ON FatoDesmatamento (id_tempo, id_localidade, id_tipo, area_km);
@@ -0,0 +1,167 @@
+# Benchmark da pipeline completa com dados sintéticos
+# Para cada tamanho, gera (ou reaproveita) uma Silver sintética determinística,
+# executa a pipeline em um banco novo e registra as métricas de cada etapa
+# (cargas, índices, Gold e validações) em um CSV acumulado entre execuções.
+#
+# Uso: python src/benchmarks/benchmark_pipeline.py [--tamanhos 1000000 10000000 50000000]
+#                                                   [--streaming [TAMANHO_CHUNK]] [--saida arquivo.csv]
+
+import argparse
+import csv
+import os
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Reaproveita as funções da pipeline (pipeline -> src)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'pipeline'))
+
+from utils import configurar_logs, TAMANHO_CHUNK_SILVER
+from run_pipeline import executar_pipeline
+from synthetic_silver import gerar_silver_sintetica, SEMENTE_PADRAO
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+TAMANHOS_PADRAO = [1_000_000, 10_000_000, 50_000_000]
+
+# Acima deste tamanho a pipeline roda em modo streaming (a Silver não cabe em memória)
+LIMITE_CARGA_EM_MEMORIA = 10_000_000
+
+PASTA_DADOS_PADRAO = PROJECT_ROOT / 'data' / 'benchmarks'
+ARQUIVO_RESULTADOS_PADRAO = PROJECT_ROOT / 'logs' / 'benchmark_pipeline.csv'
+
+COLUNAS_RESULTADOS = ['data_execucao', 'registros', 'modo', 'etapa', 'duracao_s', 'cpu_s', 'registros_por_s',
+                      'pico_rss_mb', 'bytes_lidos', 'sucesso', 'python', 'plataforma', 'cpus']
+
+
+def medir_pipeline(n_registros, pasta_dados, tamanho_chunk=None):
+    """
+    Executa a pipeline sobre uma Silver sintética de n_registros
+
+    Args:
+        n_registros: Tamanho da Silver sintética
+        pasta_dados: Pasta dos arquivos Silver gerados e dos bancos do benchmark
+        tamanho_chunk: Tamanho do chunk no modo streaming (None = carga em memória)
+
+    Returns:
+        Tupla (sucesso, metricas): métricas por etapa mais a etapa 'total'
+    """
+    pasta_dados.mkdir(parents=True, exist_ok=True)
+
+    caminho_silver = pasta_dados / f'silver_{n_registros}_s{SEMENTE_PADRAO}.csv'
+    if not caminho_silver.exists():
+        print(f"Gerando Silver sintética com {n_registros:,} registros: {caminho_silver}")
+        gerar_silver_sintetica(caminho_silver, n_registros)
+
+    # Banco e camada Gold novos a cada medição: mede sempre a carga completa
+    caminho_db = pasta_dados / f'benchmark_{n_registros}.db'
+    for sufixo in ('', '-wal', '-shm'):
+        Path(f"{caminho_db}{sufixo}").unlink(missing_ok=True)
+    caminho_gold = pasta_dados / f'gold_{n_registros}'
+    shutil.rmtree(caminho_gold, ignore_errors=True)
+
+    inicio = time.perf_counter()
+    resultado = executar_pipeline(caminho_silver, caminho_db, caminho_gold,
+                                  tamanho_chunk=tamanho_chunk, caminho_metricas=None)
+    tempo_total = time.perf_counter() - inicio
+    # A pipeline inteira processa os n_registros da Silver
+    total = {'etapa': 'total', 'tempo_s': tempo_total, 'cpu_s': None,
+             'registros_lidos': n_registros, 'registros_inseridos': 0,
+             'registros_por_s': round(n_registros / tempo_total, 1) if tempo_total > 0 else 0.0,
+             'pico_rss_mb': max((m['pico_rss_mb'] or 0 for m in resultado.metricas), default=None),
+             'bytes_lidos': None}
+
+    return resultado.sucesso, resultado.metricas + [total]
+
+
+def salvar_resultados(caminho_saida, linhas):
+    """
+    Acrescenta as linhas ao CSV de resultados (cria o cabeçalho se necessário)
+    """
+    caminho_saida = Path(caminho_saida)
+    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+    novo = not caminho_saida.exists()
+
+    with open(caminho_saida, 'a', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS_RESULTADOS)
+        if novo:
+            escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+def executar_benchmark(tamanhos=TAMANHOS_PADRAO, tamanho_chunk=None, pasta_dados=PASTA_DADOS_PADRAO,
+                       caminho_saida=ARQUIVO_RESULTADOS_PADRAO):
+    """
+    Mede a pipeline para cada tamanho e grava os tempos por etapa
+
+    Args:
+        tamanhos: Números de registros da Silver sintética
+        tamanho_chunk: Força o modo streaming com este chunk em todos os tamanhos
+            (None = streaming apenas acima de LIMITE_CARGA_EM_MEMORIA)
+        pasta_dados: Pasta dos arquivos gerados
+        caminho_saida: CSV onde os resultados são acumulados
+
+    Returns:
+        Lista de dicionários com os resultados
+    """
+    data_execucao = datetime.now().isoformat(timespec='seconds')
+    resultados = []
+
+    for n_registros in tamanhos:
+        chunk = tamanho_chunk
+        if chunk is None and n_registros > LIMITE_CARGA_EM_MEMORIA:
+            chunk = TAMANHO_CHUNK_SILVER
+        modo = f'streaming_{chunk}' if chunk else 'memoria'
+
+        sucesso, metricas = medir_pipeline(n_registros, Path(pasta_dados), tamanho_chunk=chunk)
+
+        print(f"\n{n_registros:,} registros ({modo}) - {'ok' if sucesso else 'FALHOU'}")
+        print(f"{'etapa':<24}{'tempo (s)':>12}{'registros/s':>16}")
+        for registro in sorted(metricas, key=lambda item: item['tempo_s'], reverse=True):
+            duracao = registro['tempo_s']
+            # Vazão pela contagem da própria etapa (metrics.py); etapas sem contagem ficam sem vazão
+            registros_por_s = (registro['registros_por_s']
+                               if registro['registros_lidos'] or registro['registros_inseridos'] else None)
+            vazao = f"{registros_por_s:,.0f}" if registros_por_s is not None else '-'
+            print(f"{registro['etapa']:<24}{duracao:>12.3f}{vazao:>16}")
+
+            resultados.append({
+                'data_execucao': data_execucao,
+                'registros': n_registros,
+                'modo': modo,
+                'etapa': registro['etapa'],
+                'duracao_s': round(duracao, 4),
+                'cpu_s': registro['cpu_s'],
+                'registros_por_s': registros_por_s if registros_por_s is not None else '',
+                'pico_rss_mb': registro['pico_rss_mb'],
+                'bytes_lidos': registro['bytes_lidos'],
+                'sucesso': sucesso,
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'cpus': os.cpu_count(),
+            })
+
+    salvar_resultados(caminho_saida, resultados)
+    print(f"\nResultados acrescentados em: {caminho_saida}")
+
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da pipeline com dados sintéticos")
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=TAMANHOS_PADRAO,
+                        help="números de registros da Silver sintética")
+    parser.add_argument('--streaming', nargs='?', type=int, const=TAMANHO_CHUNK_SILVER, default=None,
+                        metavar='TAMANHO_CHUNK', help="força o modo streaming em todos os tamanhos")
+    parser.add_argument('--pasta', type=Path, default=PASTA_DADOS_PADRAO,
+                        help="pasta dos arquivos Silver gerados e dos bancos")
+    parser.add_argument('--saida', type=Path, default=ARQUIVO_RESULTADOS_PADRAO,
+                        help="CSV onde os resultados são acumulados")
+    argumentos = parser.parse_args()
+
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'benchmark_pipeline.log')
+
+    executar_benchmark(argumentos.tamanhos, argumentos.streaming, argumentos.pasta, argumentos.saida)
@@ -0,0 +1,86 @@
+# Benchmark dos formatos da camada Silver (CSV x Parquet)
+# Compara tamanho em disco e tempo de leitura, completa e com apenas as colunas
+# usadas por cada carga da pipeline.
+#
+# Uso: python src/benchmarks/benchmark_silver_formats.py [caminho_silver.csv]
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Reaproveita as funções da pipeline (pipeline -> src)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'pipeline'))
+
+from utils import (ler_camada_silver, salvar_camada_silver,
+                   COLUNAS_DIM_TEMPO, COLUNAS_DIM_LOCALIDADE, COLUNAS_DIM_TIPO_DEGRADACAO, COLUNAS_FATO)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+
+# Leituras medidas: nome -> colunas (None = todas)
+LEITURAS = {
+    'completa': None,
+    'dim_tempo': COLUNAS_DIM_TEMPO,
+    'dim_localidade': COLUNAS_DIM_LOCALIDADE,
+    'dim_tipo_degradacao': COLUNAS_DIM_TIPO_DEGRADACAO,
+    'fato': COLUNAS_FATO,
+}
+
+REPETICOES = 3
+
+
+def medir_leitura(caminho, colunas):
+    """
+    Retorna o menor tempo (em segundos) de REPETICOES leituras
+    """
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        ler_camada_silver(caminho, colunas=colunas)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def executar_benchmark(caminho_csv=DEFAULT_SILVER_PATH):
+    """
+    Converte a Silver para Parquet em uma pasta temporária e compara os formatos
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver em CSV
+
+    Returns:
+        Lista de dicionários com os resultados de cada leitura
+    """
+    caminho_csv = Path(caminho_csv)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_parquet = Path(pasta) / 'silver.parquet'
+        salvar_camada_silver(ler_camada_silver(caminho_csv), caminho_parquet)
+
+        tamanho_csv = caminho_csv.stat().st_size
+        tamanho_parquet = caminho_parquet.stat().st_size
+
+        print(f"Tamanho em disco: CSV {tamanho_csv / 1e6:.1f} MB | "
+              f"Parquet {tamanho_parquet / 1e6:.1f} MB ({tamanho_csv / tamanho_parquet:.1f}x menor)")
+        print(f"{'leitura':<22}{'CSV (s)':>10}{'Parquet (s)':>14}{'ganho':>8}")
+
+        resultados = []
+        for nome, colunas in LEITURAS.items():
+            tempo_csv = medir_leitura(caminho_csv, colunas)
+            tempo_parquet = medir_leitura(caminho_parquet, colunas)
+            print(f"{nome:<22}{tempo_csv:>10.3f}{tempo_parquet:>14.3f}{tempo_csv / tempo_parquet:>7.1f}x")
+
+            resultados.append({
+                'leitura': nome,
+                'tempo_csv_s': tempo_csv,
+                'tempo_parquet_s': tempo_parquet,
+                'tamanho_csv_bytes': tamanho_csv,
+                'tamanho_parquet_bytes': tamanho_parquet,
+            })
+
+    return resultados
+
+
+if __name__ == "__main__":
+    executar_benchmark(*sys.argv[1:2])
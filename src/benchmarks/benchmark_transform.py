@@ -0,0 +1,120 @@
+# Benchmark das transformações da camada Silver (notebook x módulo vetorizado)
+# Gera avisos sintéticos (com classes dAAAA e datas inválidas), aplica a lógica
+# original do notebook (extract.py) e a de transform_silver.py, confere que os
+# resultados são iguais e compara os tempos.
+#
+# Uso: python src/benchmarks/benchmark_transform.py [numero_registros]
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Reaproveita o módulo de transformações da Silver (silver -> src)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'silver'))
+
+from transform_silver import transformar_avisos
+from synthetic_silver import gerar_chunk_silver, SEMENTE_PADRAO
+
+REGISTROS_PADRAO = 2_000_000
+
+# Fração dos avisos sintéticos com classe dAAAA e com data inválida
+FRACAO_TIPOS_INVALIDOS = 0.02
+FRACAO_DATAS_INVALIDAS = 0.001
+
+COLUNAS_COMPARADAS = ['estado', 'tipo_degradacao', 'data_imagem', 'area_km', 'ano', 'mes', 'dia', 'ano_mes', 'semestre']
+
+REPETICOES = 3
+
+
+def gerar_avisos(n_registros, semente=SEMENTE_PADRAO):
+    """
+    Gera avisos no formato de entrada das transformações (colunas já renomeadas)
+
+    Args:
+        n_registros: Número de registros
+        semente: Semente do gerador aleatório
+
+    Returns:
+        DataFrame com estado, tipo_degradacao, data_imagem (texto) e area_km
+    """
+    rng = np.random.default_rng(semente)
+    df = gerar_chunk_silver(n_registros, rng)[['estado', 'tipo_degradacao', 'data_imagem', 'area_km']]
+
+    tipos_invalidos = rng.random(n_registros) < FRACAO_TIPOS_INVALIDOS
+    df.loc[tipos_invalidos, 'tipo_degradacao'] = 'd' + pd.Series(
+        rng.integers(2000, 2008, tipos_invalidos.sum())).astype(str).to_numpy()
+    df.loc[rng.random(n_registros) < FRACAO_DATAS_INVALIDAS, 'data_imagem'] = 'sem data'
+
+    return df
+
+
+def transformar_como_notebook(df_avisos):
+    """
+    Lógica original do notebook (extract.py), na mesma ordem de passos
+    Linhas sem data válida são descartadas ao final, como na Silver construída
+    """
+    df = df_avisos.copy()
+    df['data_imagem'] = pd.to_datetime(df['data_imagem'], errors='coerce')
+    df['ano'] = df['data_imagem'].dt.year
+    df['mes'] = df['data_imagem'].dt.month
+    df['dia'] = df['data_imagem'].dt.day
+    df['ano_mes'] = df['data_imagem'].dt.to_period('M').astype(str)
+
+    df = df[~df['tipo_degradacao'].str.match(r'^d\d{4}$')]
+    df = df[df['data_imagem'].notna()]
+
+    df['semestre'] = df['data_imagem'].dt.month.apply(lambda x: 1 if 1 <= x <= 6 else 2)
+
+    return df
+
+
+def medir(funcao, df_avisos):
+    """
+    Retorna (menor tempo em segundos de REPETICOES execuções, resultado)
+    """
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao(df_avisos)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def executar_benchmark(n_registros=REGISTROS_PADRAO):
+    """
+    Compara as duas implementações e confere que produzem a mesma Silver
+
+    Args:
+        n_registros: Número de avisos sintéticos
+
+    Returns:
+        Dicionário com os tempos e o resultado da comparação
+    """
+    df_avisos = gerar_avisos(n_registros)
+
+    tempo_notebook, df_notebook = medir(transformar_como_notebook, df_avisos)
+    tempo_vetorizado, (df_vetorizado, _) = medir(transformar_avisos, df_avisos)
+
+    # Mesmos valores; os tipos inteiros do módulo são mais estreitos
+    esperado = df_notebook[COLUNAS_COMPARADAS].astype(df_vetorizado[COLUNAS_COMPARADAS].dtypes.to_dict())
+    resultados_iguais = esperado.equals(df_vetorizado[COLUNAS_COMPARADAS])
+
+    print(f"Registros: {n_registros:,} ({len(df_vetorizado):,} na Silver)")
+    print(f"{'implementação':<22}{'tempo (s)':>10}")
+    print(f"{'notebook':<22}{tempo_notebook:>10.3f}")
+    print(f"{'vetorizada':<22}{tempo_vetorizado:>10.3f}")
+    print(f"Ganho: {tempo_notebook / tempo_vetorizado:.1f}x | Resultados iguais: {'sim' if resultados_iguais else 'NÃO'}")
+
+    return {
+        'registros': n_registros,
+        'tempo_notebook_s': tempo_notebook,
+        'tempo_vetorizado_s': tempo_vetorizado,
+        'resultados_iguais': resultados_iguais,
+    }
+
+
+if __name__ == "__main__":
+    resultado = executar_benchmark(*[int(valor) for valor in sys.argv[1:2]])
+    sys.exit(0 if resultado['resultados_iguais'] else 1)
@@ -0,0 +1,121 @@
+# Gerador determinístico de dados sintéticos no formato da camada Silver.
+# As distribuições imitam os dados do INPE: a maior parte dos alertas no PA,
+# MT e AM, predominância de corte raso, concentração na estação seca
+# (junho a setembro) e áreas com cauda longa (muitos polígonos pequenos).
+# A mesma semente e o mesmo tamanho de chunk geram sempre o mesmo arquivo.
+#
+# Uso: python src/benchmarks/synthetic_silver.py NUMERO_REGISTROS caminho_saida.csv [semente]
+
+import sys
+import numpy as np
+import pandas as pd
+
+# Participação aproximada de cada estado nos alertas da Amazônia Legal
+PESOS_ESTADOS = {
+    'PA': 0.38, 'MT': 0.20, 'AM': 0.16, 'RO': 0.10, 'AC': 0.06,
+    'MA': 0.05, 'RR': 0.03, 'TO': 0.015, 'AP': 0.005,
+}
+
+# Participação aproximada de cada classe de degradação
+PESOS_TIPOS = {
+    'corte raso com solo exposto': 0.45,
+    'corte raso com vegetação': 0.20,
+    'desmatamento por degradação progressiva': 0.12,
+    'cicatriz de queimada': 0.15,
+    'mineração': 0.05,
+    'floresta inundada': 0.03,
+}
+
+# Mais alertas na estação seca (junho a setembro)
+PESOS_MESES = np.array([3, 3, 4, 5, 8, 12, 15, 16, 14, 9, 6, 5], dtype=float)
+
+ANO_INICIAL = 2008
+ANO_FINAL = 2024
+
+# Área (km²) em distribuição lognormal: mediana de ~0,05 km² e cauda longa
+MEDIA_LOG_AREA = np.log(0.05)
+DESVIO_LOG_AREA = 1.3
+
+SEMENTE_PADRAO = 42
+TAMANHO_CHUNK_GERACAO = 1_000_000
+
+
+def _normalizar(pesos):
+    pesos = np.asarray(pesos, dtype=float)
+    return pesos / pesos.sum()
+
+
+def gerar_chunk_silver(n_registros, rng):
+    """
+    Gera um DataFrame com as colunas da camada Silver
+
+    Args:
+        n_registros: Número de registros
+        rng: Gerador numpy (np.random.Generator)
+
+    Returns:
+        DataFrame no formato da Silver
+    """
+    estados = rng.choice(list(PESOS_ESTADOS), n_registros, p=_normalizar(list(PESOS_ESTADOS.values())))
+    tipos = rng.choice(list(PESOS_TIPOS), n_registros, p=_normalizar(list(PESOS_TIPOS.values())))
+
+    anos = rng.integers(ANO_INICIAL, ANO_FINAL + 1, n_registros)
+    meses = rng.choice(np.arange(1, 13), n_registros, p=_normalizar(PESOS_MESES))
+    dias = rng.integers(1, 29, n_registros)
+    datas = pd.to_datetime(pd.DataFrame({'year': anos, 'month': meses, 'day': dias}))
+
+    areas = rng.lognormal(MEDIA_LOG_AREA, DESVIO_LOG_AREA, n_registros).round(6)
+
+    return pd.DataFrame({
+        'estado': estados,
+        'tipo_degradacao': tipos,
+        'data_imagem': datas.dt.strftime('%Y-%m-%d'),
+        'area_km': areas,
+        'ano': anos,
+        'mes': meses,
+        'dia': dias,
+        'ano_mes': datas.dt.strftime('%Y-%m'),
+        'semestre': np.where(meses <= 6, 1, 2),
+    })
+
+
+def gerar_silver_sintetica(caminho_saida, n_registros, semente=SEMENTE_PADRAO,
+                           tamanho_chunk=TAMANHO_CHUNK_GERACAO):
+    """
+    Gera um arquivo Silver (CSV) sintético, chunk a chunk, com memória limitada
+
+    Cada chunk usa um gerador derivado de (semente, número do chunk), então o
+    arquivo é reproduzível.
+
+    Args:
+        caminho_saida: Caminho do CSV gerado
+        n_registros: Número total de registros
+        semente: Semente dos geradores aleatórios
+        tamanho_chunk: Registros gerados e gravados por vez
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    gerados = 0
+    numero_chunk = 0
+
+    while gerados < n_registros:
+        n_chunk = min(tamanho_chunk, n_registros - gerados)
+        rng = np.random.default_rng([semente, numero_chunk])
+
+        gerar_chunk_silver(n_chunk, rng).to_csv(
+            caminho_saida, index=False, mode='w' if numero_chunk == 0 else 'a', header=numero_chunk == 0)
+
+        gerados += n_chunk
+        numero_chunk += 1
+
+    return caminho_saida
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python src/benchmarks/synthetic_silver.py NUMERO_REGISTROS caminho_saida.csv [semente]")
+        sys.exit(1)
+
+    semente = int(sys.argv[3]) if len(sys.argv) > 3 else SEMENTE_PADRAO
+    gerar_silver_sintetica(sys.argv[2], int(sys.argv[1]), semente=semente)
@@ -0,0 +1,108 @@
+# Gerenciador de conexões da pipeline.
+# Uma execução abre uma única conexão de escrita e um pool pequeno de conexões
+# somente leitura, compartilhados por todas as etapas.
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from utils import conectar_banco, criar_tabelas
+
+# Quantidade padrão de conexões somente leitura no pool
+TAMANHO_POOL_LEITURA = 2
+
+
+class GerenciadorConexoes:
+    """
+    Mantém as conexões com o Data Warehouse durante uma execução da pipeline
+
+    - escrita: conexão única usada por todas as cargas (SQLite só aceita
+      um escritor por vez)
+    - leitura(): empresta uma conexão somente leitura do pool, usada pelas
+      validações e pela camada Gold
+    - o schema (criar_tabelas) é verificado uma única vez, na abertura, e o
+      banco passa para journal em WAL (leitores concorrentes com o escritor)
+
+    Todas as conexões usam o cache de comandos preparados do sqlite3, então
+    o mesmo SQL executado por várias etapas é compilado uma única vez.
+
+    Exemplo:
+        with GerenciadorConexoes(caminho_db) as gerenciador:
+            carregar_dim_tempo(caminho_csv, caminho_db, conexao=gerenciador.escrita)
+            with gerenciador.leitura() as conexao:
+                validar_integridade_dados(caminho_db, conexao=conexao)
+    """
+
+    def __init__(self, caminho_db, tamanho_pool=TAMANHO_POOL_LEITURA):
+        """
+        Args:
+            caminho_db: Caminho para o banco de dados
+            tamanho_pool: Número máximo de conexões somente leitura
+        """
+        self.caminho_db = caminho_db
+        self.tamanho_pool = tamanho_pool
+
+        # Conexão de escrita e schema: uma única vez por execução
+        self.escrita = conectar_banco(caminho_db)
+        criar_tabelas(self.escrita)
+
+        # As etapas de leitura rodam em paralelo com as de escrita: em WAL os
+        # leitores não bloqueiam o escritor nem são bloqueados por ele (no
+        # journal de rollback, qualquer carga pequena daria "database is locked")
+        self.escrita.execute("PRAGMA journal_mode = WAL")
+
+        # Serializa o uso da conexão de escrita entre threads
+        self.trava_escrita = threading.Lock()
+
+        self._pool = queue.LifoQueue()
+        self._conexoes_leitura = []
+        self._trava_pool = threading.Lock()
+
+        logging.info(f"🔗 Gerenciador de conexões aberto: {caminho_db}")
+
+    @contextmanager
+    def leitura(self):
+        """
+        Empresta uma conexão somente leitura do pool
+        Abre uma nova conexão enquanto o pool não atingiu o tamanho máximo;
+        depois disso, espera uma conexão ser devolvida.
+        """
+        conexao = self._obter_conexao_leitura()
+        try:
+            yield conexao
+        finally:
+            self._pool.put(conexao)
+
+    def _obter_conexao_leitura(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._trava_pool:
+            if len(self._conexoes_leitura) < self.tamanho_pool:
+                conexao = conectar_banco(self.caminho_db, somente_leitura=True)
+                self._conexoes_leitura.append(conexao)
+                return conexao
+
+        return self._pool.get()
+
+    def fechar(self):
+        """
+        Fecha a conexão de escrita e todas as conexões do pool
+        """
+        self.escrita.close()
+
+        for conexao in self._conexoes_leitura:
+            conexao.close()
+        self._conexoes_leitura.clear()
+
+        logging.info("🔌 Conexões com o banco de dados fechadas.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback):
+        self.fechar()
+        return False
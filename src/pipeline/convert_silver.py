@@ -0,0 +1,34 @@
+# Script para converter a camada Silver de CSV para o formato colunar (Parquet)
+# O CSV continua disponível como fallback; a pipeline usa o Parquet quando ele existe.
+
+import sys
+from pathlib import Path
+from utils import configurar_logs, ler_camada_silver, salvar_camada_silver
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_PARQUET_PATH = DEFAULT_SILVER_PATH.with_suffix('.parquet')
+
+
+def converter_silver_para_parquet(caminho_csv=DEFAULT_SILVER_PATH, caminho_parquet=DEFAULT_PARQUET_PATH):
+    """
+    Lê a Silver em CSV e grava a versão tipada em Parquet
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver em CSV
+        caminho_parquet: Caminho do arquivo Parquet de saída
+
+    Returns:
+        Caminho do arquivo Parquet gerado
+    """
+    df_silver = ler_camada_silver(caminho_csv)
+    salvar_camada_silver(df_silver, caminho_parquet)
+
+    return caminho_parquet
+
+
+if __name__ == "__main__":
+    configurar_logs()
+    converter_silver_para_parquet(*sys.argv[1:3])
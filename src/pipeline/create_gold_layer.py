@@ -2,9 +2,15 @@
 # Agrega os dados da camada Silver (Data Warehouse) e salva em um arquivo CSV.
 
 import os
+import json
+import hashlib
 import logging
+from datetime import datetime
 import pandas as pd
 from utils import conectar_banco, configurar_logs
+from materialize_gold import atualizar_gold_materializado, SQL_SELECT_GOLD
+from gold_cache import cache_consultas_gold
+from metrics import registrar_registros
 
 # --- Construção de Caminhos Absolutos ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -13,9 +19,96 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..'))
 DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, 'db', 'desmatamento.db')
 GOLD_DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'gold')
 
+# Exportação particionada por ano (uma pasta com um CSV por ano + manifesto)
+PASTA_PARTICOES = 'desmatamento_por_ano_estado'
+ARQUIVO_MANIFESTO = '_manifest.json'
+
+
+def ler_manifesto(caminho_particoes):
+    """
+    Lê o manifesto das partições da camada Gold
+
+    Args:
+        caminho_particoes (str): Pasta das partições.
+
+    Returns:
+        dict: Manifesto (vazio se ainda não existir).
+    """
+    caminho_manifesto = os.path.join(caminho_particoes, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho_manifesto):
+        return {}
+
+    with open(caminho_manifesto, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def exportar_particoes_gold(df_gold, caminho_gold):
+    """
+    Exporta a camada Gold particionada por ano.
+
+    Cada partição (ano=AAAA.csv) só é reescrita quando o conteúdo mudou: o
+    checksum SHA-256 do CSV gerado é comparado com o do manifesto. O manifesto
+    guarda, por partição, o arquivo, o número de registros e o checksum, para
+    que os consumidores atualizem apenas as partições alteradas.
+
+    Args:
+        df_gold (DataFrame): Dados agregados da camada Gold.
+        caminho_gold (str): Pasta da camada Gold.
+
+    Returns:
+        list: Anos das partições reescritas.
+    """
+    caminho_particoes = os.path.join(caminho_gold, PASTA_PARTICOES)
+    os.makedirs(caminho_particoes, exist_ok=True)
+
+    manifesto_anterior = ler_manifesto(caminho_particoes).get('particoes', {})
+    particoes = {}
+    particoes_reescritas = []
+
+    for ano, df_ano in df_gold.groupby('ano', sort=True):
+        conteudo = df_ano.to_csv(index=False, sep=';', decimal=',').encode('utf-8')
+        checksum = hashlib.sha256(conteudo).hexdigest()
+        nome_arquivo = f"ano={ano}.csv"
+        caminho_arquivo = os.path.join(caminho_particoes, nome_arquivo)
+
+        anterior = manifesto_anterior.get(str(ano))
+        if anterior is None or anterior['sha256'] != checksum or not os.path.exists(caminho_arquivo):
+            with open(caminho_arquivo, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            particoes_reescritas.append(int(ano))
+            atualizada_em = datetime.now().isoformat(timespec='seconds')
+        else:
+            atualizada_em = anterior['atualizada_em']
+
+        particoes[str(ano)] = {
+            'arquivo': nome_arquivo,
+            'registros': len(df_ano),
+            'sha256': checksum,
+            'atualizada_em': atualizada_em,
+        }
+
+    # Remove partições de anos que deixaram de existir
+    for ano, anterior in manifesto_anterior.items():
+        if ano not in particoes:
+            caminho_antigo = os.path.join(caminho_particoes, anterior['arquivo'])
+            if os.path.exists(caminho_antigo):
+                os.remove(caminho_antigo)
+
+    manifesto = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'particionado_por': 'ano',
+        'total_registros': len(df_gold),
+        'particoes': particoes,
+    }
+    with open(os.path.join(caminho_particoes, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+
+    return particoes_reescritas
+
 
 def criar_camada_gold(caminho_db=DEFAULT_DB_PATH,
-                      caminho_gold=GOLD_DATA_PATH):
+                      caminho_gold=GOLD_DATA_PATH,
+                      conexao=None):
     """
     Cria uma tabela agregada (camada Gold) a partir dos dados do Data Warehouse.
 
@@ -28,44 +121,26 @@ def criar_camada_gold(caminho_db=DEFAULT_DB_PATH,
     Args:
         caminho_db (str): Caminho para o banco de dados do DW.
         caminho_gold (str): Caminho para a pasta onde o arquivo gold será salvo.
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
     """
     logging.info("=" * 60)
     logging.info("🥇 INICIANDO CRIAÇÃO DA CAMADA GOLD")
     logging.info("=" * 60)
 
+    conexao_propria = conexao is None
+
     try:
-        # Conecta ao banco de dados
-        conexao = conectar_banco(caminho_db)
+        # Conecta ao banco de dados (ou usa a conexão da pipeline)
+        if conexao_propria:
+            conexao = conectar_banco(caminho_db)
+            logging.info(f"🔗 Conectado ao banco de dados: {caminho_db}")
         cursor = conexao.cursor()
-        logging.info(f"🔗 Conectado ao banco de dados: {caminho_db}")
-
-        # Query SQL para agregar os dados
-        query_gold = """
-        SELECT
-            t.ano,
-            strftime('%Y-%m', t.data_completa) as safra_ocorrido,
-            l.estado,
-            l.regiao,
-             CASE
-			    WHEN f.tipo_degradacao = 'corte raso com solo exposto' THEN 'Corte Raso com Solo Exposto'
-			    WHEN f.tipo_degradacao = 'corte raso com vegetação' THEN 'Corte Raso com Vegetação'
-			    WHEN f.tipo_degradacao = 'desmatamento por degradação progressiva' THEN 'Desmatamento por Degradação Progressiva'
-			    WHEN f.tipo_degradacao = 'mineração' THEN 'Mineração'
-			    WHEN f.tipo_degradacao = 'floresta inundada' THEN 'Floresta Inundada'
-			    ELSE 'Outros'
-			END AS tipo_desmatamento,
-            COUNT(f.area_km) AS qtd_ocorrencias,
-            ROUND(SUM(f.area_km), 2) as total_area_desmatada_km
-        FROM FatoDesmatamento f
-        JOIN DimTempo t ON f.id_tempo = t.id_tempo
-        JOIN DimLocalidade l ON f.id_localidade = l.id_localidade
-        GROUP BY t.ano, safra_ocorrido, l.estado, l.regiao, tipo_desmatamento
-        """
-        logging.info("📄 Executando query de agregação no banco de dados...")
 
-        # Executa a query e carrega o resultado em um DataFrame Pandas
-        df_gold = pd.read_sql_query(query_gold, conexao)
-        logging.info(f"📊 {len(df_gold)} registros agregados gerados.")
+        # Garante que a tabela materializada está atualizada (no-op se não há fatos novos)
+        atualizar_gold_materializado(caminho_db, conexao=conexao)
+
+        # A view/CSV leem a tabela materializada (a agregação é definida em materialize_gold.py)
+        query_gold = SQL_SELECT_GOLD
 
         # --- Criação da VIEW no banco de dados ---
         view_name = "vw_desmatamento_por_ano_estado"
@@ -81,19 +156,37 @@ def criar_camada_gold(caminho_db=DEFAULT_DB_PATH,
         logging.info(f"   ✅ VIEW '{view_name}' criada com sucesso no banco de dados.")
         # --- Fim da criação da VIEW ---
 
+        # Lê a view pelo cache da Gold: a validação da camada Gold reaproveita este resultado
+        logging.info("📄 Executando query de agregação no banco de dados...")
+        colunas = ['ano', 'safra_ocorrido', 'estado', 'regiao', 'tipo_desmatamento',
+                   'qtd_ocorrencias', 'total_area_desmatada_km']
+        df_gold = pd.DataFrame.from_records(
+            cache_consultas_gold.consultar(conexao, 'desmatamento_por_ano_estado'), columns=colunas)
+        logging.info(f"📊 {len(df_gold)} registros agregados gerados.")
+        registrar_registros(lidos=len(df_gold))
+
         # Garante que o diretório gold exista
         os.makedirs(caminho_gold, exist_ok=True)
 
-        # Salva o resultado em um arquivo CSV
+        # Salva as partições por ano (apenas as que mudaram)
+        particoes_reescritas = exportar_particoes_gold(df_gold, caminho_gold)
         caminho_arquivo_gold = os.path.join(caminho_gold, 'desmatamento_por_ano_estado.csv')
-        df_gold.to_csv(caminho_arquivo_gold, index=False, sep=';', decimal=',')
-        logging.info(f"✅ Camada Gold salva com sucesso em: {caminho_arquivo_gold}")
+
+        if particoes_reescritas:
+            logging.info(f"🗂️ Partições reescritas: {', '.join(map(str, particoes_reescritas))}")
+
+        # O CSV consolidado só é regravado quando alguma partição mudou
+        if particoes_reescritas or not os.path.exists(caminho_arquivo_gold):
+            df_gold.to_csv(caminho_arquivo_gold, index=False, sep=';', decimal=',')
+            logging.info(f"✅ Camada Gold salva com sucesso em: {caminho_arquivo_gold}")
+        else:
+            logging.info("✅ Nenhuma partição alterada: arquivos da camada Gold mantidos")
 
         return True
     except Exception as e:
         logging.error(f"❌ Erro ao criar a camada Gold: {e}")
     finally:
-        if 'conexao' in locals() and conexao:
+        if conexao_propria and conexao:
             conexao.close()
             logging.info("🔌 Conexão com o banco de dados fechada.")
 
@@ -6,6 +6,7 @@ from pathlib import Path
 
 # Importação absoluta a partir da raiz do pacote 'pipeline'
 from utils import conectar_banco, configurar_logs
+from materialize_gold import atualizar_gold_materializado, SQL_SELECT_GOLD
 
 # --- Construção de Caminhos Absolutos ---
 # Usando pathlib para uma manipulação de caminhos mais moderna e segura.
@@ -15,7 +16,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
 
 
-def criar_views_gold(caminho_db=DEFAULT_DB_PATH):
+def criar_views_gold(caminho_db=DEFAULT_DB_PATH, conexao=None):
     """
     Cria ou recria as views agregadas (camada Gold) no Data Warehouse.
 
@@ -24,6 +25,7 @@ def criar_views_gold(caminho_db=DEFAULT_DB_PATH):
 
     Args:
         caminho_db (str): Caminho para o banco de dados do DW.
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
 
     Returns:
         bool: True se a operação for bem-sucedida, False caso contrário.
@@ -32,33 +34,19 @@ def criar_views_gold(caminho_db=DEFAULT_DB_PATH):
     logging.info("🏗️  INICIANDO CRIAÇÃO/ATUALIZAÇÃO DE VIEWS (GOLD)")
     logging.info("=" * 60)
 
+    conexao_propria = conexao is None
+
     try:
-        conexao = conectar_banco(caminho_db)
+        if conexao_propria:
+            conexao = conectar_banco(caminho_db)
+            logging.info(f"🔗 Conectado ao banco de dados: {caminho_db}")
         cursor = conexao.cursor()
-        logging.info(f"🔗 Conectado ao banco de dados: {caminho_db}")
-
-        # Query SQL para a view de desmatamento agregado
-        query_view = """
-        SELECT
-            t.ano,
-            strftime('%Y-%m', t.data_completa) as safra_ocorrido,
-            l.estado,
-            l.regiao,
-     CASE
-			    WHEN f.tipo_degradacao = 'corte raso com solo exposto' THEN 'Corte Raso com Solo Exposto'
-			    WHEN f.tipo_degradacao = 'corte raso com vegetação' THEN 'Corte Raso com Vegetação'
-			    WHEN f.tipo_degradacao = 'desmatamento por degradação progressiva' THEN 'Desmatamento por Degradação Progressiva'
-			    WHEN f.tipo_degradacao = 'mineração' THEN 'Mineração'
-			    WHEN f.tipo_degradacao = 'floresta inundada' THEN 'Floresta Inundada'
-			    ELSE 'Outros'
-			END AS tipo_desmatamento,
-            COUNT(f.area_km) AS qtd_ocorrencias,
-            ROUND(SUM(f.area_km), 2) as total_area_desmatada_km
-        FROM FatoDesmatamento f
-        JOIN DimTempo t ON f.id_tempo = t.id_tempo
-        JOIN DimLocalidade l ON f.id_localidade = l.id_localidade
-        GROUP BY t.ano, safra_ocorrido, l.estado, l.regiao, tipo_desmatamento
-        """
+
+        # Garante que a tabela materializada está atualizada (no-op se não há fatos novos)
+        atualizar_gold_materializado(caminho_db, conexao=conexao)
+
+        # A view/CSV leem a tabela materializada (a agregação é definida em materialize_gold.py)
+        query_view = SQL_SELECT_GOLD
 
         view_name = "vw_desmatamento_agregado"
         logging.info(f"   -> Criando/Recriando a VIEW: {view_name}")
@@ -75,7 +63,7 @@ def criar_views_gold(caminho_db=DEFAULT_DB_PATH):
         logging.error(f"❌ Erro ao criar as views da camada Gold: {e}")
         return False
     finally:
-        if 'conexao' in locals() and conexao:
+        if conexao_propria and conexao:
             conexao.close()
             logging.info("🔌 Conexão com o banco de dados fechada.")
 
@@ -0,0 +1,147 @@
+# Cache de resultados das consultas conhecidas da camada Gold.
+# É um memo por processo: os resultados ficam em memória, indexados pelo nome
+# da consulta e pelos parâmetros. Cada resultado guarda a geração do banco e a
+# versão (tabela VersaoDados) das tabelas que a consulta lê, e só é reaproveitado
+# enquanto elas não mudam: uma carga em outra tabela não descarta o resultado, e
+# um banco apagado e recriado (nova geração) nunca devolve dados do anterior.
+#
+# Na pipeline, a leitura da view feita pela exportação da camada Gold é
+# reaproveitada pela validação da Gold. Processos que repetem as mesmas
+# leituras entre duas cargas (um notebook, um serviço que atende o BI) também
+# se beneficiam; o cache não é compartilhado entre processos. Em bancos
+# anteriores à VersaoDados as consultas são executadas direto, sem cache.
+
+import threading
+from collections import OrderedDict
+from utils import obter_versoes_dados
+from materialize_gold import (SQL_SELECT_GOLD, SQL_RANKING_ESTADOS_ANO, SQL_TENDENCIA_ESTADO,
+                              TABELA_GOLD, TABELA_GOLD_QUEIMADAS, TABELA_GOLD_TENDENCIA,
+                              TABELA_GOLD_RANKING)
+
+# Número máximo de resultados guardados (os menos usados recentemente saem primeiro)
+TAMANHO_CACHE_GOLD = 64
+
+# Resultados maiores que isso não são guardados (evita prender exportações inteiras em memória)
+MAX_LINHAS_RESULTADO_CACHE = 100_000
+
+# Consultas conhecidas da camada Gold (nome -> (SQL com parâmetros ?, tabelas versionadas que ela lê))
+CONSULTAS_GOLD = {
+    'desmatamento_por_ano_estado': ("""
+        SELECT ano, safra_ocorrido, estado, regiao, tipo_desmatamento,
+               qtd_ocorrencias, total_area_desmatada_km
+        FROM vw_desmatamento_por_ano_estado
+        ORDER BY ano, safra_ocorrido, estado, regiao, tipo_desmatamento
+    """, (TABELA_GOLD,)),
+    'contagem_desmatamento_por_ano_estado': (
+        "SELECT COUNT(*) FROM vw_desmatamento_por_ano_estado", (TABELA_GOLD,)),
+    'desmatamento_agregado': (SQL_SELECT_GOLD, (TABELA_GOLD,)),
+    'desmatamento_agregado_ano': (SQL_SELECT_GOLD + " WHERE ano = ?", (TABELA_GOLD,)),
+    'ranking_estados_ano': (SQL_RANKING_ESTADOS_ANO, (TABELA_GOLD_RANKING,)),
+    'tendencia_estado': (SQL_TENDENCIA_ESTADO, (TABELA_GOLD_RANKING,)),
+    'tendencia_anual': (f"""
+        SELECT ano, area_km, qtd_estados, yoy_pct, rolling3_area_km, cagr_pct
+        FROM {TABELA_GOLD_TENDENCIA}
+        ORDER BY ano
+    """, (TABELA_GOLD_TENDENCIA,)),
+    'queimadas_anual': (f"""
+        SELECT ano, total_focos, meses_observados, media_mensal, mes_pico, nome_mes_pico,
+               yoy_total, rolling3_total
+        FROM {TABELA_GOLD_QUEIMADAS}
+        ORDER BY ano
+    """, (TABELA_GOLD_QUEIMADAS,)),
+}
+
+
+class CacheConsultasGold:
+    """
+    Cache LRU (por processo), limitado em número de resultados, das consultas de CONSULTAS_GOLD
+    Um resultado deixa de valer quando a geração do banco ou a versão de alguma
+    das tabelas lidas pela consulta muda.
+    Seguro para uso entre threads (as etapas da pipeline rodam em paralelo).
+
+    Uso:
+        linhas = cache_consultas_gold.consultar(conexao, 'ranking_estados_ano', (2023,))
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_CACHE_GOLD):
+        self.tamanho_maximo = tamanho_maximo
+        self.resultados = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self._trava = threading.Lock()
+
+    def consultar(self, conexao, nome_consulta, parametros=()):
+        """
+        Executa uma consulta conhecida ou devolve o resultado guardado
+
+        Args:
+            conexao: Conexão com o banco
+            nome_consulta: Chave de CONSULTAS_GOLD
+            parametros: Valores dos parâmetros (?) da consulta
+
+        Returns:
+            Tupla com as linhas do resultado
+        """
+        sql, tabelas = CONSULTAS_GOLD[nome_consulta]
+        parametros = tuple(parametros)
+        chave = (nome_consulta, parametros)
+
+        # Sem versão (banco anterior à VersaoDados) não há como invalidar: executa direto
+        versao = obter_versoes_dados(conexao, tabelas)
+        if versao is None:
+            with self._trava:
+                self.falhas += 1
+            return tuple(conexao.execute(sql, parametros).fetchall())
+
+        with self._trava:
+            guardado = self.resultados.get(chave)
+            if guardado is not None and guardado[0] == versao:
+                self.resultados.move_to_end(chave)
+                self.acertos += 1
+                return guardado[1]
+
+            self.falhas += 1
+
+        linhas = tuple(conexao.execute(sql, parametros).fetchall())
+
+        # Só guarda se os dados não mudaram enquanto a consulta rodava
+        if len(linhas) <= MAX_LINHAS_RESULTADO_CACHE and obter_versoes_dados(conexao, tabelas) == versao:
+            with self._trava:
+                self.resultados[chave] = (versao, linhas)
+                self.resultados.move_to_end(chave)
+                while len(self.resultados) > self.tamanho_maximo:
+                    self.resultados.popitem(last=False)
+                    self.remocoes += 1
+
+        return linhas
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache (acertos, falhas, remoções, tamanho e taxa de acerto)
+        """
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'remocoes': self.remocoes,
+                'tamanho': len(self.resultados),
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            }
+
+    def limpar(self):
+        """
+        Descarta todos os resultados guardados (os contadores são mantidos)
+        """
+        with self._trava:
+            self.resultados.clear()
+
+    def __repr__(self):
+        estatisticas = self.estatisticas()
+        return (f"CacheConsultasGold(tamanho={estatisticas['tamanho']}/{self.tamanho_maximo}, "
+                f"acertos={estatisticas['acertos']}, falhas={estatisticas['falhas']})")
+
+
+# Cache compartilhado pelos módulos da pipeline
+cache_consultas_gold = CacheConsultasGold()
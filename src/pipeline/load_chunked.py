@@ -0,0 +1,146 @@
+# Script para carregar o Data Warehouse em modo streaming
+# Lê a Silver em chunks de tamanho fixo; para cada chunk insere os novos membros
+# das dimensões e depois os registros da fato. A memória fica limitada ao chunk.
+# Os índices secundários só são removidos quando um chunk traz muitos registros
+# novos: uma recarga sem mudanças mantém os índices e não precisa recriá-los.
+
+import logging
+import pandas as pd
+from pathlib import Path
+from utils import (conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela,
+                   aplicar_perfil_carga_em_massa, remover_indices_carga, recriar_indices, ResumoAvisos,
+                   COLUNAS_DIM_TEMPO, COLUNAS_DIM_LOCALIDADE, COLUNAS_DIM_TIPO_DEGRADACAO, COLUNAS_FATO,
+                   TAMANHO_CHUNK_SILVER, LIMIAR_CARGA_EM_MASSA)
+from load_dim_tempo import carregar_dim_tempo
+from load_dim_localidade import carregar_dim_localidade
+from load_dim_tipo_degradacao import carregar_dim_tipo_degradacao
+from load_fato_desmatamento import preparar_lote_fato, gravar_lote_fato, ContadorOcorrencias
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def carregar_silver_em_chunks(caminho_csv=DEFAULT_SILVER_PATH, caminho_db=DEFAULT_DB_PATH,
+                              tamanho_chunk=TAMANHO_CHUNK_SILVER, conexao=None):
+    """
+    Carrega dimensões e fato lendo a camada Silver em chunks
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver
+        caminho_db: Caminho para o banco de dados
+        tamanho_chunk: Número máximo de registros em memória por vez
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+
+    Returns:
+        Dicionário com o número de registros inseridos em cada tabela
+    """
+
+    logging.info("=" * 60)
+    logging.info(f"🌊 INICIANDO CARGA EM STREAMING (chunks de {tamanho_chunk} registros)")
+    logging.info("=" * 60)
+
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
+
+    colunas_silver = list(dict.fromkeys(COLUNAS_DIM_TEMPO + COLUNAS_DIM_LOCALIDADE +
+                                        COLUNAS_DIM_TIPO_DEGRADACAO + COLUNAS_FATO))
+    leitor = ler_camada_silver(caminho_csv, colunas=colunas_silver, tamanho_chunk=tamanho_chunk)
+
+    registros = {
+        'dim_tempo': 0,
+        'dim_localidade': 0,
+        'dim_tipo_degradacao': 0,
+        'fato_desmatamento': 0,
+    }
+    registros_existentes = 0
+    registros_com_erro = 0
+    registros_lidos = 0
+
+    # Registros sem chave acumulados em todos os chunks: um aviso por motivo ao final
+    avisos = ResumoAvisos()
+
+    # Perfil de carga em massa; as tabelas temporárias voltam para disco para a
+    # memória continuar limitada ao chunk. Os índices secundários são removidos no
+    # primeiro chunk com LIMIAR_CARGA_EM_MASSA registros novos (ou cheio de
+    # registros novos, quando o chunk é menor que o limiar)
+    aplicar_perfil_carga_em_massa(conexao)
+    conexao.execute("PRAGMA temp_store = FILE")
+    limiar_indices = min(LIMIAR_CARGA_EM_MASSA, tamanho_chunk)
+    indices_removidos = None
+
+    try:
+        ocorrencias = ContadorOcorrencias(conexao)
+
+        for numero_chunk, df_chunk in enumerate(leitor, start=1):
+            # Índice = linha na Silver inteira (o Parquet reinicia o índice a cada lote)
+            df_chunk.index = pd.RangeIndex(registros_lidos, registros_lidos + len(df_chunk))
+            registros_lidos += len(df_chunk)
+            logging.info(f"📦 Chunk {numero_chunk}: {len(df_chunk)} registros "
+                         f"({registros_lidos} lidos no total)")
+
+            # Novos membros das dimensões deste chunk
+            registros['dim_tempo'] += carregar_dim_tempo(
+                caminho_csv, caminho_db, df_silver=df_chunk[COLUNAS_DIM_TEMPO], conexao=conexao)
+            registros['dim_localidade'] += carregar_dim_localidade(
+                caminho_csv, caminho_db, df_silver=df_chunk[COLUNAS_DIM_LOCALIDADE], conexao=conexao,
+                listar_estados=numero_chunk == 1)
+            registros['dim_tipo_degradacao'] += carregar_dim_tipo_degradacao(
+                caminho_csv, caminho_db, df_silver=df_chunk[COLUNAS_DIM_TIPO_DEGRADACAO], conexao=conexao)
+
+            # Registros da fato deste chunk (os já carregados são descartados antes do INSERT)
+            df_novos, existentes = preparar_lote_fato(conexao, df_chunk[COLUNAS_FATO], ocorrencias)
+            if indices_removidos is None and len(df_novos) >= limiar_indices:
+                indices_removidos = remover_indices_carga(conexao)
+            inseridos, com_erro = gravar_lote_fato(conexao, df_novos, avisos)
+
+            # Hashes novos repetidos no próprio chunk também são ignorados pelo INSERT
+            registros['fato_desmatamento'] += inseridos
+            registros_existentes += existentes + len(df_novos) - inseridos - com_erro
+            registros_com_erro += com_erro
+    finally:
+        leitor.close()
+        if indices_removidos:
+            recriar_indices(conexao, indices_removidos)
+
+    avisos.emitir()
+
+    # Totais da etapa (substituem os registrados chunk a chunk pelas cargas internas)
+    registrar_registros(lidos=registros_lidos, inseridos=registros['fato_desmatamento'],
+                        rejeitados=registros_com_erro)
+
+    total_registros = contar_registros_tabela(conexao, 'FatoDesmatamento')
+
+    logging.info("=" * 60)
+    logging.info(f"✅ Carga em streaming concluída!")
+    logging.info(f"   • Registros lidos: {registros_lidos}")
+    logging.info(f"   • Registros inseridos na fato: {registros['fato_desmatamento']}")
+    logging.info(f"   • Registros já existentes (ignorados): {registros_existentes}")
+    logging.info(f"   • Registros com erro (em quarentena): {registros_com_erro}")
+    logging.info(f"   • Total na tabela: {total_registros}")
+    logging.info("=" * 60)
+
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    return registros
+
+
+if __name__ == "__main__":
+    # Configura logs
+    from utils import configurar_logs
+
+    configurar_logs()
+
+    # Executa a carga
+    carregar_silver_em_chunks()
@@ -3,10 +3,20 @@
 
 import logging
 import pandas as pd
-from utils import conectar_banco, ler_camada_silver, criar_tabelas, obter_regiao_por_estado, contar_registros_tabela
+from pathlib import Path
+from utils import (conectar_banco, ler_camada_silver, criar_tabelas, obter_regiao_por_estado, contar_registros_tabela,
+                   ResumoAvisos, COLUNAS_DIM_LOCALIDADE)
+from metrics import registrar_registros
 
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
-def carregar_dim_localidade(caminho_csv, caminho_db):
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def carregar_dim_localidade(caminho_csv=DEFAULT_SILVER_PATH, caminho_db=DEFAULT_DB_PATH, df_silver=None,
+                            conexao=None, listar_estados=True):
     """
     Carrega a dimensão de localidade no Data Warehouse
     Insere apenas estados que ainda não existem no banco (incremental)
@@ -14,6 +24,12 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
     Args:
         caminho_csv: Caminho para o arquivo Silver
         caminho_db: Caminho para o banco de dados
+        df_silver: DataFrame Silver já lido pela pipeline (opcional).
+            Quando informado, o arquivo não é lido novamente
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+        listar_estados: Se False, não lista no log os estados encontrados
+            (a carga em streaming lista apenas no primeiro chunk)
 
     Returns:
         Número de registros inseridos
@@ -23,20 +39,28 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
     logging.info("📍 INICIANDO CARGA DA DIMENSÃO LOCALIDADE")
     logging.info("=" * 60)
 
-    # Conecta ao banco
-    conexao = conectar_banco(caminho_db)
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
 
-    # Garante que as tabelas existem
-    criar_tabelas(conexao)
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
 
-    # Lê os dados do Silver
-    df_silver = ler_camada_silver(caminho_csv)
+    # Lê os dados do Silver (apenas as colunas usadas nesta carga)
+    if df_silver is None:
+        df_silver = ler_camada_silver(caminho_csv, colunas=COLUNAS_DIM_LOCALIDADE)
+    else:
+        df_silver = df_silver[COLUNAS_DIM_LOCALIDADE]
+
+    registrar_registros(lidos=len(df_silver))
 
     # Extrai estados únicos do arquivo
     estados_unicos = df_silver['estado'].unique()
 
     logging.info(f"🗺️ Encontrados {len(estados_unicos)} estados únicos no arquivo Silver")
-    logging.info(f"   Estados: {', '.join(sorted(estados_unicos))}")
+    if listar_estados:
+        logging.info(f"   Estados: {', '.join(sorted(estados_unicos))}")
 
     # Busca estados que já existem no banco
     cursor = conexao.cursor()
@@ -50,7 +74,8 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
 
     if len(estados_novos) == 0:
         logging.info("✅ Nenhum estado novo para inserir (todos já estão no banco)")
-        conexao.close()
+        if conexao_propria:
+            conexao.close()
         return 0
 
     logging.info(f"🆕 Estados novos para inserir: {len(estados_novos)}")
@@ -58,6 +83,7 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
 
     # Insere os novos estados no banco
     registros_inseridos = 0
+    avisos = ResumoAvisos()
 
     for estado in estados_novos:
         try:
@@ -73,7 +99,10 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
             logging.info(f"   ✓ {estado} ({regiao}) inserido")
 
         except Exception as e:
-            logging.warning(f"⚠️ Erro ao inserir estado {estado}: {str(e)}")
+            avisos.registrar(f"estados não inseridos na DimLocalidade ({type(e).__name__})",
+                             exemplos=[f"{estado}: {e}"])
+
+    avisos.emitir()
 
     # Salva as mudanças
     conexao.commit()
@@ -84,8 +113,11 @@ def carregar_dim_localidade(caminho_csv, caminho_db):
     logging.info(f"✅ {registros_inseridos} novos estados inseridos com sucesso!")
     logging.info(f"📊 Total de registros na DimLocalidade: {total_registros}")
 
-    # Fecha conexão
-    conexao.close()
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=registros_inseridos)
 
     return registros_inseridos
 
@@ -3,10 +3,20 @@
 
 import logging
 import pandas as pd
-from utils import conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela
+from pathlib import Path
+from utils import (conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela, formatar_data_dimensao,
+                   ResumoAvisos, COLUNAS_DIM_TEMPO)
+from metrics import registrar_registros
 
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
-def carregar_dim_tempo(caminho_csv, caminho_db):
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def carregar_dim_tempo(caminho_csv=DEFAULT_SILVER_PATH, caminho_db=DEFAULT_DB_PATH, df_silver=None,
+                       conexao=None):
     """
     Carrega a dimensão de tempo no Data Warehouse
     Insere apenas datas que ainda não existem no banco (incremental)
@@ -14,6 +24,10 @@ def carregar_dim_tempo(caminho_csv, caminho_db):
     Args:
         caminho_csv: Caminho para o arquivo Silver
         caminho_db: Caminho para o banco de dados
+        df_silver: DataFrame Silver já lido pela pipeline (opcional).
+            Quando informado, o arquivo não é lido novamente
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
 
     Returns:
         Número de registros inseridos
@@ -23,19 +37,27 @@ def carregar_dim_tempo(caminho_csv, caminho_db):
     logging.info("🕐 INICIANDO CARGA DA DIMENSÃO TEMPO")
     logging.info("=" * 60)
 
-    # Conecta ao banco
-    conexao = conectar_banco(caminho_db)
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
 
-    # Garante que as tabelas existem
-    criar_tabelas(conexao)
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
 
-    # Lê os dados do Silver
-    df_silver = ler_camada_silver(caminho_csv)
+    # Lê os dados do Silver (apenas as colunas usadas nesta carga)
+    if df_silver is None:
+        df_silver = ler_camada_silver(caminho_csv, colunas=COLUNAS_DIM_TEMPO)
+    else:
+        df_silver = df_silver[COLUNAS_DIM_TEMPO]
+
+    registrar_registros(lidos=len(df_silver))
 
     # Extrai datas únicas do arquivo
     df_tempo = df_silver[['data_imagem', 'ano', 'mes', 'dia', 'ano_mes', 'semestre']].copy()
     df_tempo = df_tempo.drop_duplicates(subset=['data_imagem'])
     df_tempo = df_tempo.rename(columns={'data_imagem': 'data_completa'})
+    df_tempo['data_completa'] = formatar_data_dimensao(df_tempo['data_completa'])
 
     logging.info(f"📅 Encontradas {len(df_tempo)} datas únicas no arquivo Silver")
 
@@ -51,13 +73,15 @@ def carregar_dim_tempo(caminho_csv, caminho_db):
 
     if len(df_tempo_novo) == 0:
         logging.info("✅ Nenhuma data nova para inserir (todas já estão no banco)")
-        conexao.close()
+        if conexao_propria:
+            conexao.close()
         return 0
 
     logging.info(f"🆕 Datas novas para inserir: {len(df_tempo_novo)}")
 
     # Insere as novas datas no banco
     registros_inseridos = 0
+    avisos = ResumoAvisos()
 
     for _, linha in df_tempo_novo.iterrows():
         try:
@@ -75,7 +99,10 @@ def carregar_dim_tempo(caminho_csv, caminho_db):
             registros_inseridos += 1
 
         except Exception as e:
-            logging.warning(f"⚠️ Erro ao inserir data {linha['data_completa']}: {str(e)}")
+            avisos.registrar(f"datas não inseridas na DimTempo ({type(e).__name__})",
+                             exemplos=[f"{linha['data_completa']}: {e}"])
+
+    avisos.emitir()
 
     # Salva as mudanças
     conexao.commit()
@@ -86,8 +113,11 @@ def carregar_dim_tempo(caminho_csv, caminho_db):
     logging.info(f"✅ {registros_inseridos} novas datas inseridas com sucesso!")
     logging.info(f"📊 Total de registros na DimTempo: {total_registros}")
 
-    # Fecha conexão
-    conexao.close()
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=registros_inseridos)
 
     return registros_inseridos
 
@@ -0,0 +1,112 @@
+# Script para carregar a dimensão DimTipoDegradacao
+# Lê os tipos de degradação únicos da Silver e insere no banco (incremental)
+
+import logging
+import pandas as pd
+from pathlib import Path
+from utils import (conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela,
+                   obter_rotulo_tipo_desmatamento, COLUNAS_DIM_TIPO_DEGRADACAO)
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def carregar_dim_tipo_degradacao(caminho_csv=DEFAULT_SILVER_PATH, caminho_db=DEFAULT_DB_PATH, df_silver=None,
+                                 conexao=None):
+    """
+    Carrega a dimensão de tipo de degradação no Data Warehouse
+    Insere apenas tipos que ainda não existem no banco (incremental)
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver
+        caminho_db: Caminho para o banco de dados
+        df_silver: DataFrame Silver já lido pela pipeline (opcional).
+            Quando informado, o arquivo não é lido novamente
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+
+    Returns:
+        Número de registros inseridos
+    """
+
+    logging.info("=" * 60)
+    logging.info("🏷️ INICIANDO CARGA DA DIMENSÃO TIPO DE DEGRADAÇÃO")
+    logging.info("=" * 60)
+
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
+
+    # Lê os dados do Silver (apenas as colunas usadas nesta carga)
+    if df_silver is None:
+        df_silver = ler_camada_silver(caminho_csv, colunas=COLUNAS_DIM_TIPO_DEGRADACAO)
+    else:
+        df_silver = df_silver[COLUNAS_DIM_TIPO_DEGRADACAO]
+
+    registrar_registros(lidos=len(df_silver))
+
+    # Extrai tipos únicos do arquivo
+    tipos_unicos = df_silver['tipo_degradacao'].dropna().unique()
+
+    logging.info(f"🏷️ Encontrados {len(tipos_unicos)} tipos de degradação únicos no arquivo Silver")
+
+    # Busca tipos que já existem no banco
+    cursor = conexao.cursor()
+    cursor.execute("SELECT tipo_degradacao FROM DimTipoDegradacao")
+    tipos_existentes = set([row[0] for row in cursor.fetchall()])
+
+    logging.info(f"📊 Tipos já existentes no banco: {len(tipos_existentes)}")
+
+    # Filtra apenas tipos novos (que não estão no banco)
+    tipos_novos = sorted(tipo for tipo in tipos_unicos if tipo not in tipos_existentes)
+
+    if len(tipos_novos) == 0:
+        logging.info("✅ Nenhum tipo novo para inserir (todos já estão no banco)")
+        if conexao_propria:
+            conexao.close()
+        return 0
+
+    logging.info(f"🆕 Tipos novos para inserir: {len(tipos_novos)}")
+    logging.info(f"   Novos: {', '.join(tipos_novos)}")
+
+    # Insere os novos tipos no banco, já com o rótulo canônico da camada Gold
+    cursor.executemany("""
+        INSERT INTO DimTipoDegradacao (tipo_degradacao, tipo_desmatamento)
+        VALUES (?, ?)
+    """, [(tipo, obter_rotulo_tipo_desmatamento(tipo)) for tipo in tipos_novos])
+    registros_inseridos = len(tipos_novos)
+
+    # Salva as mudanças
+    conexao.commit()
+
+    # Conta total de registros na tabela
+    total_registros = contar_registros_tabela(conexao, 'DimTipoDegradacao')
+
+    logging.info(f"✅ {registros_inseridos} novos tipos inseridos com sucesso!")
+    logging.info(f"📊 Total de registros na DimTipoDegradacao: {total_registros}")
+
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=registros_inseridos)
+
+    return registros_inseridos
+
+
+if __name__ == "__main__":
+    # Configura logs
+    from utils import configurar_logs
+
+    configurar_logs()
+
+    # Executa a carga
+    carregar_dim_tipo_degradacao()
@@ -1,9 +1,40 @@
 #Script para carregar a tabela FatoDesmatamento
 #Mapeia FKs das dimensões e insere os dados transformados
 
+import json
 import logging
+import time
+import numpy as np
 import pandas as pd
-from utils import conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela
+from datetime import datetime
+from pathlib import Path
+from utils import (conectar_banco, ler_camada_silver, criar_tabelas, contar_registros_tabela, formatar_data_dimensao,
+                   aplicar_perfil_carga_em_massa, remover_indices_carga, recriar_indices, incrementar_versao_dados,
+                   ResumoAvisos, COLUNAS_FATO, LIMIAR_CARGA_EM_MASSA, INTERVALO_LOG_PROGRESSO)
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+# Quantidade de registros enviados ao banco em cada executemany
+TAMANHO_LOTE = 50_000
+
+# Até quantas vezes o tamanho do lote a fato é lida inteira (hashes) para
+# descartar os registros já carregados, em vez de buscar hash a hash no índice
+PROPORCAO_VARREDURA_HASHES = 4
+
+# Colunas que identificam um registro da fato pelo conteúdo
+COLUNAS_CHAVE_NATURAL = ['data_imagem', 'estado', 'tipo_degradacao', 'area_km']
+
+# Motivos de rejeição: (chave da dimensão, coluna da Silver, descrição)
+MOTIVOS_SEM_CHAVE = [
+    ('id_tempo', 'data_imagem', 'data não encontrada na DimTempo'),
+    ('id_localidade', 'estado', 'estado não encontrado na DimLocalidade'),
+    ('id_tipo', 'tipo_degradacao', 'tipo não encontrado na DimTipoDegradacao'),
+]
 
 
 def buscar_id_tempo(conexao, data_completa):
@@ -42,118 +73,458 @@ def buscar_id_localidade(conexao, estado):
     return resultado[0] if resultado else None
 
 
-def carregar_fato_desmatamento(caminho_csv, caminho_db):
+class ContadorOcorrencias:
     """
-    Carrega a tabela fato de desmatamento no Data Warehouse
-    Mapeia as chaves estrangeiras das dimensões e insere os dados
+    Conta, entre os chunks de uma carga em streaming, quantas vezes cada
+    conteúdo (COLUNAS_CHAVE_NATURAL) já apareceu. Com isso a ordem de ocorrência
+    usada em calcular_hash_registro é a mesma da leitura do arquivo inteiro.
+
+    As contagens ficam em uma tabela TEMP da conexão (memória do SQLite, não do
+    Python) e são atualizadas com operações em conjunto, um chunk por vez.
+    """
+
+    def __init__(self, conexao):
+        self.conexao = conexao
+        cursor = conexao.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS ocorrencias_carga (
+                hash_conteudo INTEGER PRIMARY KEY,
+                quantidade INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS ocorrencias_chunk (
+                hash_conteudo INTEGER PRIMARY KEY,
+                quantidade INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("DELETE FROM ocorrencias_carga")
+        conexao.commit()
+
+    def registrar(self, hash_conteudo):
+        """
+        Registra as ocorrências de um chunk
+
+        Args:
+            hash_conteudo: Series com o hash do conteúdo de cada registro do chunk
+
+        Returns:
+            Series (mesmo índice) com quantas vezes o conteúdo apareceu em chunks anteriores
+        """
+        cursor = self.conexao.cursor()
+        contagem_chunk = hash_conteudo.value_counts()
+
+        cursor.execute("DELETE FROM ocorrencias_chunk")
+        cursor.executemany("INSERT INTO ocorrencias_chunk (hash_conteudo, quantidade) VALUES (?, ?)",
+                           zip(contagem_chunk.index.tolist(), contagem_chunk.tolist()))
+
+        cursor.execute("""
+            SELECT c.hash_conteudo, o.quantidade
+            FROM ocorrencias_chunk c
+            JOIN ocorrencias_carga o ON o.hash_conteudo = c.hash_conteudo
+        """)
+        anteriores = dict(cursor.fetchall())
+
+        cursor.execute("""
+            INSERT INTO ocorrencias_carga (hash_conteudo, quantidade)
+            SELECT hash_conteudo, quantidade FROM ocorrencias_chunk WHERE true
+            ON CONFLICT (hash_conteudo) DO UPDATE SET quantidade = quantidade + excluded.quantidade
+        """)
+
+        return hash_conteudo.map(anteriores).fillna(0).astype('int64')
+
+
+def calcular_hash_registro(df_silver, ocorrencias=None):
+    """
+    Calcula a chave natural de cada registro da Silver
+
+    A chave combina data, estado, tipo de degradação e área com a ordem de
+    ocorrência do registro entre linhas de conteúdo idêntico (identidade da
+    linha na origem). Assim, avisos repetidos na Silver continuam sendo
+    registros distintos, mas a mesma linha recarregada gera sempre a mesma chave.
 
     Args:
-        caminho_csv: Caminho para o arquivo Silver
-        caminho_db: Caminho para o banco de dados
+        df_silver: DataFrame com as colunas de COLUNAS_CHAVE_NATURAL
+        ocorrencias: ContadorOcorrencias da carga em streaming (opcional).
+            Soma as ocorrências vistas nos chunks anteriores
 
     Returns:
-        Número de registros inseridos
+        Series de inteiros de 64 bits com o hash de cada registro
     """
+    df_chave = df_silver[COLUNAS_CHAVE_NATURAL].assign(data_imagem=formatar_data_dimensao(df_silver['data_imagem']))
+    df_chave['ocorrencia'] = df_chave.groupby(COLUNAS_CHAVE_NATURAL, sort=False, dropna=False).cumcount()
 
-    logging.info("=" * 60)
-    logging.info("📊 INICIANDO CARGA DA TABELA FATO DESMATAMENTO")
-    logging.info("=" * 60)
+    if ocorrencias is not None:
+        hash_conteudo = pd.util.hash_pandas_object(df_chave[COLUNAS_CHAVE_NATURAL], index=False)
+        hash_conteudo = pd.Series(hash_conteudo.values.view('int64'), index=df_chave.index)
+        df_chave['ocorrencia'] += ocorrencias.registrar(hash_conteudo)
 
-    # Conecta ao banco
-    conexao = conectar_banco(caminho_db)
+    hashes = pd.util.hash_pandas_object(df_chave, index=False)
 
-    # Garante que as tabelas existem
-    criar_tabelas(conexao)
+    # SQLite armazena inteiros com sinal: reinterpreta os 64 bits sem perda
+    return pd.Series(hashes.values.view('int64'), index=df_silver.index)
 
-    # Lê os dados do Silver
-    df_silver = ler_camada_silver(caminho_csv)
 
-    logging.info(f"📄 Total de registros no arquivo Silver: {len(df_silver)}")
+def mapear_chaves_dimensoes(conexao, df_silver):
+    """
+    Resolve id_tempo, id_localidade e id_tipo para todos os registros de uma vez,
+    usando as dimensões como tabelas de lookup (join vetorizado)
 
-    # Limpa a tabela fato antes de inserir (pode ajustar conforme necessidade)
-    # Comentado para permitir execução incremental
-    # cursor = conexao.cursor()
-    # cursor.execute("DELETE FROM FatoDesmatamento")
-    # conexao.commit()
-    # logging.info("🗑️ Tabela FatoDesmatamento limpa")
+    Args:
+        conexao: Conexão com o banco
+        df_silver: DataFrame com os dados da camada Silver
 
-    # Cria um cache de IDs para melhorar performance
-    cache_tempo = {}
-    cache_localidade = {}
+    Returns:
+        Tupla (df_fato, df_sem_chave): registros com todas as chaves resolvidas
+        e registros sem correspondência em alguma das dimensões
+    """
+    df_tempo = pd.read_sql_query("SELECT id_tempo, data_completa FROM DimTempo", conexao)
+    df_localidade = pd.read_sql_query("SELECT id_localidade, estado FROM DimLocalidade", conexao)
+    df_tipo = pd.read_sql_query("SELECT id_tipo, tipo_degradacao FROM DimTipoDegradacao", conexao)
 
-    logging.info("🔍 Construindo cache de dimensões...")
+    mapa_tempo = pd.Series(df_tempo['id_tempo'].values, index=df_tempo['data_completa'])
 
-    # Cache DimTempo
-    cursor = conexao.cursor()
-    cursor.execute("SELECT id_tempo, data_completa FROM DimTempo")
-    for id_tempo, data in cursor.fetchall():
-        cache_tempo[data] = id_tempo
+    # Silver colunar traz data_imagem como data: converte só a dimensão (pequena)
+    if pd.api.types.is_datetime64_any_dtype(df_silver['data_imagem']):
+        mapa_tempo.index = pd.to_datetime(mapa_tempo.index).astype(df_silver['data_imagem'].dtype)
+    mapa_localidade = pd.Series(df_localidade['id_localidade'].values, index=df_localidade['estado'])
+    mapa_tipo = pd.Series(df_tipo['id_tipo'].values, index=df_tipo['tipo_degradacao'])
 
-    # Cache DimLocalidade
-    cursor.execute("SELECT id_localidade, estado FROM DimLocalidade")
-    for id_localidade, estado in cursor.fetchall():
-        cache_localidade[estado] = id_localidade
+    df = df_silver.copy()
+    df['id_tempo'] = df['data_imagem'].map(mapa_tempo)
+    df['id_localidade'] = df['estado'].map(mapa_localidade)
+    df['id_tipo'] = df['tipo_degradacao'].map(mapa_tipo)
 
-    logging.info(f"   ✓ Cache criado: {len(cache_tempo)} datas, {len(cache_localidade)} estados")
+    # Separa em um único passo os registros sem correspondência
+    sem_chave = df['id_tempo'].isna() | df['id_localidade'].isna() | df['id_tipo'].isna()
 
-    # Insere os dados na tabela fato
-    registros_inseridos = 0
-    registros_com_erro = 0
+    return df[~sem_chave], df[sem_chave]
 
-    logging.info("💾 Iniciando inserção dos registros...")
 
-    for indice, linha in df_silver.iterrows():
-        try:
-            # Busca os IDs das dimensões no cache
-            id_tempo = cache_tempo.get(linha['data_imagem'])
-            id_localidade = cache_localidade.get(linha['estado'])
+def filtrar_registros_existentes(conexao, df_silver):
+    """
+    Remove do lote os registros cuja chave natural (hash_registro) já está na fato
+    Sem escrita no banco: em uma recarga sem mudanças nada chega ao INSERT.
+    Se a fato não é muito maior que o lote, lê todos os hashes de uma vez (varredura
+    sequencial do índice único); senão, busca só os hashes do lote no índice, em
+    blocos de TAMANHO_LOTE passados como array JSON.
 
-            # Valida se encontrou os IDs
-            if id_tempo is None:
-                logging.warning(f"⚠️ Data não encontrada na DimTempo: {linha['data_imagem']}")
-                registros_com_erro += 1
-                continue
+    Args:
+        conexao: Conexão com o banco
+        df_silver: DataFrame com a coluna hash_registro
 
-            if id_localidade is None:
-                logging.warning(f"⚠️ Estado não encontrado na DimLocalidade: {linha['estado']}")
-                registros_com_erro += 1
-                continue
+    Returns:
+        Tupla (df_novos, registros_existentes)
+    """
+    cursor = conexao.cursor()
 
-            # Insere na tabela fato
+    # MAX(id_fato) é lido direto da árvore B: estimativa do tamanho da fato sem contar
+    cursor.execute("SELECT MAX(id_fato) FROM FatoDesmatamento")
+    tamanho_fato = cursor.fetchone()[0]
+
+    # Fato vazia (primeira carga): todos os registros são novos
+    if tamanho_fato is None or len(df_silver) == 0:
+        return df_silver, 0
+
+    if tamanho_fato <= PROPORCAO_VARREDURA_HASHES * len(df_silver):
+        cursor.execute("SELECT hash_registro FROM FatoDesmatamento")
+        existentes = np.fromiter((linha[0] for linha in cursor), dtype='int64')
+    else:
+        hashes = df_silver['hash_registro'].tolist()
+        existentes = []
+        for inicio in range(0, len(hashes), TAMANHO_LOTE):
             cursor.execute("""
-                INSERT INTO FatoDesmatamento (id_tempo, id_localidade, tipo_degradacao, area_km)
-                VALUES (?, ?, ?, ?)
-            """, (
-                id_tempo,
-                id_localidade,
-                linha['tipo_degradacao'],
-                float(linha['area_km'])
-            ))
+                SELECT f.hash_registro
+                FROM json_each(?) h
+                JOIN FatoDesmatamento f ON f.hash_registro = h.value
+            """, (json.dumps(hashes[inicio:inicio + TAMANHO_LOTE]),))
+            existentes.extend(linha[0] for linha in cursor.fetchall())
+
+    if len(existentes) == 0:
+        return df_silver, 0
+
+    ja_carregados = df_silver['hash_registro'].isin(existentes)
+
+    return df_silver[~ja_carregados], int(ja_carregados.sum())
+
+
+def inserir_fatos_em_lotes(conexao, df_fato, tamanho_lote=TAMANHO_LOTE):
+    """
+    Insere os registros da fato em lotes com executemany
+    Registros cuja chave natural (hash_registro) já existe no banco são ignorados
+
+    Args:
+        conexao: Conexão com o banco
+        df_fato: DataFrame com id_tempo, id_localidade, id_tipo, area_km e hash_registro
+        tamanho_lote: Quantidade de registros por lote
+
+    Returns:
+        Tupla (registros_inseridos, registros_ignorados)
+    """
+    cursor = conexao.cursor()
+    registros_processados = 0
+    alteracoes_antes = conexao.total_changes
+    ultimo_log = time.perf_counter()
+
+    for inicio in range(0, len(df_fato), tamanho_lote):
+        lote = df_fato.iloc[inicio:inicio + tamanho_lote]
+
+        # tolist() converte para tipos nativos do Python, aceitos pelo sqlite3
+        cursor.executemany("""
+            INSERT OR IGNORE INTO FatoDesmatamento
+                (id_tempo, id_localidade, id_tipo, area_km, hash_registro)
+            VALUES (?, ?, ?, ?, ?)
+        """, zip(
+            lote['id_tempo'].astype('int64').tolist(),
+            lote['id_localidade'].astype('int64').tolist(),
+            lote['id_tipo'].astype('int64').tolist(),
+            lote['area_km'].astype(float).tolist(),
+            lote['hash_registro'].tolist()
+        ))
 
-            registros_inseridos += 1
+        registros_processados += len(lote)
 
-            # Mostra progresso a cada 1000 registros
-            if registros_inseridos % 1000 == 0:
-                logging.info(f"   ⏳ Processados: {registros_inseridos} registros...")
+        # Progresso no máximo a cada INTERVALO_LOG_PROGRESSO segundos (e no último lote)
+        agora = time.perf_counter()
+        if agora - ultimo_log >= INTERVALO_LOG_PROGRESSO or registros_processados == len(df_fato):
+            logging.info(f"   ⏳ Processados: {registros_processados} registros...")
+            ultimo_log = agora
 
-        except Exception as e:
-            logging.warning(f"⚠️ Erro ao inserir registro {indice}: {str(e)}")
-            registros_com_erro += 1
+    registros_inseridos = conexao.total_changes - alteracoes_antes
+
+    return registros_inseridos, registros_processados - registros_inseridos
+
+
+def registrar_registros_sem_chave(df_sem_chave, avisos):
+    """
+    Contabiliza, por motivo, os registros sem correspondência nas dimensões
+
+    Args:
+        df_sem_chave: DataFrame retornado por mapear_chaves_dimensoes
+        avisos: ResumoAvisos onde as contagens e exemplos são acumulados
+    """
+    if len(df_sem_chave) == 0:
+        return
+
+    for coluna_id, coluna_valor, motivo in MOTIVOS_SEM_CHAVE:
+        valores_ausentes = df_sem_chave.loc[df_sem_chave[coluna_id].isna(), coluna_valor]
+        if len(valores_ausentes) > 0:
+            avisos.registrar(f"registros com {motivo}", exemplos=valores_ausentes.unique()[:avisos.max_exemplos],
+                             quantidade=len(valores_ausentes))
+
+
+def gravar_quarentena(conexao, df_sem_chave):
+    """
+    Grava em massa os registros sem correspondência nas dimensões na
+    QuarentenaFatoDesmatamento, com o motivo da rejeição e o índice da linha
+    de origem na Silver (índice do DataFrame)
+    Um registro já em quarentena (mesmo hash_registro) tem o motivo atualizado.
+
+    Args:
+        conexao: Conexão com o banco
+        df_sem_chave: DataFrame retornado por mapear_chaves_dimensoes (com hash_registro)
+
+    Returns:
+        Número de registros gravados
+    """
+    if len(df_sem_chave) == 0:
+        return 0
+
+    # Motivo combinado: um registro pode não ter correspondência em mais de uma dimensão
+    motivos = pd.Series('', index=df_sem_chave.index)
+    for coluna_id, _, motivo in MOTIVOS_SEM_CHAVE:
+        sem_dimensao = df_sem_chave[coluna_id].isna()
+        motivos = motivos.mask(sem_dimensao, motivos + '; ' + motivo)
+    motivos = motivos.str.removeprefix('; ')
+
+    data_quarentena = datetime.now().isoformat(timespec='seconds')
+
+    cursor = conexao.cursor()
+    cursor.executemany("""
+        INSERT INTO QuarentenaFatoDesmatamento
+            (hash_registro, indice_origem, data_imagem, estado, tipo_degradacao, area_km, motivo, data_quarentena)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (hash_registro) DO UPDATE SET
+            indice_origem = excluded.indice_origem,
+            motivo = excluded.motivo,
+            data_quarentena = excluded.data_quarentena
+    """, zip(
+        df_sem_chave['hash_registro'].tolist(),
+        df_sem_chave.index.astype('int64').tolist(),
+        formatar_data_dimensao(df_sem_chave['data_imagem']).tolist(),
+        df_sem_chave['estado'].tolist(),
+        df_sem_chave['tipo_degradacao'].tolist(),
+        df_sem_chave['area_km'].astype(float).tolist(),
+        motivos.tolist(),
+        [data_quarentena] * len(df_sem_chave)
+    ))
+
+    return len(df_sem_chave)
+
+
+def liberar_quarentena(conexao):
+    """
+    Remove da quarentena os registros que já estão na fato (carregados por uma
+    recarga da Silver ou pelo reprocessamento da quarentena)
+    Percorre só a quarentena, usando o índice único de hash_registro da fato.
+
+    Args:
+        conexao: Conexão com o banco
+
+    Returns:
+        Número de registros removidos da quarentena
+    """
+    cursor = conexao.cursor()
+    cursor.execute("""
+        DELETE FROM QuarentenaFatoDesmatamento
+        WHERE EXISTS (
+            SELECT 1 FROM FatoDesmatamento f
+            WHERE f.hash_registro = QuarentenaFatoDesmatamento.hash_registro
+        )
+    """)
+
+    return cursor.rowcount
+
+
+def preparar_lote_fato(conexao, df_silver, ocorrencias=None):
+    """
+    Calcula a chave natural de um lote e descarta os registros já carregados
+
+    Args:
+        conexao: Conexão com o banco
+        df_silver: DataFrame com as colunas de COLUNAS_FATO
+        ocorrencias: ContadorOcorrencias da carga em streaming (opcional)
+
+    Returns:
+        Tupla (df_novos, registros_existentes): registros ainda fora da fato,
+        com hash_registro, e quantos já estavam carregados
+    """
+    # A carga é incremental: a chave natural evita duplicar registros já carregados
+    df_silver = df_silver.assign(hash_registro=calcular_hash_registro(df_silver, ocorrencias))
+
+    return filtrar_registros_existentes(conexao, df_silver)
+
+
+def gravar_lote_fato(conexao, df_novos, avisos=None):
+    """
+    Grava na fato um lote já preparado (preparar_lote_fato): resolve as chaves
+    das dimensões, manda os rejeitados para a quarentena e insere os demais
+
+    Args:
+        conexao: Conexão com o banco
+        df_novos: DataFrame retornado por preparar_lote_fato
+            O índice é gravado como linha de origem na quarentena
+        avisos: ResumoAvisos compartilhado entre lotes (opcional). Sem ele, os
+            avisos do lote são emitidos ao final do próprio lote
+
+    Returns:
+        Tupla (registros_inseridos, registros_com_erro)
+    """
+    # Resolve as chaves das dimensões com um join vetorizado
+    logging.info("🔍 Mapeando chaves das dimensões...")
+    df_fato, df_sem_chave = mapear_chaves_dimensoes(conexao, df_novos)
+
+    # Contabiliza os registros sem correspondência nas dimensões (um aviso por motivo)
+    avisos_proprios = avisos is None
+    if avisos_proprios:
+        avisos = ResumoAvisos()
+    registrar_registros_sem_chave(df_sem_chave, avisos)
+    if avisos_proprios:
+        avisos.emitir()
+
+    # Rejeitados vão para a quarentena, de onde podem ser recarregados sem reler a Silver
+    gravar_quarentena(conexao, df_sem_chave)
+
+    # Insere os dados na tabela fato em lotes
+    registros_inseridos = 0
+    if len(df_fato) > 0:
+        logging.info(f"💾 Iniciando inserção de {len(df_fato)} registros em lotes de {TAMANHO_LOTE}...")
+        registros_inseridos, _ = inserir_fatos_em_lotes(conexao, df_fato)
+    liberar_quarentena(conexao)
+    if registros_inseridos > 0:
+        incrementar_versao_dados(conexao, 'FatoDesmatamento')
 
     # Salva as mudanças
     conexao.commit()
 
+    return registros_inseridos, len(df_sem_chave)
+
+
+def carregar_fato_desmatamento(caminho_csv=DEFAULT_SILVER_PATH, caminho_db=DEFAULT_DB_PATH, df_silver=None,
+                               conexao=None):
+    """
+    Carrega a tabela fato de desmatamento no Data Warehouse
+    Mapeia as chaves estrangeiras das dimensões e insere os dados
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver
+        caminho_db: Caminho para o banco de dados
+        df_silver: DataFrame Silver já lido pela pipeline (opcional).
+            Quando informado, o arquivo não é lido novamente
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+
+    Returns:
+        Número de registros inseridos
+    """
+
+    logging.info("=" * 60)
+    logging.info("📊 INICIANDO CARGA DA TABELA FATO DESMATAMENTO")
+    logging.info("=" * 60)
+
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
+
+    # Lê os dados do Silver (apenas as colunas usadas nesta carga)
+    if df_silver is None:
+        df_silver = ler_camada_silver(caminho_csv, colunas=COLUNAS_FATO)
+    else:
+        df_silver = df_silver[COLUNAS_FATO]
+
+    logging.info(f"📄 Total de registros no arquivo Silver: {len(df_silver)}")
+
+    inicio_insercao = time.perf_counter()
+    df_novos, registros_existentes = preparar_lote_fato(conexao, df_silver)
+    logging.info(f"🔑 {registros_existentes} registros já estão na fato, {len(df_novos)} a carregar")
+
+    # Só cargas com muitos registros novos usam o perfil de carga em massa e rodam
+    # sem os índices secundários (uma recarga sem mudanças mantém os índices)
+    carga_em_massa = len(df_novos) >= LIMIAR_CARGA_EM_MASSA
+    indices_removidos = []
+    if carga_em_massa:
+        aplicar_perfil_carga_em_massa(conexao)
+        indices_removidos = remover_indices_carga(conexao)
+
+    try:
+        registros_inseridos, registros_com_erro = gravar_lote_fato(conexao, df_novos)
+    finally:
+        recriar_indices(conexao, indices_removidos)
+    registros_existentes += len(df_novos) - registros_inseridos - registros_com_erro
+    tempo_insercao = time.perf_counter() - inicio_insercao
+    registrar_registros(lidos=len(df_silver), inseridos=registros_inseridos, rejeitados=registros_com_erro)
+
+    registros_por_segundo = len(df_silver) / tempo_insercao if tempo_insercao > 0 else 0
+    logging.info(f"   ⚡ {len(df_silver)} registros em {tempo_insercao:.2f}s "
+                 f"({registros_por_segundo:,.0f} registros/s)")
+
     # Estatísticas finais
     total_registros = contar_registros_tabela(conexao, 'FatoDesmatamento')
 
     logging.info("=" * 60)
     logging.info(f"✅ Carga concluída!")
     logging.info(f"   • Registros inseridos: {registros_inseridos}")
-    logging.info(f"   • Registros com erro: {registros_com_erro}")
+    logging.info(f"   • Registros já existentes (ignorados): {registros_existentes}")
+    logging.info(f"   • Registros com erro (em quarentena): {registros_com_erro}")
     logging.info(f"   • Total na tabela: {total_registros}")
     logging.info("=" * 60)
 
     # Mostra estatísticas dos dados inseridos
+    cursor = conexao.cursor()
     cursor.execute("""
         SELECT 
             COUNT(*) as total,
@@ -172,8 +543,9 @@ def carregar_fato_desmatamento(caminho_csv, caminho_db):
     logging.info(f"   • Menor área: {stats[3]:.6f} km²")
     logging.info(f"   • Maior área: {stats[4]:.2f} km²")
 
-    # Fecha conexão
-    conexao.close()
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
 
     return registros_inseridos
 
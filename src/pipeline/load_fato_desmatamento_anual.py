@@ -0,0 +1,223 @@
+# Script para carregar a tabela FatoDesmatamentoAnual
+# Lê a série anual do TerraBrasilis (data/bronze/terrabrasilis_legal_amazon_*.csv),
+# com os números no formato brasileiro (1.234,56) convertidos já na leitura,
+# converte o nome do estado na sigla da UF e grava a série no banco em massa
+
+import logging
+import pandas as pd
+from pathlib import Path
+from utils import (conectar_banco, criar_tabelas, contar_registros_tabela, obter_sigla_estado,
+                   obter_regiao_por_estado, incrementar_versao_dados, ResumoAvisos)
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_BRONZE_PATH = PROJECT_ROOT / 'data' / 'bronze'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+# Arquivos exportados do TerraBrasilis (o sufixo é a data/hora da exportação)
+PADRAO_ARQUIVO_TERRABRASILIS = 'terrabrasilis_legal_amazon_*.csv'
+
+# Colunas do arquivo e seus nomes em português
+COLUNAS_TERRABRASILIS = {
+    'year': 'ano',
+    'area km²': 'area_km',
+    'uf': 'nome_estado',
+}
+
+
+def localizar_arquivo_terrabrasilis(pasta_bronze=DEFAULT_BRONZE_PATH):
+    """
+    Localiza a exportação mais recente do TerraBrasilis na pasta Bronze
+    Os nomes terminam em _DD_MM_AAAA_<epoch em ms>: a ordem é dada pelo epoch
+    (a ordem alfabética compararia o dia do mês primeiro). Arquivos sem o
+    epoch no nome são ordenados pela data de modificação.
+
+    Args:
+        pasta_bronze: Pasta com os arquivos brutos
+
+    Returns:
+        Caminho do arquivo ou None se não houver nenhum
+    """
+    def momento_exportacao(arquivo):
+        sufixo = arquivo.stem.rsplit('_', 1)[-1]
+        return int(sufixo) if sufixo.isdigit() else int(arquivo.stat().st_mtime * 1000)
+
+    arquivos = list(Path(pasta_bronze).glob(PADRAO_ARQUIVO_TERRABRASILIS))
+
+    return max(arquivos, key=momento_exportacao) if arquivos else None
+
+
+def ler_serie_anual(caminho_arquivo):
+    """
+    Lê a série anual do TerraBrasilis
+    Separador de milhar (.) e decimal (,) são interpretados pelo leitor do
+    pandas, sem tratar a área como texto; o nome do estado é lido como categórico.
+
+    Args:
+        caminho_arquivo: Caminho para o CSV do TerraBrasilis
+
+    Returns:
+        DataFrame com ano, area_km e nome_estado
+    """
+    df = pd.read_csv(caminho_arquivo, sep=';', decimal=',', thousands='.', encoding='utf-8',
+                     usecols=list(COLUNAS_TERRABRASILIS),
+                     dtype={'year': 'int16', 'area km²': 'float64', 'uf': 'category'})
+
+    return df.rename(columns=COLUNAS_TERRABRASILIS)
+
+
+def mapear_siglas_estados(nomes_estados):
+    """
+    Converte os nomes dos estados nas siglas das UFs
+    A conversão é feita só nas categorias (um nome por estado), com cache.
+
+    Args:
+        nomes_estados: Series categórica com o nome do estado
+
+    Returns:
+        Series com a sigla da UF (nulo quando o nome não é reconhecido)
+    """
+    siglas_categorias = pd.Series([obter_sigla_estado(nome) for nome in nomes_estados.cat.categories], dtype=object)
+
+    return pd.Series(siglas_categorias.reindex(nomes_estados.cat.codes).to_numpy(), index=nomes_estados.index)
+
+
+def garantir_estados_dimensao(conexao, estados):
+    """
+    Insere na DimLocalidade os estados da série que ainda não existem
+    (a série anual cobre toda a Amazônia Legal, inclusive estados sem avisos na Silver)
+
+    Args:
+        conexao: Conexão com o banco
+        estados: Siglas dos estados
+
+    Returns:
+        Dicionário sigla -> id_localidade
+    """
+    cursor = conexao.cursor()
+    cursor.executemany("""
+        INSERT OR IGNORE INTO DimLocalidade (estado, regiao)
+        VALUES (?, ?)
+    """, [(estado, obter_regiao_por_estado(estado)) for estado in estados])
+
+    if cursor.rowcount > 0:
+        logging.info(f"🆕 {cursor.rowcount} estados inseridos na DimLocalidade")
+
+    cursor.execute("SELECT estado, id_localidade FROM DimLocalidade")
+
+    return dict(cursor.fetchall())
+
+
+def carregar_fato_desmatamento_anual(caminho_arquivo=None, caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Carrega a série anual de desmatamento por estado (TerraBrasilis) no Data Warehouse
+    Cada par (ano, estado) é gravado uma vez; reexecuções atualizam a área das
+    linhas já existentes (a série é revisada a cada exportação)
+
+    Args:
+        caminho_arquivo: Caminho para o CSV do TerraBrasilis (None usa a
+            exportação mais recente em data/bronze)
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+
+    Returns:
+        Número de registros inseridos ou atualizados
+    """
+
+    logging.info("=" * 60)
+    logging.info("📅 INICIANDO CARGA DA TABELA FATO DESMATAMENTO ANUAL")
+    logging.info("=" * 60)
+
+    if caminho_arquivo is None:
+        caminho_arquivo = localizar_arquivo_terrabrasilis()
+
+    if caminho_arquivo is None or not Path(caminho_arquivo).exists():
+        logging.warning(f"⚠️ Série anual do TerraBrasilis não encontrada em {DEFAULT_BRONZE_PATH}: carga ignorada")
+        return 0
+
+    logging.info(f"📂 Arquivo: {caminho_arquivo}")
+
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
+
+    df_anual = ler_serie_anual(caminho_arquivo)
+    df_anual['estado'] = mapear_siglas_estados(df_anual['nome_estado'])
+
+    logging.info(f"📄 {len(df_anual)} registros ({df_anual['ano'].min()}-{df_anual['ano'].max()}, "
+                 f"{df_anual['nome_estado'].nunique()} estados)")
+
+    # Registros sem estado reconhecido ou sem área não entram na fato
+    avisos = ResumoAvisos()
+    sem_estado = df_anual['estado'].isna()
+    if sem_estado.any():
+        avisos.registrar("registros com estado não reconhecido",
+                         exemplos=df_anual.loc[sem_estado, 'nome_estado'].astype(str).unique().tolist(),
+                         quantidade=int(sem_estado.sum()))
+    sem_area = df_anual['area_km'].isna() & ~sem_estado
+    if sem_area.any():
+        exemplos = [f"{ano}/{estado}" for ano, estado in df_anual.loc[sem_area, ['ano', 'estado']].itertuples(index=False)]
+        avisos.registrar("registros sem área", exemplos=exemplos, quantidade=int(sem_area.sum()))
+    avisos.emitir()
+
+    df_anual = df_anual[~(sem_estado | sem_area)]
+    registros_com_erro = int((sem_estado | sem_area).sum())
+
+    mapa_localidade = garantir_estados_dimensao(conexao, df_anual['estado'].unique().tolist())
+    id_localidade = df_anual['estado'].map(mapa_localidade)
+
+    # Gravação em massa: um único executemany; linhas sem mudança não são reescritas
+    alteracoes_antes = conexao.total_changes
+    cursor = conexao.cursor()
+    cursor.executemany("""
+        INSERT INTO FatoDesmatamentoAnual (ano, id_localidade, area_km)
+        VALUES (?, ?, ?)
+        ON CONFLICT (ano, id_localidade) DO UPDATE SET area_km = excluded.area_km
+        WHERE area_km IS NOT excluded.area_km
+    """, zip(
+        df_anual['ano'].astype('int64').tolist(),
+        id_localidade.astype('int64').tolist(),
+        df_anual['area_km'].tolist()
+    ))
+    registros_gravados = conexao.total_changes - alteracoes_antes
+    if registros_gravados > 0:
+        incrementar_versao_dados(conexao, 'FatoDesmatamentoAnual')
+    conexao.commit()
+
+    registrar_registros(lidos=len(df_anual) + registros_com_erro, inseridos=registros_gravados,
+                        rejeitados=registros_com_erro)
+
+    total_registros = contar_registros_tabela(conexao, 'FatoDesmatamentoAnual')
+
+    logging.info("=" * 60)
+    logging.info(f"✅ Carga concluída!")
+    logging.info(f"   • Registros inseridos ou atualizados: {registros_gravados}")
+    logging.info(f"   • Registros sem mudança: {len(df_anual) - registros_gravados}")
+    logging.info(f"   • Registros com erro: {registros_com_erro}")
+    logging.info(f"   • Total na tabela: {total_registros}")
+    logging.info("=" * 60)
+
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    return registros_gravados
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Configura logs
+    from utils import configurar_logs
+
+    configurar_logs()
+
+    # Executa a carga (caminho do arquivo opcional)
+    carregar_fato_desmatamento_anual(*sys.argv[1:2])
@@ -0,0 +1,178 @@
+# Script para carregar a tabela FatoQueimadas
+# Lê o histórico mensal de focos de queimadas (data/bronze/historico_regiao_amazonia_legal.csv),
+# uma linha por ano com as colunas Janeiro..Dezembro e Total, desempilha os
+# meses (formato longo) e grava um registro por mês (grão ano/mês: a DimTempo
+# é diária e não recebe dias fictícios)
+
+import json
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from utils import (conectar_banco, criar_tabelas, contar_registros_tabela, incrementar_versao_dados,
+                   ResumoAvisos, NOMES_MESES)
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_QUEIMADAS_PATH = PROJECT_ROOT / 'data' / 'bronze' / 'historico_regiao_amazonia_legal.csv'
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def ler_historico_queimadas(caminho_arquivo):
+    """
+    Lê o histórico de queimadas no formato largo (um ano por linha)
+    As linhas de resumo do arquivo (Máximo*, Média*, Mínimo*) são descartadas.
+
+    Args:
+        caminho_arquivo: Caminho para o CSV do histórico
+
+    Returns:
+        DataFrame com ano, as colunas de NOMES_MESES e Total
+    """
+    df = pd.read_csv(caminho_arquivo, index_col=0,
+                     dtype={mes: 'float64' for mes in NOMES_MESES + ['Total']})[NOMES_MESES + ['Total']]
+
+    anos = pd.to_numeric(df.index, errors='coerce')
+    df = df[~np.isnan(anos)]
+    df.insert(0, 'ano', anos[~np.isnan(anos)].astype('int16'))
+
+    return df.reset_index(drop=True)
+
+
+def desempilhar_meses(df_historico):
+    """
+    Converte o histórico largo em uma linha por ano e mês (melt vetorizado)
+    Meses sem observação (vazios no arquivo) não geram linha.
+
+    Args:
+        df_historico: DataFrame com ano e as colunas de NOMES_MESES
+
+    Returns:
+        DataFrame com ano, mes (1-12) e focos
+    """
+    df_longo = df_historico.melt(id_vars='ano', value_vars=NOMES_MESES, var_name='mes', value_name='focos')
+    df_longo['mes'] = pd.Categorical(df_longo['mes'], categories=NOMES_MESES).codes.astype('int8') + 1
+
+    return df_longo.dropna(subset=['focos']).sort_values(['ano', 'mes'], ignore_index=True)
+
+
+def conferir_totais(df_historico, avisos):
+    """
+    Confere a coluna Total do arquivo contra a soma dos meses
+
+    Args:
+        df_historico: DataFrame largo (ano, NOMES_MESES, Total)
+        avisos: ResumoAvisos onde as divergências são registradas
+    """
+    soma_meses = df_historico[NOMES_MESES].sum(axis=1)
+    divergentes = ~np.isclose(soma_meses, df_historico['Total'])
+    if divergentes.any():
+        exemplos = [f"{ano}: total {total:.0f}, soma dos meses {soma:.0f}" for ano, total, soma in
+                    zip(df_historico.loc[divergentes, 'ano'], df_historico.loc[divergentes, 'Total'],
+                        soma_meses[divergentes])]
+        avisos.registrar("anos com Total diferente da soma dos meses", exemplos=exemplos,
+                         quantidade=int(divergentes.sum()))
+
+
+def carregar_fato_queimadas(caminho_arquivo=DEFAULT_QUEIMADAS_PATH, caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Carrega a série mensal de focos de queimadas no Data Warehouse
+    Cada mês é gravado uma vez; reexecuções atualizam apenas os meses revisados
+    e removem os meses que deixaram de existir no arquivo (o arquivo traz o
+    histórico completo)
+
+    Args:
+        caminho_arquivo: Caminho para o CSV do histórico de queimadas
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada,
+            é usada sem recriar o schema e não é fechada ao final
+
+    Returns:
+        Número de registros inseridos, atualizados ou removidos
+    """
+
+    logging.info("=" * 60)
+    logging.info("🔥 INICIANDO CARGA DA TABELA FATO QUEIMADAS")
+    logging.info("=" * 60)
+
+    if not Path(caminho_arquivo).exists():
+        logging.warning(f"⚠️ Histórico de queimadas não encontrado em {caminho_arquivo}: carga ignorada")
+        return 0
+
+    logging.info(f"📂 Arquivo: {caminho_arquivo}")
+
+    # Usa a conexão da pipeline ou, na execução standalone, abre uma própria
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+
+        # Garante que as tabelas existem
+        criar_tabelas(conexao)
+
+    df_historico = ler_historico_queimadas(caminho_arquivo)
+
+    avisos = ResumoAvisos()
+    conferir_totais(df_historico, avisos)
+    avisos.emitir()
+
+    df_mensal = desempilhar_meses(df_historico)
+
+    logging.info(f"📄 {len(df_historico)} anos ({df_historico['ano'].min()}-{df_historico['ano'].max()}), "
+                 f"{len(df_mensal)} meses com observação")
+
+    # Gravação em massa: um único executemany; meses sem mudança não são reescritos
+    alteracoes_antes = conexao.total_changes
+    cursor = conexao.cursor()
+    cursor.executemany("""
+        INSERT INTO FatoQueimadas (ano, mes, focos)
+        VALUES (?, ?, ?)
+        ON CONFLICT (ano, mes) DO UPDATE SET focos = excluded.focos
+        WHERE focos IS NOT excluded.focos
+    """, zip(
+        df_mensal['ano'].astype('int64').tolist(),
+        df_mensal['mes'].astype('int64').tolist(),
+        df_mensal['focos'].astype('int64').tolist()
+    ))
+    registros_gravados = conexao.total_changes - alteracoes_antes
+
+    # Meses que saíram do arquivo (ano removido ou mês que ficou vazio)
+    chaves_mensais = (df_mensal['ano'].astype('int64') * 100 + df_mensal['mes'].astype('int64')).tolist()
+    cursor.execute("DELETE FROM FatoQueimadas WHERE ano * 100 + mes NOT IN (SELECT value FROM json_each(?))",
+                   (json.dumps(chaves_mensais),))
+    registros_removidos = cursor.rowcount
+
+    if registros_gravados + registros_removidos > 0:
+        incrementar_versao_dados(conexao, 'FatoQueimadas')
+    conexao.commit()
+
+    registrar_registros(lidos=len(df_mensal), inseridos=registros_gravados)
+
+    total_registros = contar_registros_tabela(conexao, 'FatoQueimadas')
+
+    logging.info("=" * 60)
+    logging.info(f"✅ Carga concluída!")
+    logging.info(f"   • Registros inseridos ou atualizados: {registros_gravados}")
+    logging.info(f"   • Registros sem mudança: {len(df_mensal) - registros_gravados}")
+    logging.info(f"   • Registros removidos (fora do arquivo): {registros_removidos}")
+    logging.info(f"   • Total na tabela: {total_registros}")
+    logging.info("=" * 60)
+
+    # Fecha conexão (apenas se foi aberta aqui)
+    if conexao_propria:
+        conexao.close()
+
+    return registros_gravados + registros_removidos
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Configura logs
+    from utils import configurar_logs
+
+    configurar_logs()
+
+    # Executa a carga (caminho do arquivo opcional)
+    carregar_fato_queimadas(*sys.argv[1:2])
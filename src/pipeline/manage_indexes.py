@@ -0,0 +1,192 @@
+# Script para gerenciar os índices do Data Warehouse.
+# Aplica o conjunto de índices de sql/create_indexes.sql (pensado para as
+# consultas da camada Gold), atualiza as estatísticas do planejador e registra
+# no log o EXPLAIN QUERY PLAN de cada consulta conhecida, sinalizando as
+# varreduras completas de tabela.
+
+import logging
+import sqlite3
+from pathlib import Path
+from utils import conectar_banco, configurar_logs, criar_tabelas, CAMINHO_SQL_INDICES
+from materialize_gold import (SQL_GOLD_AGREGADO, SQL_SELECT_GOLD, TABELA_GOLD, SQL_RANKING_ESTADOS_ANO,
+                              SQL_TENDENCIA_ESTADO)
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+# Índices de versões anteriores de create_indexes.sql, substituídos pelo índice
+# composto da fato ou redundantes com as restrições UNIQUE das dimensões
+INDICES_OBSOLETOS = [
+    'idx_fato_tempo',
+    'idx_fato_localidade',
+    'idx_fato_tipo',
+    'idx_dimtempo_ano',
+    'idx_dimlocalidade_estado',
+    'idx_dimtipo_tipo',
+]
+
+# Linhas amostradas por índice no ANALYZE (mantém o ANALYZE rápido em fatos grandes)
+LIMITE_ANALISE = 1000
+
+# Consultas conhecidas da pipeline: nome -> (SQL, tabelas cuja varredura completa é esperada)
+# Nas consultas da Gold, 'f' é o alias da CTE fato_agregado (já agregada), não da tabela fato
+# As checagens de chave estrangeira da validação de integridade não entram: o
+# anti-join lê todos os fatos por definição, e nenhum índice evita essa leitura
+# Parâmetros (?) são preenchidos com NULL apenas para obter o plano
+CONSULTAS_MONITORADAS = {
+    'gold_agregacao_completa': (SQL_GOLD_AGREGADO.format(filtro_fato=''), {'f'}),
+    'gold_agregacao_incremental': (SQL_GOLD_AGREGADO.format(filtro_fato="""
+        WHERE (id_tempo, id_localidade, id_tipo) IN
+            (SELECT id_tempo, id_localidade, id_tipo FROM chaves_alteradas)
+    """), {'f', 'chaves_alteradas'}),
+    'gold_exportacao': (SQL_SELECT_GOLD + " ORDER BY ano, safra_ocorrido, estado, regiao, tipo_desmatamento",
+                        {TABELA_GOLD}),
+    'tendencia_ranking_ano': (SQL_RANKING_ESTADOS_ANO, set()),
+    'tendencia_estado': (SQL_TENDENCIA_ESTADO, set()),
+}
+
+
+def aplicar_indices(caminho_db=DEFAULT_DB_PATH, conexao=None, caminho_sql=CAMINHO_SQL_INDICES):
+    """
+    Cria os índices de create_indexes.sql, remove os obsoletos e atualiza as
+    estatísticas usadas pelo planejador de consultas (ANALYZE)
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
+        caminho_sql: Arquivo SQL com as definições dos índices
+
+    Returns:
+        Lista com os nomes dos índices criados nesta execução
+    """
+    logging.info("=" * 60)
+    logging.info("🗂️ APLICANDO ÍNDICES DO DATA WAREHOUSE")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+        criar_tabelas(conexao)
+
+    cursor = conexao.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    indices_antes = {linha[0] for linha in cursor.fetchall()}
+
+    for nome in INDICES_OBSOLETOS:
+        if nome in indices_antes:
+            cursor.execute(f"DROP INDEX IF EXISTS {nome}")
+            logging.info(f"   🗑️ Índice obsoleto removido: {nome}")
+
+    cursor.executescript(Path(caminho_sql).read_text(encoding='utf-8'))
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    indices_criados = sorted({linha[0] for linha in cursor.fetchall()} - indices_antes)
+    for nome in indices_criados:
+        logging.info(f"   ✅ Índice criado: {nome}")
+
+    # Estatísticas por amostragem: o planejador passa a conhecer a seletividade dos índices
+    cursor.execute(f"PRAGMA analysis_limit = {LIMITE_ANALISE}")
+    cursor.execute("ANALYZE")
+    conexao.commit()
+
+    logging.info(f"✅ Índices aplicados ({len(indices_criados)} novos) e estatísticas atualizadas")
+
+    if conexao_propria:
+        conexao.close()
+
+    return indices_criados
+
+
+def identificar_varreduras_completas(plano):
+    """
+    Identifica, em um plano do EXPLAIN QUERY PLAN, as tabelas lidas por
+    varredura completa (SCAN sem índice). Subconsultas materializadas (CTEs)
+    não contam como tabela.
+
+    Args:
+        plano: Lista de linhas de detalhe do EXPLAIN QUERY PLAN
+
+    Returns:
+        Lista com os nomes (ou aliases) das tabelas varridas
+    """
+    subconsultas = {linha.split()[1] for linha in plano
+                    if linha.startswith(('MATERIALIZE ', 'CO-ROUTINE '))}
+
+    varreduras = []
+    for linha in plano:
+        partes = linha.split()
+        if partes[0] == 'SCAN' and 'USING' not in partes and partes[1] not in subconsultas:
+            varreduras.append(partes[1])
+
+    return varreduras
+
+
+def capturar_planos_consulta(caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Registra no log o EXPLAIN QUERY PLAN de cada consulta conhecida e sinaliza
+    varreduras completas inesperadas
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão (somente leitura) da pipeline (opcional). Quando informada, não é fechada ao final.
+
+    Returns:
+        Dicionário nome da consulta -> lista de tabelas varridas sem índice
+    """
+    logging.info("=" * 60)
+    logging.info("🧭 PLANOS DE EXECUÇÃO DAS CONSULTAS")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db, somente_leitura=True)
+
+    cursor = conexao.cursor()
+
+    # Tabela temporária usada pela atualização incremental (vazia, só para o plano)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS chaves_alteradas (
+            id_tempo INTEGER, id_localidade INTEGER, id_tipo INTEGER
+        )
+    """)
+
+    varreduras_inesperadas = {}
+
+    try:
+        for nome, (consulta, varreduras_esperadas) in CONSULTAS_MONITORADAS.items():
+            try:
+                cursor.execute("EXPLAIN QUERY PLAN " + consulta, [None] * consulta.count('?'))
+            except sqlite3.OperationalError as e:
+                logging.warning(f"   ⚠️ {nome}: plano indisponível ({e})")
+                continue
+
+            plano = [linha[3] for linha in cursor.fetchall()]
+            logging.info(f"   🔎 {nome}:")
+            for detalhe in plano:
+                logging.info(f"      {detalhe}")
+
+            varreduras = [tabela for tabela in identificar_varreduras_completas(plano)
+                          if tabela not in varreduras_esperadas]
+            if varreduras:
+                varreduras_inesperadas[nome] = varreduras
+                logging.warning(f"   ⚠️ {nome}: varredura completa sem índice em {', '.join(varreduras)}")
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS temp.chaves_alteradas")
+
+    if varreduras_inesperadas:
+        logging.warning(f"⚠️ {len(varreduras_inesperadas)} consultas com varredura completa inesperada")
+    else:
+        logging.info("✅ Nenhuma varredura completa inesperada nas consultas conhecidas")
+
+    if conexao_propria:
+        conexao.close()
+
+    return varreduras_inesperadas
+
+
+if __name__ == "__main__":
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'manage_indexes.log')
+    aplicar_indices()
+    capturar_planos_consulta()
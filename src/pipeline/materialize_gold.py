@@ -0,0 +1,490 @@
+# Script para materializar a agregação da camada Gold no Data Warehouse.
+# A query de agregação é definida uma única vez aqui; as views e o CSV da
+# camada Gold leem a tabela materializada em vez de recalcular a agregação.
+# As métricas anuais de queimadas e as tendências da série anual de
+# desmatamento (variação, CAGR, ranking e participação por estado) também são
+# materializadas aqui, para que o BI as leia por consulta pontual.
+
+import logging
+import math
+import sqlite3
+from pathlib import Path
+from utils import (conectar_banco, configurar_logs, criar_tabelas, incrementar_versao_dados, obter_versao_dados,
+                   NOMES_MESES)
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+TABELA_GOLD = 'GoldDesmatamentoAgregado'
+
+# Query de agregação da camada Gold (definição única)
+# {filtro_fato} restringe os registros da fato na atualização incremental
+SQL_GOLD_AGREGADO = """
+    WITH fato_agregado AS (
+        -- Agrega a fato pelas chaves inteiras antes de juntar as dimensões
+        SELECT
+            id_tempo,
+            id_localidade,
+            id_tipo,
+            COUNT(area_km) AS qtd_ocorrencias,
+            SUM(area_km) AS area_km
+        FROM FatoDesmatamento
+        {filtro_fato}
+        GROUP BY id_tempo, id_localidade, id_tipo
+    )
+    SELECT
+        t.ano,
+        strftime('%Y-%m', t.data_completa) as safra_ocorrido,
+        l.estado,
+        l.regiao,
+        d.tipo_desmatamento,
+        SUM(f.qtd_ocorrencias) AS qtd_ocorrencias,
+        ROUND(SUM(f.area_km), 2) as total_area_desmatada_km
+    FROM fato_agregado f
+    JOIN DimTempo t ON f.id_tempo = t.id_tempo
+    JOIN DimLocalidade l ON f.id_localidade = l.id_localidade
+    JOIN DimTipoDegradacao d ON f.id_tipo = d.id_tipo
+    GROUP BY t.ano, safra_ocorrido, l.estado, l.regiao, d.tipo_desmatamento
+"""
+
+# Leitura da tabela materializada (mesmas colunas e ordem da query original)
+SQL_SELECT_GOLD = f"""
+    SELECT ano, safra_ocorrido, estado, regiao, tipo_desmatamento,
+           qtd_ocorrencias, total_area_desmatada_km
+    FROM {TABELA_GOLD}
+"""
+
+TABELA_GOLD_QUEIMADAS = 'GoldQueimadasAnual'
+
+# Métricas anuais de queimadas, calculadas de uma vez sobre a FatoQueimadas:
+# média mensal, mês de pico (o primeiro em caso de empate), variação percentual
+# do total em relação ao ano anterior e média móvel do total em 3 anos
+SQL_GOLD_QUEIMADAS = """
+    WITH mensal AS (
+        SELECT
+            ano,
+            mes,
+            focos,
+            ROW_NUMBER() OVER (PARTITION BY ano ORDER BY focos DESC, mes) AS posicao_no_ano
+        FROM FatoQueimadas
+    ),
+    nomes_meses (mes, nome_mes) AS (
+        VALUES {valores_meses}
+    ),
+    anual AS (
+        SELECT
+            m.ano,
+            SUM(m.focos) AS total_focos,
+            COUNT(*) AS meses_observados,
+            AVG(m.focos) AS media_mensal,
+            MAX(CASE WHEN m.posicao_no_ano = 1 THEN m.mes END) AS mes_pico
+        FROM mensal m
+        GROUP BY m.ano
+    )
+    SELECT
+        a.ano,
+        a.total_focos,
+        a.meses_observados,
+        ROUND(a.media_mensal, 2) AS media_mensal,
+        a.mes_pico,
+        n.nome_mes AS nome_mes_pico,
+        ROUND((a.total_focos - LAG(a.total_focos) OVER anos) * 100.0 / LAG(a.total_focos) OVER anos, 2) AS yoy_total,
+        CASE WHEN COUNT(*) OVER tres_anos = 3 THEN ROUND(AVG(a.total_focos) OVER tres_anos, 2) END AS rolling3_total
+    FROM anual a
+    JOIN nomes_meses n ON n.mes = a.mes_pico
+    WINDOW anos AS (ORDER BY a.ano),
+           tres_anos AS (ORDER BY a.ano ROWS BETWEEN 2 PRECEDING AND CURRENT ROW)
+""".format(valores_meses=', '.join(f"({numero}, '{nome}')" for numero, nome in enumerate(NOMES_MESES, start=1)))
+
+TABELA_GOLD_TENDENCIA = 'GoldTendenciaAnual'
+TABELA_GOLD_RANKING = 'GoldRankingEstadoAnual'
+
+# Tendência do total anual (FatoDesmatamentoAnual): variação em relação ao ano
+# anterior, média móvel de 3 anos e CAGR desde o primeiro ano da série
+SQL_GOLD_TENDENCIA = """
+    WITH anual AS (
+        SELECT ano, SUM(area_km) AS area_km, COUNT(DISTINCT id_localidade) AS qtd_estados
+        FROM FatoDesmatamentoAnual
+        GROUP BY ano
+    )
+    SELECT
+        ano,
+        ROUND(area_km, 2) AS area_km,
+        qtd_estados,
+        ROUND((area_km - LAG(area_km) OVER anos) * 100.0 / LAG(area_km) OVER anos, 2) AS yoy_pct,
+        CASE WHEN COUNT(*) OVER tres_anos = 3 THEN ROUND(AVG(area_km) OVER tres_anos, 2) END AS rolling3_area_km,
+        ROUND((pow(area_km / FIRST_VALUE(area_km) OVER anos,
+                   1.0 / (ano - FIRST_VALUE(ano) OVER anos)) - 1) * 100, 2) AS cagr_pct
+    FROM anual
+    WINDOW anos AS (ORDER BY ano),
+           tres_anos AS (ORDER BY ano ROWS BETWEEN 2 PRECEDING AND CURRENT ROW)
+"""
+
+# Ranking e participação de cada estado no total do ano, com a variação e o
+# CAGR da série do próprio estado
+SQL_GOLD_RANKING = """
+    WITH anual AS (
+        SELECT f.ano, l.estado, l.regiao, SUM(f.area_km) AS area_km
+        FROM FatoDesmatamentoAnual f
+        JOIN DimLocalidade l ON f.id_localidade = l.id_localidade
+        GROUP BY f.ano, l.estado, l.regiao
+    )
+    SELECT
+        ano,
+        estado,
+        regiao,
+        ROUND(area_km, 2) AS area_km,
+        RANK() OVER (PARTITION BY ano ORDER BY area_km DESC) AS posicao_ano,
+        ROUND(area_km * 100.0 / SUM(area_km) OVER (PARTITION BY ano), 2) AS percentual_ano,
+        ROUND((area_km - LAG(area_km) OVER anos_estado) * 100.0 / LAG(area_km) OVER anos_estado, 2) AS yoy_pct,
+        ROUND((pow(area_km / FIRST_VALUE(area_km) OVER anos_estado,
+                   1.0 / (ano - FIRST_VALUE(ano) OVER anos_estado)) - 1) * 100, 2) AS cagr_pct
+    FROM anual
+    WINDOW anos_estado AS (PARTITION BY estado ORDER BY ano)
+"""
+
+# Consultas do BI sobre as tendências (atendidas pelos índices das tabelas)
+SQL_RANKING_ESTADOS_ANO = f"""
+    SELECT posicao_ano, estado, regiao, area_km, percentual_ano, yoy_pct, cagr_pct
+    FROM {TABELA_GOLD_RANKING}
+    WHERE ano = ?
+    ORDER BY posicao_ano
+"""
+
+SQL_TENDENCIA_ESTADO = f"""
+    SELECT ano, area_km, posicao_ano, percentual_ano, yoy_pct, cagr_pct
+    FROM {TABELA_GOLD_RANKING}
+    WHERE estado = ?
+    ORDER BY ano
+"""
+
+
+def criar_tabela_gold(conexao):
+    """
+    Cria as tabelas materializadas da camada Gold e a tabela de controle
+
+    Args:
+        conexao: Conexão com o banco SQLite
+    """
+    cursor = conexao.cursor()
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_GOLD} (
+            ano INTEGER NOT NULL,
+            safra_ocorrido TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            regiao TEXT NOT NULL,
+            tipo_desmatamento TEXT NOT NULL,
+            qtd_ocorrencias INTEGER NOT NULL,
+            total_area_desmatada_km REAL NOT NULL,
+            PRIMARY KEY (ano, safra_ocorrido, estado, tipo_desmatamento)
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_GOLD_QUEIMADAS} (
+            ano INTEGER PRIMARY KEY,
+            total_focos INTEGER NOT NULL,
+            meses_observados INTEGER NOT NULL,
+            media_mensal REAL NOT NULL,
+            mes_pico INTEGER NOT NULL,
+            nome_mes_pico TEXT NOT NULL,
+            yoy_total REAL,
+            rolling3_total REAL
+        )
+    """)
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_GOLD_TENDENCIA} (
+            ano INTEGER PRIMARY KEY,
+            area_km REAL NOT NULL,
+            qtd_estados INTEGER NOT NULL,
+            yoy_pct REAL,
+            rolling3_area_km REAL,
+            cagr_pct REAL
+        )
+    """)
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_GOLD_RANKING} (
+            ano INTEGER NOT NULL,
+            estado TEXT NOT NULL,
+            regiao TEXT NOT NULL,
+            area_km REAL NOT NULL,
+            posicao_ano INTEGER NOT NULL,
+            percentual_ano REAL,
+            yoy_pct REAL,
+            cagr_pct REAL,
+            PRIMARY KEY (ano, estado)
+        ) WITHOUT ROWID
+    """)
+
+    # Ranking de um ano já na ordem das posições e série de um estado por ano
+    cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_gold_ranking_ano_posicao
+        ON {TABELA_GOLD_RANKING} (ano, posicao_ano)
+    """)
+    cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_gold_ranking_estado_ano
+        ON {TABELA_GOLD_RANKING} (estado, ano)
+    """)
+
+    # Marca até onde cada tabela materializada está atualizada. O significado
+    # depende de como a tabela é atualizada:
+    #   - GoldDesmatamentoAgregado (incremental): maior id_fato já agregado
+    #   - tabelas refeitas por inteiro: versão da fonte (VersaoDados) já materializada
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ControleGold (
+            tabela TEXT PRIMARY KEY,
+            marca_atualizacao INTEGER NOT NULL
+        )
+    """)
+
+    # Bancos anteriores guardavam a marca na coluna ultimo_id_fato
+    colunas = {coluna[1] for coluna in cursor.execute("PRAGMA table_info(ControleGold)")}
+    if 'ultimo_id_fato' in colunas:
+        cursor.execute("ALTER TABLE ControleGold RENAME COLUMN ultimo_id_fato TO marca_atualizacao")
+        logging.info("🔄 ControleGold migrada: coluna ultimo_id_fato renomeada para marca_atualizacao")
+
+
+def ler_controle_gold(cursor, tabela):
+    """
+    Retorna a marca de atualização registrada em ControleGold para uma tabela (None se ainda não houver)
+    """
+    cursor.execute("SELECT marca_atualizacao FROM ControleGold WHERE tabela = ?", (tabela,))
+    controle = cursor.fetchone()
+
+    return controle[0] if controle is not None else None
+
+
+def gravar_controle_gold(cursor, tabela, marca):
+    """
+    Registra em ControleGold até onde uma tabela materializada está atualizada
+    """
+    cursor.execute("""
+        INSERT INTO ControleGold (tabela, marca_atualizacao) VALUES (?, ?)
+        ON CONFLICT (tabela) DO UPDATE SET marca_atualizacao = excluded.marca_atualizacao
+    """, (tabela, marca))
+
+
+def atualizar_gold_materializado(caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Atualiza a tabela materializada da camada Gold
+
+    - Primeira execução: materializa a agregação completa
+    - Execuções seguintes: recalcula apenas os grupos (ano, safra, estado, tipo)
+      que receberam fatos novos desde a última atualização (id_fato maior que
+      o registrado em ControleGold)
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
+
+    Returns:
+        Número de grupos recalculados
+    """
+    logging.info("=" * 60)
+    logging.info(f"🧱 ATUALIZANDO TABELA MATERIALIZADA {TABELA_GOLD}")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+        criar_tabelas(conexao)
+
+    criar_tabela_gold(conexao)
+    cursor = conexao.cursor()
+
+    controle = ler_controle_gold(cursor, TABELA_GOLD)
+    cursor.execute("SELECT COALESCE(MAX(id_fato), 0) FROM FatoDesmatamento")
+    maior_id_fato = cursor.fetchone()[0]
+
+    if controle is not None and controle >= maior_id_fato:
+        logging.info("✅ Tabela materializada já está atualizada (nenhum fato novo)")
+        grupos_atualizados = 0
+
+    elif controle is None:
+        # Materialização completa
+        cursor.execute(f"DELETE FROM {TABELA_GOLD}")
+        cursor.execute(f"INSERT INTO {TABELA_GOLD} " + SQL_GOLD_AGREGADO.format(filtro_fato=''))
+        grupos_atualizados = cursor.rowcount
+        logging.info(f"📊 Materialização completa: {grupos_atualizados} grupos")
+
+    else:
+        # Grupos tocados pelos fatos novos
+        cursor.execute("DROP TABLE IF EXISTS temp.grupos_alterados")
+        cursor.execute("""
+            CREATE TEMP TABLE grupos_alterados AS
+            SELECT DISTINCT
+                strftime('%Y-%m', t.data_completa) AS safra_ocorrido,
+                l.estado,
+                d.tipo_desmatamento
+            FROM FatoDesmatamento f
+            JOIN DimTempo t ON f.id_tempo = t.id_tempo
+            JOIN DimLocalidade l ON f.id_localidade = l.id_localidade
+            JOIN DimTipoDegradacao d ON f.id_tipo = d.id_tipo
+            WHERE f.id_fato > ?
+        """, (controle,))
+
+        # Combinações de chaves das dimensões que formam esses grupos (dimensões são pequenas)
+        cursor.execute("DROP TABLE IF EXISTS temp.chaves_alteradas")
+        cursor.execute("""
+            CREATE TEMP TABLE chaves_alteradas AS
+            SELECT t.id_tempo, l.id_localidade, d.id_tipo
+            FROM grupos_alterados g
+            JOIN DimTempo t ON strftime('%Y-%m', t.data_completa) = g.safra_ocorrido
+            JOIN DimLocalidade l ON l.estado = g.estado
+            JOIN DimTipoDegradacao d ON d.tipo_desmatamento = g.tipo_desmatamento
+        """)
+
+        cursor.execute(f"""
+            DELETE FROM {TABELA_GOLD}
+            WHERE (safra_ocorrido, estado, tipo_desmatamento) IN
+                (SELECT safra_ocorrido, estado, tipo_desmatamento FROM grupos_alterados)
+        """)
+        cursor.execute(f"INSERT INTO {TABELA_GOLD} " + SQL_GOLD_AGREGADO.format(filtro_fato="""
+            WHERE (id_tempo, id_localidade, id_tipo) IN
+                (SELECT id_tempo, id_localidade, id_tipo FROM chaves_alteradas)
+        """))
+        grupos_atualizados = cursor.rowcount
+        logging.info(f"📊 Atualização incremental: {grupos_atualizados} grupos recalculados")
+
+    # Qualquer recálculo muda a versão dos dados da Gold (invalida caches de consultas)
+    if controle is None or controle < maior_id_fato:
+        incrementar_versao_dados(conexao, TABELA_GOLD)
+
+    gravar_controle_gold(cursor, TABELA_GOLD, maior_id_fato)
+    conexao.commit()
+
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=grupos_atualizados)
+
+    return grupos_atualizados
+
+
+def atualizar_gold_queimadas(caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Recalcula a tabela GoldQueimadasAnual a partir da FatoQueimadas
+    A série é pequena (um registro por ano): a tabela é refeita por inteiro,
+    com uma única consulta de funções de janela, na mesma transação. Se a
+    FatoQueimadas não mudou desde a última vez (VersaoDados), nada é refeito.
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
+
+    Returns:
+        Número de anos materializados (0 se a tabela já estava atualizada)
+    """
+    logging.info("=" * 60)
+    logging.info(f"🧱 ATUALIZANDO TABELA MATERIALIZADA {TABELA_GOLD_QUEIMADAS}")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+        criar_tabelas(conexao)
+
+    criar_tabela_gold(conexao)
+    cursor = conexao.cursor()
+
+    versao_fonte = obter_versao_dados(conexao, 'FatoQueimadas')
+    if ler_controle_gold(cursor, TABELA_GOLD_QUEIMADAS) == versao_fonte:
+        logging.info("✅ Tabela materializada já está atualizada (FatoQueimadas sem mudanças)")
+        if conexao_propria:
+            conexao.close()
+        return 0
+
+    cursor.execute(f"DELETE FROM {TABELA_GOLD_QUEIMADAS}")
+    cursor.execute(f"INSERT INTO {TABELA_GOLD_QUEIMADAS} " + SQL_GOLD_QUEIMADAS)
+    anos_materializados = cursor.rowcount
+
+    incrementar_versao_dados(conexao, TABELA_GOLD_QUEIMADAS)
+    gravar_controle_gold(cursor, TABELA_GOLD_QUEIMADAS, versao_fonte)
+    conexao.commit()
+
+    logging.info(f"📊 Métricas de queimadas materializadas: {anos_materializados} anos")
+
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=anos_materializados)
+
+    return anos_materializados
+
+
+def atualizar_gold_tendencias(caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Recalcula as tabelas de tendência da série anual (GoldTendenciaAnual e
+    GoldRankingEstadoAnual) a partir da FatoDesmatamentoAnual
+    As métricas saem de funções de janela, uma consulta por tabela, e são
+    gravadas na mesma transação. Se a FatoDesmatamentoAnual não mudou desde a
+    última vez (VersaoDados), nada é refeito.
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita da pipeline (opcional). Quando informada, não é fechada ao final.
+
+    Returns:
+        Número de registros (ano e estado) materializados no ranking (0 se
+        as tabelas já estavam atualizadas)
+    """
+    logging.info("=" * 60)
+    logging.info(f"🧱 ATUALIZANDO TABELAS DE TENDÊNCIA ({TABELA_GOLD_TENDENCIA}, {TABELA_GOLD_RANKING})")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+        criar_tabelas(conexao)
+
+    criar_tabela_gold(conexao)
+    cursor = conexao.cursor()
+
+    versao_fonte = obter_versao_dados(conexao, 'FatoDesmatamentoAnual')
+    if ler_controle_gold(cursor, TABELA_GOLD_RANKING) == versao_fonte:
+        logging.info("✅ Tabelas de tendência já estão atualizadas (FatoDesmatamentoAnual sem mudanças)")
+        if conexao_propria:
+            conexao.close()
+        return 0
+
+    # pow() só existe no SQLite compilado com as funções matemáticas
+    try:
+        cursor.execute("SELECT pow(2, 0.5)")
+    except sqlite3.OperationalError:
+        conexao.create_function('pow', 2, math.pow, deterministic=True)
+
+    cursor.execute(f"DELETE FROM {TABELA_GOLD_TENDENCIA}")
+    cursor.execute(f"INSERT INTO {TABELA_GOLD_TENDENCIA} " + SQL_GOLD_TENDENCIA)
+    anos_materializados = cursor.rowcount
+
+    cursor.execute(f"DELETE FROM {TABELA_GOLD_RANKING}")
+    cursor.execute(f"INSERT INTO {TABELA_GOLD_RANKING} " + SQL_GOLD_RANKING)
+    registros_ranking = cursor.rowcount
+
+    incrementar_versao_dados(conexao, TABELA_GOLD_TENDENCIA)
+    incrementar_versao_dados(conexao, TABELA_GOLD_RANKING)
+    gravar_controle_gold(cursor, TABELA_GOLD_RANKING, versao_fonte)
+    conexao.commit()
+
+    logging.info(f"📊 Tendências materializadas: {anos_materializados} anos, "
+                 f"{registros_ranking} registros de ranking por estado")
+
+    if conexao_propria:
+        conexao.close()
+
+    registrar_registros(inseridos=anos_materializados + registros_ranking)
+
+    return registros_ranking
+
+
+if __name__ == "__main__":
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'materialize_gold.log')
+    atualizar_gold_materializado()
+    atualizar_gold_queimadas()
+    atualizar_gold_tendencias()
@@ -0,0 +1,139 @@
+# Métricas de desempenho das etapas da pipeline.
+# Cada etapa gera um registro com tempo de relógio, tempo de CPU, registros
+# lidos/inseridos/rejeitados, registros por segundo, pico de memória (RSS) e
+# bytes lidos. Os registros são gravados em NDJSON (um JSON por linha).
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Pico de memória do processo (indisponível no Windows)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Arquivo padrão das métricas (raiz do projeto: pipeline -> src -> PROJECT_ROOT)
+CAMINHO_METRICAS = Path(__file__).resolve().parents[2] / 'logs' / 'pipeline_metrics.ndjson'
+
+# Cada etapa roda inteira em uma thread: o registro em andamento fica por thread
+_contexto = threading.local()
+
+
+def obter_pico_rss_mb():
+    """
+    Retorna o pico de memória residente (RSS) do processo em MB, ou None
+    """
+    if resource is None:
+        return None
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(pico / divisor, 1)
+
+
+def obter_bytes_lidos_thread():
+    """
+    Retorna os bytes lidos pela thread atual (rchar de /proc), ou None fora do Linux
+    """
+    try:
+        with open('/proc/thread-self/io', encoding='ascii') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('rchar:'):
+                    return int(linha.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def registrar_registros(lidos=None, inseridos=None, rejeitados=None):
+    """
+    Informa os totais de registros da etapa em execução nesta thread
+    Cada valor informado substitui o anterior; fora de uma etapa medida não faz nada.
+
+    Args:
+        lidos: Registros lidos/processados pela etapa
+        inseridos: Registros inseridos no banco
+        rejeitados: Registros rejeitados (sem chave, inválidos)
+    """
+    registro = getattr(_contexto, 'registro', None)
+    if registro is None:
+        return
+
+    for campo, valor in (('registros_lidos', lidos), ('registros_inseridos', inseridos),
+                         ('registros_rejeitados', rejeitados)):
+        if valor is not None:
+            registro[campo] = int(valor)
+
+
+@contextmanager
+def medir_etapa(nome):
+    """
+    Mede a etapa executada dentro do bloco
+
+    Uso:
+        with medir_etapa('fato_desmatamento') as registro:
+            ...
+
+    O tempo de CPU e os bytes lidos são os da thread atual, então etapas em
+    paralelo não se misturam. O pico de RSS é o do processo até o fim da etapa.
+
+    Args:
+        nome: Nome da etapa
+
+    Yields:
+        Dicionário do registro de métricas (preenchido ao final do bloco)
+    """
+    registro = {
+        'etapa': nome,
+        'inicio': datetime.now().isoformat(timespec='milliseconds'),
+        'registros_lidos': 0,
+        'registros_inseridos': 0,
+        'registros_rejeitados': 0,
+    }
+
+    anterior = getattr(_contexto, 'registro', None)
+    _contexto.registro = registro
+
+    bytes_inicio = obter_bytes_lidos_thread()
+    cpu_inicio = time.thread_time()
+    inicio = time.perf_counter()
+
+    try:
+        yield registro
+    finally:
+        tempo = time.perf_counter() - inicio
+        bytes_fim = obter_bytes_lidos_thread()
+        _contexto.registro = anterior
+
+        registros_base = registro['registros_lidos'] or registro['registros_inseridos']
+        registro.update({
+            'tempo_s': round(tempo, 4),
+            'cpu_s': round(time.thread_time() - cpu_inicio, 4),
+            'registros_por_s': round(registros_base / tempo, 1) if tempo > 0 else 0.0,
+            'pico_rss_mb': obter_pico_rss_mb(),
+            'bytes_lidos': bytes_fim - bytes_inicio if bytes_inicio is not None and bytes_fim is not None else None,
+        })
+
+
+def salvar_metricas(metricas, caminho=CAMINHO_METRICAS, execucao=None):
+    """
+    Acrescenta os registros de métricas ao arquivo NDJSON
+
+    Args:
+        metricas: Lista de registros (dicionários) das etapas
+        caminho: Arquivo NDJSON de destino
+        execucao: Identificador da execução gravado em cada linha
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(caminho, 'a', encoding='utf-8') as arquivo:
+        for registro in metricas:
+            linha = {'execucao': execucao, **registro} if execucao is not None else registro
+            arquivo.write(json.dumps(linha, ensure_ascii=False) + '\n')
@@ -0,0 +1,100 @@
+# Script para reprocessar a quarentena da tabela fato.
+# Os registros da Silver sem correspondência nas dimensões ficam em
+# QuarentenaFatoDesmatamento (com o motivo e a linha de origem). Depois de
+# corrigidas as dimensões, este script recarrega apenas esses registros, sem
+# reler a Silver inteira, e atualiza a tabela materializada da camada Gold.
+
+import logging
+import pandas as pd
+from pathlib import Path
+from utils import (conectar_banco, configurar_logs, criar_tabelas, contar_registros_tabela, incrementar_versao_dados,
+                   ResumoAvisos)
+from load_fato_desmatamento import (mapear_chaves_dimensoes, inserir_fatos_em_lotes, registrar_registros_sem_chave,
+                                    gravar_quarentena, liberar_quarentena)
+from materialize_gold import atualizar_gold_materializado
+from metrics import registrar_registros
+
+# --- Caminhos padrão (raiz do projeto: pipeline -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
+
+
+def reprocessar_quarentena(caminho_db=DEFAULT_DB_PATH, conexao=None):
+    """
+    Recarrega na FatoDesmatamento os registros em quarentena que agora têm
+    correspondência em todas as dimensões
+    Os registros mantêm o hash_registro calculado na carga original, então um
+    registro já carregado por uma recarga da Silver não é duplicado.
+
+    Args:
+        caminho_db: Caminho para o banco de dados
+        conexao: Conexão de escrita (opcional). Quando informada, é usada sem
+            recriar o schema e não é fechada ao final
+
+    Returns:
+        Número de registros inseridos na fato
+    """
+    logging.info("=" * 60)
+    logging.info("♻️ REPROCESSANDO A QUARENTENA DA FATO DESMATAMENTO")
+    logging.info("=" * 60)
+
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
+        criar_tabelas(conexao)
+
+    df_quarentena = pd.read_sql_query("""
+        SELECT indice_origem, data_imagem, estado, tipo_degradacao, area_km, hash_registro
+        FROM QuarentenaFatoDesmatamento
+        ORDER BY indice_origem
+    """, conexao, index_col='indice_origem')
+    registrar_registros(lidos=len(df_quarentena))
+
+    if len(df_quarentena) == 0:
+        logging.info("✅ Nenhum registro em quarentena")
+        if conexao_propria:
+            conexao.close()
+        return 0
+
+    logging.info(f"📄 Registros em quarentena: {len(df_quarentena)}")
+
+    # Mesmo lookup da carga: só os registros com todas as chaves resolvidas são inseridos
+    df_fato, df_sem_chave = mapear_chaves_dimensoes(conexao, df_quarentena)
+
+    avisos = ResumoAvisos()
+    registrar_registros_sem_chave(df_sem_chave, avisos)
+    avisos.emitir()
+
+    registros_inseridos, registros_existentes = inserir_fatos_em_lotes(conexao, df_fato)
+
+    # Atualiza o motivo dos que continuam sem correspondência e libera os carregados
+    gravar_quarentena(conexao, df_sem_chave)
+    registros_liberados = liberar_quarentena(conexao)
+    if registros_inseridos > 0:
+        incrementar_versao_dados(conexao, 'FatoDesmatamento')
+    conexao.commit()
+
+    registrar_registros(inseridos=registros_inseridos, rejeitados=len(df_sem_chave))
+
+    logging.info("=" * 60)
+    logging.info("✅ Reprocessamento concluído!")
+    logging.info(f"   • Registros inseridos na fato: {registros_inseridos}")
+    logging.info(f"   • Registros já existentes (ignorados): {registros_existentes}")
+    logging.info(f"   • Registros liberados da quarentena: {registros_liberados}")
+    logging.info(f"   • Registros que continuam em quarentena: "
+                 f"{contar_registros_tabela(conexao, 'QuarentenaFatoDesmatamento')}")
+    logging.info("=" * 60)
+
+    if conexao_propria:
+        conexao.close()
+
+    return registros_inseridos
+
+
+if __name__ == "__main__":
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'reprocess_quarantine.log')
+
+    if reprocessar_quarentena() > 0:
+        # Os fatos recarregados entram na agregação incremental da camada Gold
+        atualizar_gold_materializado()
@@ -1,24 +1,63 @@
 # Script principal que executa toda a pipeline de carga e roda TUDO em ordem:
 # 1. Carrega DimTempo
 # 2. Carrega DimLocalidade
-# 3. Carrega FatoDesmatamento
-# 4. Mostra logs de quantos registros foram inseridos
+# 3. Carrega DimTipoDegradacao
+# 4. Carrega FatoDesmatamento (e a FatoDesmatamentoAnual, do TerraBrasilis, e a FatoQueimadas)
 # 5. Faz checagens básicas (tem dados? tem erros?)
+# 6. Cria a camada Gold (views e CSV) e valida
+# 7. Mostra logs de quantos registros foram inseridos
+# As etapas independentes rodam em paralelo (scheduler.py)
 
 import sys
 from datetime import datetime
 from pathlib import Path
 
 # Importa as funções de carga
-from utils import configurar_logs, conectar_banco, contar_registros_tabela
+from utils import (configurar_logs, conectar_banco, contar_registros_tabela, ler_camada_silver,
+                   COLUNAS_DIM_TEMPO, COLUNAS_DIM_LOCALIDADE, COLUNAS_DIM_TIPO_DEGRADACAO, COLUNAS_FATO,
+                   TAMANHO_CHUNK_SILVER, pq)
 from load_dim_tempo import carregar_dim_tempo
 from load_dim_localidade import carregar_dim_localidade
+from load_dim_tipo_degradacao import carregar_dim_tipo_degradacao
 from load_fato_desmatamento import carregar_fato_desmatamento
+from load_fato_desmatamento_anual import carregar_fato_desmatamento_anual
+from load_fato_queimadas import carregar_fato_queimadas
+from load_chunked import carregar_silver_em_chunks
+from create_gold_layer import criar_camada_gold
+from create_views import criar_views_gold
+from materialize_gold import atualizar_gold_materializado, atualizar_gold_queimadas, atualizar_gold_tendencias
+from manage_indexes import aplicar_indices, capturar_planos_consulta
+from validate_gold_layer import validar_camada_gold
+from connection_manager import GerenciadorConexoes
+from scheduler import Etapa, executar_etapas, calcular_caminho_critico
+from metrics import medir_etapa, registrar_registros, salvar_metricas, CAMINHO_METRICAS
 
 
 # Define o caminho raiz do projeto (a pasta que contém 'src', 'data', etc.)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+GOLD_DATA_PATH = PROJECT_ROOT / 'data' / 'gold'
+
+
+class ResultadoPipeline:
+    """
+    Resultado de executar_pipeline
+
+    Avaliado como booleano indica o sucesso da execução (compatível com o
+    retorno True/False anterior); metricas traz um registro por etapa
+    (ver metrics.medir_etapa), na ordem de início.
+    """
+
+    def __init__(self, sucesso, metricas):
+        self.sucesso = sucesso
+        self.metricas = metricas
+
+    def __bool__(self):
+        return self.sucesso
+
+    def __repr__(self):
+        return f"ResultadoPipeline(sucesso={self.sucesso}, etapas={len(self.metricas)})"
+
 
 def validar_arquivos(caminho_csv):
     """
@@ -44,12 +83,14 @@ def validar_arquivos(caminho_csv):
     return True
 
 
-def validar_integridade_dados(caminho_db):
+def validar_integridade_dados(caminho_db, conexao=None):
     """
     Faz checagens básicas de integridade dos dados carregados
 
     Args:
         caminho_db: Caminho para o banco de dados
+        conexao: Conexão (somente leitura) da pipeline (opcional).
+            Quando informada, não é fechada ao final
     """
     import logging
 
@@ -57,11 +98,13 @@ def validar_integridade_dados(caminho_db):
     logging.info("🔍 VALIDANDO INTEGRIDADE DOS DADOS")
     logging.info("=" * 60)
 
-    conexao = conectar_banco(caminho_db)
+    conexao_propria = conexao is None
+    if conexao_propria:
+        conexao = conectar_banco(caminho_db)
     cursor = conexao.cursor()
 
     # Checa se há registros em todas as tabelas
-    tabelas = ['DimTempo', 'DimLocalidade', 'FatoDesmatamento']
+    tabelas = ['DimTempo', 'DimLocalidade', 'DimTipoDegradacao', 'FatoDesmatamento']
     todas_ok = True
 
     for tabela in tabelas:
@@ -107,6 +150,21 @@ def validar_integridade_dados(caminho_db):
         logging.error(f"   ❌ {fks_local_quebradas} FKs de localidade quebradas!")
         todas_ok = False
 
+    # Checa FKs de tipo de degradação
+    cursor.execute("""
+        SELECT COUNT(*) 
+        FROM FatoDesmatamento f
+        LEFT JOIN DimTipoDegradacao d ON f.id_tipo = d.id_tipo
+        WHERE d.id_tipo IS NULL
+    """)
+    fks_tipo_quebradas = cursor.fetchone()[0]
+
+    if fks_tipo_quebradas == 0:
+        logging.info(f"   ✅ Todas as FKs de tipo de degradação estão corretas")
+    else:
+        logging.error(f"   ❌ {fks_tipo_quebradas} FKs de tipo de degradação quebradas!")
+        todas_ok = False
+
     # Checa se há valores nulos na fato
     cursor.execute("""
         SELECT COUNT(*) 
@@ -120,7 +178,16 @@ def validar_integridade_dados(caminho_db):
     else:
         logging.warning(f"   ⚠️ {areas_invalidas} registros com área nula ou zero")
 
-    conexao.close()
+    # Registros rejeitados pela carga (podem ser recarregados com reprocess_quarantine.py)
+    registros_quarentena = contar_registros_tabela(conexao, 'QuarentenaFatoDesmatamento')
+
+    if registros_quarentena == 0:
+        logging.info(f"   ✅ Nenhum registro em quarentena")
+    else:
+        logging.warning(f"   ⚠️ {registros_quarentena} registros em quarentena (QuarentenaFatoDesmatamento)")
+
+    if conexao_propria:
+        conexao.close()
 
     if todas_ok:
         logging.info("")
@@ -134,16 +201,116 @@ def validar_integridade_dados(caminho_db):
     return todas_ok
 
 
-def executar_pipeline(caminho_csv, caminho_db):
+def montar_etapas(caminho_csv, caminho_db, caminho_gold, df_silver, gerenciador, tamanho_chunk=None):
+    """
+    Descreve a pipeline como um DAG de etapas
+
+    dim_tempo ───────────┐
+    dim_localidade ──────┼─> fato_desmatamento ─> indices ─┬─> integridade
+    dim_tipo_degradacao ─┘                                 └─> gold_materializado ─┬─> views_gold
+                                                                                   ├─> camada_gold ─> validacao_gold
+                                                                                   └─> planos_consulta
+    dim_localidade ─> fato_desmatamento_anual ─> gold_tendencias
+    fato_queimadas ─> gold_queimadas
+
+    As cargas e a criação das views escrevem no banco e são serializadas pela
+    trava de escrita; as validações usam conexões somente leitura do pool.
+
+    No modo streaming (tamanho_chunk), dimensões e fato são carregadas juntas,
+    chunk a chunk, pela etapa carga_em_chunks (da qual a fato anual passa a
+    depender). A fato de queimadas tem grão de mês e não depende de nenhuma
+    dimensão.
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver
+        caminho_db: Caminho para o banco de dados
+        caminho_gold: Pasta da camada Gold (CSV)
+        df_silver: DataFrame Silver lido uma única vez pela pipeline (None no modo streaming)
+        gerenciador: GerenciadorConexoes da execução
+        tamanho_chunk: Tamanho dos chunks no modo streaming (None desativa)
+
+    Returns:
+        Lista de Etapa
+    """
+    escrita = gerenciador.escrita
+
+    def validar_integridade():
+        with gerenciador.leitura() as conexao:
+            return validar_integridade_dados(caminho_db, conexao=conexao)
+
+    def validar_gold():
+        with gerenciador.leitura() as conexao:
+            return validar_camada_gold(caminho_db, Path(caminho_gold), conexao=conexao)
+
+    if tamanho_chunk:
+        carga = 'carga_em_chunks'
+        etapa_localidade = carga
+        etapas_carga = [
+            Etapa(carga, lambda: carregar_silver_em_chunks(
+                caminho_csv, caminho_db, tamanho_chunk=tamanho_chunk, conexao=escrita), escrita=True),
+        ]
+    else:
+        carga = 'fato_desmatamento'
+        etapa_localidade = 'dim_localidade'
+        dimensoes = ['dim_tempo', 'dim_localidade', 'dim_tipo_degradacao']
+        etapas_carga = [
+            Etapa('dim_tempo', lambda: carregar_dim_tempo(
+                caminho_csv, caminho_db, df_silver=df_silver[COLUNAS_DIM_TEMPO], conexao=escrita), escrita=True),
+            Etapa('dim_localidade', lambda: carregar_dim_localidade(
+                caminho_csv, caminho_db, df_silver=df_silver[COLUNAS_DIM_LOCALIDADE], conexao=escrita),
+                escrita=True),
+            Etapa('dim_tipo_degradacao', lambda: carregar_dim_tipo_degradacao(
+                caminho_csv, caminho_db, df_silver=df_silver[COLUNAS_DIM_TIPO_DEGRADACAO], conexao=escrita),
+                escrita=True),
+            Etapa('fato_desmatamento', lambda: carregar_fato_desmatamento(
+                caminho_csv, caminho_db, df_silver=df_silver[COLUNAS_FATO], conexao=escrita),
+                dependencias=dimensoes, escrita=True),
+        ]
+
+    def capturar_planos():
+        with gerenciador.leitura() as conexao:
+            return capturar_planos_consulta(caminho_db, conexao=conexao)
+
+    return etapas_carga + [
+        Etapa('fato_desmatamento_anual', lambda: carregar_fato_desmatamento_anual(caminho_db=caminho_db, conexao=escrita),
+              dependencias=[etapa_localidade], escrita=True),
+        Etapa('gold_tendencias', lambda: atualizar_gold_tendencias(caminho_db, conexao=escrita),
+              dependencias=['fato_desmatamento_anual'], escrita=True),
+        Etapa('fato_queimadas', lambda: carregar_fato_queimadas(caminho_db=caminho_db, conexao=escrita),
+              escrita=True),
+        Etapa('gold_queimadas', lambda: atualizar_gold_queimadas(caminho_db, conexao=escrita),
+              dependencias=['fato_queimadas'], escrita=True),
+        Etapa('indices', lambda: aplicar_indices(caminho_db, conexao=escrita), dependencias=[carga], escrita=True),
+        Etapa('integridade', validar_integridade, dependencias=['indices']),
+        Etapa('gold_materializado', lambda: atualizar_gold_materializado(caminho_db, conexao=escrita),
+              dependencias=['indices'], escrita=True),
+        Etapa('views_gold', lambda: criar_views_gold(caminho_db, conexao=escrita),
+              dependencias=['gold_materializado'], escrita=True),
+        Etapa('camada_gold', lambda: criar_camada_gold(caminho_db, caminho_gold, conexao=escrita),
+              dependencias=['gold_materializado'], escrita=True),
+        Etapa('validacao_gold', validar_gold, dependencias=['camada_gold']),
+        Etapa('planos_consulta', capturar_planos, dependencias=['gold_materializado']),
+    ]
+
+
+def executar_pipeline(caminho_csv, caminho_db, caminho_gold=GOLD_DATA_PATH, tamanho_chunk=None,
+                      caminho_metricas=CAMINHO_METRICAS):
     """
     Executa toda a pipeline de carga do Data Warehouse
+    As etapas independentes rodam em paralelo (ver montar_etapas)
 
     Args:
         caminho_csv: Caminho para o arquivo Silver
         caminho_db: Caminho para o banco de dados
+        caminho_gold: Pasta onde a camada Gold (CSV) será salva
+        tamanho_chunk: Se informado, carrega a Silver em modo streaming, com no
+            máximo tamanho_chunk registros em memória
+        caminho_metricas: Arquivo NDJSON onde as métricas de cada etapa são
+            acrescentadas (None desativa a gravação)
 
     Returns:
-        True se sucesso, False se houver erro
+        ResultadoPipeline: verdadeiro se sucesso, com as métricas por etapa
+        (tempo, CPU, registros, registros/s, pico de RSS e bytes lidos)
     """
     import logging
 
@@ -159,37 +326,58 @@ def executar_pipeline(caminho_csv, caminho_db):
     logging.info(f"🕐 Início: {hora_inicio.strftime('%Y-%m-%d %H:%M:%S')}")
     logging.info("")
 
+    gerenciador = None
+    metricas = []
+
     try:
         # ETAPA 1: Validação dos arquivos
-        logging.info("📋 ETAPA 1/4: Validando arquivos necessários...")
+        logging.info("📋 ETAPA 1/3: Validando arquivos necessários...")
         if not validar_arquivos(caminho_csv):
-            return False
+            return ResultadoPipeline(False, metricas)
         logging.info("")
 
-        # ETAPA 2: Carga das dimensões
-        logging.info("📋 ETAPA 2/4: Carregando dimensões...")
+        # Abre as conexões da execução (schema verificado uma única vez)
+        gerenciador = GerenciadorConexoes(caminho_db)
+
+        # Lê a camada Silver uma única vez e compartilha entre as cargas
+        # (no modo streaming, a leitura é feita chunk a chunk pela própria carga)
+        df_silver = None
+        if not tamanho_chunk:
+            colunas_silver = list(dict.fromkeys(COLUNAS_DIM_TEMPO + COLUNAS_DIM_LOCALIDADE +
+                                                COLUNAS_DIM_TIPO_DEGRADACAO + COLUNAS_FATO))
+            with medir_etapa('leitura_silver') as metricas_leitura:
+                df_silver = ler_camada_silver(caminho_csv, colunas=colunas_silver)
+                registrar_registros(lidos=len(df_silver))
+            metricas.append(metricas_leitura)
+            logging.info("")
+
+        # ETAPA 2: Execução das etapas em paralelo, respeitando as dependências
+        logging.info("📋 ETAPA 2/3: Executando etapas de carga, Gold e validação...")
         logging.info("")
 
-        # Carrega DimTempo
-        registros_tempo = carregar_dim_tempo(caminho_csv, caminho_db)
+        etapas = montar_etapas(caminho_csv, caminho_db, caminho_gold, df_silver, gerenciador, tamanho_chunk)
+        resultados, duracoes, metricas_etapas = executar_etapas(etapas, trava_escrita=gerenciador.trava_escrita)
+        metricas.extend(sorted(metricas_etapas.values(), key=lambda registro: registro['inicio']))
         logging.info("")
 
-        # Carrega DimLocalidade
-        registros_localidade = carregar_dim_localidade(caminho_csv, caminho_db)
-        logging.info("")
+        if tamanho_chunk:
+            resultados.update(resultados['carga_em_chunks'])
 
-        # ETAPA 3: Carga da tabela fato
-        logging.info("📋 ETAPA 3/4: Carregando tabela fato...")
-        logging.info("")
+        registros_tempo = resultados['dim_tempo']
+        registros_localidade = resultados['dim_localidade']
+        registros_tipo = resultados['dim_tipo_degradacao']
+        registros_fato = resultados['fato_desmatamento']
+        registros_fato_anual = resultados['fato_desmatamento_anual']
+        registros_queimadas = resultados['fato_queimadas']
+        integridade_ok = resultados['integridade'] and resultados['validacao_gold']
 
-        registros_fato = carregar_fato_desmatamento(caminho_csv, caminho_db)
-        logging.info("")
-
-        # ETAPA 4: Validação da integridade
-        logging.info("📋 ETAPA 4/4: Validando integridade dos dados...")
-        logging.info("")
+        # ETAPA 3: Tempos por etapa e caminho crítico
+        logging.info("📋 ETAPA 3/3: Tempos das etapas...")
+        for nome, duracao in sorted(duracoes.items(), key=lambda item: item[1], reverse=True):
+            logging.info(f"   • {nome}: {duracao:.2f}s")
 
-        integridade_ok = validar_integridade_dados(caminho_db)
+        tempo_critico, caminho_critico = calcular_caminho_critico(etapas, duracoes)
+        logging.info(f"   🧭 Caminho crítico ({tempo_critico:.2f}s): {' → '.join(caminho_critico)}")
         logging.info("")
 
         # Calcula tempo de execução
@@ -206,11 +394,17 @@ def executar_pipeline(caminho_csv, caminho_db):
         logging.info("📊 Registros processados:")
         logging.info(f"   • DimTempo: {registros_tempo} novos registros")
         logging.info(f"   • DimLocalidade: {registros_localidade} novos registros")
+        logging.info(f"   • DimTipoDegradacao: {registros_tipo} novos registros")
         logging.info(f"   • FatoDesmatamento: {registros_fato} novos registros")
+        logging.info(f"   • FatoDesmatamentoAnual: {registros_fato_anual} registros novos ou atualizados")
+        logging.info(f"   • FatoQueimadas: {registros_queimadas} registros novos, atualizados ou removidos")
         logging.info("")
         logging.info(f"🕐 Tempo de execução: {tempo_execucao.total_seconds():.2f} segundos")
+        logging.info(f"🧭 Caminho crítico: {tempo_critico:.2f} segundos")
         logging.info(f"📁 Banco de dados: {Path(caminho_db).absolute()}")
         logging.info(f"📝 Log salvo em: logs/pipeline_run.log")
+        if caminho_metricas is not None:
+            logging.info(f"📈 Métricas das etapas: {caminho_metricas}")
         logging.info("")
 
         if integridade_ok:
@@ -221,7 +415,7 @@ def executar_pipeline(caminho_csv, caminho_db):
         logging.info("")
         logging.info("=" * 60)
 
-        return True
+        return ResultadoPipeline(True, metricas)
 
     except Exception as e:
         logging.error("")
@@ -235,19 +429,40 @@ def executar_pipeline(caminho_csv, caminho_db):
         logging.error("Detalhes do erro:")
         logging.error(traceback.format_exc())
 
-        return False
+        return ResultadoPipeline(False, metricas)
+
+    finally:
+        if gerenciador is not None:
+            gerenciador.fechar()
+
+        # Grava as métricas das etapas concluídas, inclusive quando a execução falha
+        if caminho_metricas is not None and metricas:
+            salvar_metricas(metricas, caminho_metricas, execucao=hora_inicio.isoformat(timespec='seconds'))
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pipeline de carga do Data Warehouse")
+    parser.add_argument('--streaming', nargs='?', type=int, const=TAMANHO_CHUNK_SILVER, default=None,
+                        metavar='TAMANHO_CHUNK',
+                        help=f"lê a Silver em chunks (padrão: {TAMANHO_CHUNK_SILVER} registros por chunk)")
+    argumentos = parser.parse_args()
+
     # Configura o sistema de logs
     logger = configurar_logs()
 
     # Executa a pipeline
+    # Usa a Silver colunar (Parquet) quando disponível; o CSV é o fallback
     caminho_csv_silver = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+    caminho_parquet_silver = caminho_csv_silver.with_suffix('.parquet')
+    if caminho_parquet_silver.exists() and pq is not None:
+        caminho_csv_silver = caminho_parquet_silver
     caminho_banco_dados = PROJECT_ROOT / 'db' / 'desmatamento.db'
 
     sucesso = executar_pipeline(caminho_csv=caminho_csv_silver,
-                                caminho_db=caminho_banco_dados)
+                                caminho_db=caminho_banco_dados,
+                                tamanho_chunk=argumentos.streaming)
 
     # Retorna código de saída apropriado
     sys.exit(0 if sucesso else 1)
\ No newline at end of file
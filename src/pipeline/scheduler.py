@@ -0,0 +1,135 @@
+# Agendador de etapas da pipeline.
+# Descreve a pipeline como um pequeno DAG (etapas + dependências) e executa
+# em paralelo as etapas independentes, em um pool de threads.
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from metrics import medir_etapa
+
+# Número padrão de etapas executadas ao mesmo tempo
+MAX_ETAPAS_PARALELAS = 4
+
+
+class Etapa:
+    """
+    Uma etapa da pipeline
+
+    Args:
+        nome: Nome único da etapa
+        funcao: Função sem argumentos que executa a etapa
+        dependencias: Nomes das etapas que precisam terminar antes desta
+        escrita: Se True, a etapa escreve no banco e roda com a trava de escrita
+            (SQLite aceita um único escritor por vez)
+    """
+
+    def __init__(self, nome, funcao, dependencias=(), escrita=False):
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = tuple(dependencias)
+        self.escrita = escrita
+
+    def __repr__(self):
+        return f"Etapa({self.nome!r}, dependencias={self.dependencias!r}, escrita={self.escrita})"
+
+
+def executar_etapa(etapa, trava_escrita=None):
+    """
+    Executa uma etapa, segurando a trava de escrita quando necessário
+
+    Returns:
+        Tupla (resultado, metricas). As métricas (ver metrics.medir_etapa) não
+        incluem a espera pela trava.
+    """
+    trava = trava_escrita if etapa.escrita and trava_escrita is not None else nullcontext()
+
+    with trava:
+        with medir_etapa(etapa.nome) as metricas:
+            resultado = etapa.funcao()
+
+    return resultado, metricas
+
+
+def executar_etapas(etapas, trava_escrita=None, max_workers=MAX_ETAPAS_PARALELAS):
+    """
+    Executa as etapas respeitando as dependências
+    Assim que uma etapa termina, todas as que dependiam apenas dela (e de etapas
+    já concluídas) são enviadas ao pool. Se uma etapa falhar, nenhuma nova etapa
+    é iniciada e a exceção é propagada após o término das que estão rodando.
+
+    Args:
+        etapas: Lista de Etapa
+        trava_escrita: Lock compartilhado pelas etapas de escrita
+        max_workers: Número máximo de etapas simultâneas
+
+    Returns:
+        Tupla (resultados, duracoes, metricas): dicionários indexados pelo nome da etapa
+    """
+    nomes = {etapa.nome for etapa in etapas}
+    for etapa in etapas:
+        faltantes = set(etapa.dependencias) - nomes
+        if faltantes:
+            raise ValueError(f"Etapa '{etapa.nome}' depende de etapas inexistentes: {sorted(faltantes)}")
+
+    pendentes = {etapa.nome: etapa for etapa in etapas}
+    concluidas = set()
+    resultados = {}
+    duracoes = {}
+    metricas = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='etapa') as executor:
+        em_execucao = {}
+
+        while pendentes or em_execucao:
+            prontas = [etapa for etapa in pendentes.values()
+                       if all(dependencia in concluidas for dependencia in etapa.dependencias)]
+
+            for etapa in prontas:
+                del pendentes[etapa.nome]
+                em_execucao[executor.submit(executar_etapa, etapa, trava_escrita)] = etapa
+
+            if not em_execucao:
+                raise ValueError(f"Dependência circular entre as etapas: {sorted(pendentes)}")
+
+            finalizadas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+
+            for futuro in finalizadas:
+                etapa = em_execucao.pop(futuro)
+                try:
+                    resultados[etapa.nome], metricas[etapa.nome] = futuro.result()
+                except Exception:
+                    logging.error(f"❌ Etapa '{etapa.nome}' falhou")
+                    pendentes.clear()
+                    raise
+
+                duracoes[etapa.nome] = metricas[etapa.nome]['tempo_s']
+                concluidas.add(etapa.nome)
+                logging.info(f"   ⏱️ Etapa '{etapa.nome}' concluída em {duracoes[etapa.nome]:.2f}s")
+
+    return resultados, duracoes, metricas
+
+
+def calcular_caminho_critico(etapas, duracoes):
+    """
+    Calcula o caminho crítico do DAG: a sequência de etapas dependentes com a
+    maior soma de durações. É o menor tempo possível da pipeline, mesmo com
+    paralelismo ilimitado.
+
+    Args:
+        etapas: Lista de Etapa
+        duracoes: Dicionário nome -> duração em segundos
+
+    Returns:
+        Tupla (tempo_total, lista_de_nomes)
+    """
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    melhor = {}
+
+    def termino(nome):
+        if nome not in melhor:
+            anteriores = [termino(dependencia) for dependencia in por_nome[nome].dependencias]
+            tempo_anterior, caminho_anterior = max(anteriores, default=(0.0, []), key=lambda item: item[0])
+            melhor[nome] = (tempo_anterior + duracoes.get(nome, 0.0), caminho_anterior + [nome])
+        return melhor[nome]
+
+    return max((termino(nome) for nome in por_nome), default=(0.0, []), key=lambda item: item[0])
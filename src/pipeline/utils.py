@@ -1,69 +1,336 @@
 # Funções utilitárias para a pipeline de dados.
 # Centraliza operações comuns para todos os scripts.
 
+import re
+import uuid
+import atexit
+import queue
 import sqlite3
+import unicodedata
 import pandas as pd
 import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+
+# Formato colunar (Parquet) da camada Silver é opcional: sem pyarrow, apenas CSV
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Arquivo com os índices do Data Warehouse (raiz do projeto: pipeline -> src -> PROJECT_ROOT)
+CAMINHO_SQL_INDICES = Path(__file__).resolve().parents[2] / 'sql' / 'create_indexes.sql'
+
+# Exemplos guardados por motivo nos avisos agregados (ResumoAvisos)
+MAX_EXEMPLOS_AVISO = 5
+
+# Intervalo mínimo (s) entre as linhas de progresso dos laços de carga
+INTERVALO_LOG_PROGRESSO = 5.0
+
+# Linha reservada da VersaoDados com a geração do banco: um número aleatório
+# gravado quando o banco é criado, que muda se o arquivo for apagado e recriado
+GERACAO_BANCO = '_geracao_banco'
+
+# Thread que grava os logs em segundo plano (ver configurar_logs)
+_ouvinte_logs = None
+
+# Quantidade de comandos SQL preparados mantidos em cache por conexão
+TAMANHO_CACHE_COMANDOS = 256
+
+# A partir deste número de registros as cargas usam o perfil de carga em massa
+LIMIAR_CARGA_EM_MASSA = 100_000
+
+# Tamanho padrão dos chunks no modo streaming (registros por chunk)
+TAMANHO_CHUNK_SILVER = 250_000
+
+# Compressão usada nos arquivos Parquet da camada Silver
+COMPRESSAO_PARQUET = 'zstd'
+
+# Tipos declarados da camada Silver no formato colunar
+TIPOS_SILVER_PARQUET = {
+    'estado': 'string',
+    'tipo_degradacao': 'string',
+    'area_km': 'float64',
+    'ano': 'int16',
+    'mes': 'int8',
+    'dia': 'int8',
+    'ano_mes': 'string',
+    'semestre': 'int8',
+}
+
+# Tipos declarados da camada Silver em memória (ler_camada_silver): texto de
+# baixa cardinalidade como categórico, partes da data em inteiros estreitos.
+# data_imagem é convertida para data (datetime64) após a leitura.
+TIPOS_SILVER = {
+    'estado': 'category',
+    'tipo_degradacao': 'category',
+    'data_imagem': 'category',
+    'area_km': 'float64',
+    'ano': 'int16',
+    'mes': 'int8',
+    'dia': 'int8',
+    'ano_mes': 'category',
+    'semestre': 'int8',
+}
+
+# Colunas de texto da Silver (lidas do Parquet já codificadas em dicionário)
+COLUNAS_TEXTO_SILVER = [coluna for coluna, tipo in TIPOS_SILVER.items() if tipo == 'category' and coluna != 'data_imagem']
+
+# Colunas da camada Silver usadas por cada carga
+COLUNAS_DIM_TEMPO = ['data_imagem', 'ano', 'mes', 'dia', 'ano_mes', 'semestre']
+COLUNAS_DIM_LOCALIDADE = ['estado']
+COLUNAS_DIM_TIPO_DEGRADACAO = ['tipo_degradacao']
+COLUNAS_FATO = ['data_imagem', 'estado', 'tipo_degradacao', 'area_km']
 
 
 def configurar_logs(caminho_log='logs/pipeline_run.log'):
     """
     Configura o sistema de logs para registrar todas as operações
 
+    As mensagens entram em uma fila (QueueHandler) e são gravadas no arquivo e
+    no console por uma thread em segundo plano (QueueListener): quem loga não
+    espera pela escrita em disco.
+
     Args:
         caminho_log: Caminho onde o arquivo de log será salvo
     """
+    global _ouvinte_logs
+
     # Cria a pasta logs se não existir
     Path(caminho_log).parent.mkdir(parents=True, exist_ok=True)
 
-    # Configuração do logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='[%(asctime)s] %(levelname)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler(caminho_log, encoding='utf-8'),
-            logging.StreamHandler()  # Também mostra no console
-        ]
-    )
+    # Como no basicConfig, não reconfigura um logging já configurado
+    if logging.getLogger().handlers:
+        return logging.getLogger(__name__)
+
+    formatador = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    handlers = [
+        logging.FileHandler(caminho_log, encoding='utf-8'),
+        logging.StreamHandler()  # Também mostra no console
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatador)
+
+    # A mensagem é formatada (com traceback) antes de entrar na fila; o
+    # formatador final, com data e nível, é aplicado pelos handlers do ouvinte
+    fila = queue.SimpleQueue()
+    handler_fila = logging.handlers.QueueHandler(fila)
+    handler_fila.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[handler_fila])
+
+    _ouvinte_logs = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    _ouvinte_logs.start()
+
+    # Garante que as mensagens na fila sejam gravadas ao fim do processo
+    atexit.register(encerrar_logs)
 
     return logging.getLogger(__name__)
 
 
-def conectar_banco(caminho_db='db/desmatamento.db'):
+def encerrar_logs():
+    """
+    Grava as mensagens pendentes na fila e para a thread de logs
+    """
+    global _ouvinte_logs
+
+    if _ouvinte_logs is not None:
+        _ouvinte_logs.stop()
+        _ouvinte_logs = None
+
+
+class ResumoAvisos:
+    """
+    Agrega avisos repetidos de laços de carga: conta as ocorrências por motivo
+    e guarda poucos exemplos, emitindo uma única linha de log por motivo.
+
+    Uso:
+        avisos = ResumoAvisos()
+        avisos.registrar('datas não encontradas na DimTempo', exemplos=datas, quantidade=len(datas))
+        avisos.emitir()
+    """
+
+    def __init__(self, max_exemplos=MAX_EXEMPLOS_AVISO):
+        self.max_exemplos = max_exemplos
+        self.contagens = {}
+        self.exemplos = {}
+
+    def registrar(self, motivo, exemplos=(), quantidade=1):
+        """
+        Conta quantidade ocorrências do motivo e guarda até max_exemplos exemplos distintos
+        """
+        self.contagens[motivo] = self.contagens.get(motivo, 0) + quantidade
+
+        guardados = self.exemplos.setdefault(motivo, [])
+        for exemplo in exemplos:
+            if len(guardados) >= self.max_exemplos:
+                break
+            if exemplo not in guardados:
+                guardados.append(exemplo)
+
+    def emitir(self):
+        """
+        Loga uma linha por motivo (com a contagem e os exemplos) e zera o resumo
+        """
+        for motivo, quantidade in self.contagens.items():
+            exemplos = self.exemplos.get(motivo)
+            sufixo = f" (ex: {', '.join(map(str, exemplos))})" if exemplos else ""
+            logging.warning(f"⚠️ {quantidade} {motivo}{sufixo}")
+
+        self.contagens.clear()
+        self.exemplos.clear()
+
+    def __bool__(self):
+        return bool(self.contagens)
+
+
+def conectar_banco(caminho_db='db/desmatamento.db', carga_em_massa=False, somente_leitura=False):
     """
     Conecta ao banco de dados SQLite
     Cria o banco e a pasta se não existirem
 
     Args:
         caminho_db: Caminho para o arquivo do banco SQLite
+        carga_em_massa: Se True, aplica o perfil de carga em massa na conexão
+        somente_leitura: Se True, abre o banco (já existente) em modo somente leitura
 
     Returns:
         Conexão com o banco de dados
     """
+    # check_same_thread=False: a conexão pode ser usada por outra thread da
+    # pipeline; o acesso concorrente é serializado pelo GerenciadorConexoes
+    if somente_leitura:
+        return sqlite3.connect(f"{Path(caminho_db).resolve().as_uri()}?mode=ro", uri=True,
+                               cached_statements=TAMANHO_CACHE_COMANDOS, check_same_thread=False)
+
     # Cria a pasta db se não existir
     Path(caminho_db).parent.mkdir(parents=True, exist_ok=True)
 
     # Conecta ao banco (cria se não existir)
-    conexao = sqlite3.connect(caminho_db)
+    conexao = sqlite3.connect(caminho_db, cached_statements=TAMANHO_CACHE_COMANDOS,
+                              check_same_thread=False)
+
+    if carga_em_massa:
+        aplicar_perfil_carga_em_massa(conexao)
 
     return conexao
 
 
-def ler_camada_silver(caminho_csv='data/silver/deforestation_silver_layer.csv'):
+def aplicar_perfil_carga_em_massa(conexao):
     """
-    Lê o arquivo CSV da camada Silver
+    Ajusta a conexão para escritas grandes:
+    - journal em WAL (fica gravado no arquivo do banco)
+    - synchronous NORMAL (menos fsyncs por commit)
+    - cache de páginas de 256 MB
+    - tabelas e índices temporários em memória
 
     Args:
-        caminho_csv: Caminho para o arquivo CSV
+        conexao: Conexão com o banco SQLite
+    """
+    conexao.execute("PRAGMA journal_mode = WAL")
+    conexao.execute("PRAGMA synchronous = NORMAL")
+    conexao.execute("PRAGMA cache_size = -262144")
+    conexao.execute("PRAGMA temp_store = MEMORY")
+
+    logging.info("🚀 Perfil de carga em massa ativado (WAL, synchronous=NORMAL, cache 256 MB)")
+
+
+def remover_indices_carga(conexao, caminho_sql=CAMINHO_SQL_INDICES):
+    """
+    Remove, antes de uma carga grande, os índices definidos em create_indexes.sql
+    que existem no banco. Manter os índices durante a carga custa uma
+    atualização de árvore B por registro inserido.
+
+    Args:
+        conexao: Conexão com o banco SQLite
+        caminho_sql: Arquivo SQL com as definições dos índices
 
     Returns:
-        DataFrame do pandas com os dados
+        Lista com o SQL dos índices removidos (para recriar_indices)
     """
+    nomes_indices = re.findall(r'CREATE\s+INDEX\s+IF\s+NOT\s+EXISTS\s+(\w+)',
+                               Path(caminho_sql).read_text(encoding='utf-8'), flags=re.IGNORECASE)
+    if not nomes_indices:
+        return []
+
+    cursor = conexao.cursor()
+    marcadores = ', '.join('?' * len(nomes_indices))
+    cursor.execute(f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND name IN ({marcadores})
+    """, nomes_indices)
+    indices = cursor.fetchall()
+
+    for nome, _ in indices:
+        cursor.execute(f"DROP INDEX IF EXISTS {nome}")
+
+    conexao.commit()
+
+    if indices:
+        logging.info(f"🗑️ {len(indices)} índices removidos para a carga: "
+                     f"{', '.join(nome for nome, _ in indices)}")
+
+    return [sql for _, sql in indices]
+
+
+def recriar_indices(conexao, definicoes_indices):
+    """
+    Recria os índices removidos por remover_indices_carga
+
+    Args:
+        conexao: Conexão com o banco SQLite
+        definicoes_indices: Lista com o SQL de criação de cada índice
+    """
+    if not definicoes_indices:
+        return
+
+    cursor = conexao.cursor()
+    for sql in definicoes_indices:
+        cursor.execute(sql)
+
+    conexao.commit()
+    logging.info(f"🔁 {len(definicoes_indices)} índices recriados após a carga")
+
+
+def ler_camada_silver(caminho_csv='data/silver/deforestation_silver_layer.csv', colunas=None,
+                      tamanho_chunk=None, tipos=TIPOS_SILVER):
+    """
+    Lê o arquivo da camada Silver (CSV ou Parquet, pela extensão do arquivo)
+    As colunas chegam com os tipos de TIPOS_SILVER (categóricos, inteiros
+    estreitos e data_imagem como data). No Parquet, apenas as colunas pedidas
+    são lidas do disco e o texto já vem codificado em dicionário.
+
+    Args:
+        caminho_csv: Caminho para o arquivo Silver (.csv ou .parquet)
+        colunas: Lista de colunas a ler (None lê todas)
+        tamanho_chunk: Se informado, lê em modo streaming e retorna um iterador
+            de DataFrames com até tamanho_chunk registros cada
+        tipos: Tipos das colunas (padrão TIPOS_SILVER; a validação usa tipos
+            anuláveis para contar nulos em vez de falhar na leitura)
+
+    Returns:
+        DataFrame do pandas com os dados (ou iterador de DataFrames no modo streaming)
+    """
+    formato_parquet = Path(caminho_csv).suffix.lower() == '.parquet'
+
     try:
-        df = pd.read_csv(caminho_csv)
+        if formato_parquet and pq is None:
+            raise ImportError("pyarrow não está instalado: não é possível ler a Silver em Parquet")
+
+        if tamanho_chunk:
+            if formato_parquet:
+                leitor = ler_parquet_em_chunks(caminho_csv, colunas, tamanho_chunk, tipos)
+            else:
+                leitor = ler_csv_em_chunks(caminho_csv, colunas, tamanho_chunk, tipos)
+            logging.info(f"✅ Arquivo Silver aberto em modo streaming (chunks de {tamanho_chunk} registros)")
+            return leitor
+
+        if formato_parquet:
+            df = pd.read_parquet(caminho_csv, columns=colunas, read_dictionary=COLUNAS_TEXTO_SILVER)
+        else:
+            df = pd.read_csv(caminho_csv, usecols=colunas, dtype=tipos)
+        df = aplicar_tipos_silver(df, tipos)
         logging.info(f"✅ Arquivo Silver lido com sucesso: {len(df)} registros")
         return df
     except FileNotFoundError:
@@ -74,6 +341,144 @@ def ler_camada_silver(caminho_csv='data/silver/deforestation_silver_layer.csv'):
         raise
 
 
+def aplicar_tipos_silver(df_silver, tipos=TIPOS_SILVER):
+    """
+    Converte as colunas de um DataFrame Silver para os tipos declarados
+    Colunas que já estão no tipo declarado não são copiadas. data_imagem
+    (categórica no CSV) vira data convertendo só as datas distintas.
+
+    Args:
+        df_silver: DataFrame lido da Silver
+        tipos: Tipos das colunas (padrão TIPOS_SILVER)
+
+    Returns:
+        DataFrame com os tipos declarados
+    """
+    tipos = {coluna: tipo for coluna, tipo in tipos.items()
+             if coluna in df_silver.columns and coluna != 'data_imagem' and df_silver[coluna].dtype != tipo}
+    if tipos:
+        df_silver = df_silver.astype(tipos)
+
+    if 'data_imagem' in df_silver.columns and not pd.api.types.is_datetime64_any_dtype(df_silver['data_imagem']):
+        datas = df_silver['data_imagem'].astype('category')
+        datas_distintas = pd.to_datetime(datas.cat.categories, format='%Y-%m-%d', errors='coerce')
+        df_silver = df_silver.assign(data_imagem=pd.Series(
+            datas_distintas.take(datas.cat.codes, allow_fill=True, fill_value=pd.NaT),
+            index=df_silver.index).astype('datetime64[ms]'))
+
+    return df_silver
+
+
+def ler_csv_em_chunks(caminho_csv, colunas, tamanho_chunk, tipos=TIPOS_SILVER):
+    """
+    Lê um arquivo CSV em chunks de até tamanho_chunk registros
+    O arquivo fica aberto enquanto o iterador é consumido e é fechado ao fim,
+    em caso de erro ou quando o iterador é fechado (close) antes do fim.
+
+    Args:
+        caminho_csv: Caminho para o arquivo CSV
+        colunas: Lista de colunas a ler (None lê todas)
+        tamanho_chunk: Número máximo de registros por chunk
+        tipos: Tipos das colunas (padrão TIPOS_SILVER)
+
+    Yields:
+        DataFrame com cada chunk, nos tipos declarados
+    """
+    with pd.read_csv(caminho_csv, usecols=colunas, dtype=tipos, chunksize=tamanho_chunk) as leitor:
+        for df_chunk in leitor:
+            yield aplicar_tipos_silver(df_chunk, tipos)
+
+
+def ler_parquet_em_chunks(caminho_parquet, colunas, tamanho_chunk, tipos=TIPOS_SILVER):
+    """
+    Lê um arquivo Parquet em lotes de até tamanho_chunk registros
+
+    Args:
+        caminho_parquet: Caminho para o arquivo Parquet
+        colunas: Lista de colunas a ler (None lê todas)
+        tamanho_chunk: Número máximo de registros por lote
+        tipos: Tipos das colunas (padrão TIPOS_SILVER)
+
+    Yields:
+        DataFrame com cada lote, nos tipos declarados
+    """
+    arquivo = pq.ParquetFile(caminho_parquet, read_dictionary=COLUNAS_TEXTO_SILVER)
+    try:
+        for lote in arquivo.iter_batches(batch_size=tamanho_chunk, columns=colunas):
+            yield aplicar_tipos_silver(lote.to_pandas(), tipos)
+    finally:
+        arquivo.close()
+
+
+def salvar_camada_silver(df_silver, caminho_saida):
+    """
+    Salva a camada Silver em CSV ou Parquet (pela extensão do arquivo)
+    No Parquet, as colunas são gravadas com os tipos de TIPOS_SILVER_PARQUET,
+    data_imagem como data e compressão COMPRESSAO_PARQUET. Os row groups têm o
+    tamanho do chunk de streaming, para que a leitura em chunks leia um por vez.
+
+    Args:
+        df_silver: DataFrame com os dados da camada Silver
+        caminho_saida: Caminho do arquivo de saída (.csv ou .parquet)
+    """
+    caminho_saida = Path(caminho_saida)
+    caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+
+    if caminho_saida.suffix.lower() != '.parquet':
+        df_silver.to_csv(caminho_saida, index=False)
+        logging.info(f"✅ Camada Silver salva em CSV: {caminho_saida}")
+        return
+
+    if pq is None:
+        raise ImportError("pyarrow não está instalado: não é possível salvar a Silver em Parquet")
+
+    tipos = {coluna: tipo for coluna, tipo in TIPOS_SILVER_PARQUET.items() if coluna in df_silver.columns}
+    df_tipado = df_silver.astype(tipos)
+    if 'data_imagem' in df_tipado.columns:
+        df_tipado['data_imagem'] = pd.to_datetime(df_tipado['data_imagem']).astype('datetime64[ms]')
+
+    df_tipado.to_parquet(caminho_saida, index=False, compression=COMPRESSAO_PARQUET,
+                         row_group_size=TAMANHO_CHUNK_SILVER)
+    logging.info(f"✅ Camada Silver salva em Parquet ({COMPRESSAO_PARQUET}): {caminho_saida}")
+
+
+def formatar_data_dimensao(serie_datas):
+    """
+    Converte datas da Silver para o texto usado em DimTempo.data_completa (YYYY-MM-DD)
+    Datas que já são texto são devolvidas sem alteração; datas (datetime) são
+    formatadas uma vez por data distinta.
+
+    Args:
+        serie_datas: Series com as datas (texto ou datetime)
+
+    Returns:
+        Series com as datas em texto
+    """
+    if not pd.api.types.is_datetime64_any_dtype(serie_datas):
+        return serie_datas
+
+    codigos, datas_distintas = pd.factorize(serie_datas)
+    textos_distintos = pd.Index(datas_distintas.strftime('%Y-%m-%d'), dtype=str)
+
+    return pd.Series(textos_distintos.take(codigos, allow_fill=True, fill_value=None), index=serie_datas.index)
+
+
+# DDL da tabela fato (também usada na migração de bancos antigos)
+SQL_TABELA_FATO = """
+    CREATE TABLE IF NOT EXISTS {nome_tabela} (
+        id_fato INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_tempo INTEGER NOT NULL,
+        id_localidade INTEGER NOT NULL,
+        id_tipo INTEGER NOT NULL,
+        area_km REAL NOT NULL,
+        hash_registro INTEGER,
+        FOREIGN KEY (id_tempo) REFERENCES DimTempo(id_tempo),
+        FOREIGN KEY (id_localidade) REFERENCES DimLocalidade(id_localidade),
+        FOREIGN KEY (id_tipo) REFERENCES DimTipoDegradacao(id_tipo)
+    )
+"""
+
+
 def criar_tabelas(conexao):
     """
     Cria as tabelas do Data Warehouse se não existirem
@@ -105,23 +510,256 @@ def criar_tabelas(conexao):
         )
     """)
 
+    # Tabela DimTipoDegradacao (tipo_desmatamento é o rótulo canônico usado na camada Gold)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS DimTipoDegradacao (
+            id_tipo INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo_degradacao TEXT UNIQUE NOT NULL,
+            tipo_desmatamento TEXT NOT NULL
+        )
+    """)
+
+    # Bancos criados antes do rótulo canônico: adiciona a coluna e preenche os tipos existentes
+    colunas_tipo = [coluna[1] for coluna in cursor.execute("PRAGMA table_info(DimTipoDegradacao)")]
+    if 'tipo_desmatamento' not in colunas_tipo:
+        cursor.execute("ALTER TABLE DimTipoDegradacao ADD COLUMN tipo_desmatamento TEXT")
+        cursor.execute("SELECT id_tipo, tipo_degradacao FROM DimTipoDegradacao")
+        cursor.executemany("UPDATE DimTipoDegradacao SET tipo_desmatamento = ? WHERE id_tipo = ?",
+                           [(obter_rotulo_tipo_desmatamento(tipo), id_tipo)
+                            for id_tipo, tipo in cursor.fetchall()])
+        logging.info("🔧 Coluna tipo_desmatamento adicionada à DimTipoDegradacao")
+
     # Tabela FatoDesmatamento
+    cursor.execute(SQL_TABELA_FATO.format(nome_tabela='FatoDesmatamento'))
+
+    # Bancos criados antes da chave natural não têm a coluna hash_registro
+    colunas_fato = [coluna[1] for coluna in cursor.execute("PRAGMA table_info(FatoDesmatamento)")]
+    if 'hash_registro' not in colunas_fato:
+        cursor.execute("ALTER TABLE FatoDesmatamento ADD COLUMN hash_registro INTEGER")
+        logging.info("🔧 Coluna hash_registro adicionada à FatoDesmatamento")
+
+    # Bancos criados antes da DimTipoDegradacao guardam o tipo como texto na fato
+    if 'tipo_degradacao' in colunas_fato:
+        migrar_fato_para_dim_tipo(conexao)
+
+    # Chave natural da fato: garante que recargas não dupliquem registros
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_fato_hash_registro
+        ON FatoDesmatamento (hash_registro)
+    """)
+
+    # Quarentena da fato: registros sem correspondência nas dimensões, com o
+    # motivo e a linha de origem na Silver. hash_registro é a mesma chave natural
+    # da fato, então o registro recarregado da quarentena não duplica a fato.
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS FatoDesmatamento (
-            id_fato INTEGER PRIMARY KEY AUTOINCREMENT,
-            id_tempo INTEGER NOT NULL,
+        CREATE TABLE IF NOT EXISTS QuarentenaFatoDesmatamento (
+            hash_registro INTEGER PRIMARY KEY,
+            indice_origem INTEGER NOT NULL,
+            data_imagem TEXT,
+            estado TEXT,
+            tipo_degradacao TEXT,
+            area_km REAL,
+            motivo TEXT NOT NULL,
+            data_quarentena TEXT NOT NULL
+        )
+    """)
+
+    # Fato anual (séries do TerraBrasilis/PRODES): uma linha por ano e estado
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS FatoDesmatamentoAnual (
+            ano INTEGER NOT NULL,
             id_localidade INTEGER NOT NULL,
-            tipo_degradacao TEXT NOT NULL,
             area_km REAL NOT NULL,
-            FOREIGN KEY (id_tempo) REFERENCES DimTempo(id_tempo),
+            PRIMARY KEY (ano, id_localidade),
             FOREIGN KEY (id_localidade) REFERENCES DimLocalidade(id_localidade)
         )
     """)
 
+    # Bancos anteriores ligavam a FatoQueimadas a dias fictícios (dia 1) da DimTempo
+    colunas_queimadas = [coluna[1] for coluna in cursor.execute("PRAGMA table_info(FatoQueimadas)")]
+    if 'id_tempo' in colunas_queimadas:
+        migrar_fato_queimadas_para_mes(conexao)
+
+    # Fato mensal de focos de queimadas: grão de mês (ano, mes), sem passar pela
+    # DimTempo, que é diária (datas dos avisos do DETER)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS FatoQueimadas (
+            ano INTEGER NOT NULL,
+            mes INTEGER NOT NULL CHECK (mes BETWEEN 1 AND 12),
+            focos INTEGER NOT NULL,
+            PRIMARY KEY (ano, mes)
+        )
+    """)
+
+    # Versão dos dados: contador por tabela, incrementado a cada escrita que
+    # muda o seu conteúdo (usado para invalidar caches de consultas da Gold)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS VersaoDados (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL,
+            atualizada_em TEXT NOT NULL
+        )
+    """)
+    cursor.execute(
+        "INSERT OR IGNORE INTO VersaoDados (tabela, versao, atualizada_em) VALUES (?, ?, ?)",
+        (GERACAO_BANCO, uuid.uuid4().int >> 65, datetime.now().isoformat(timespec='seconds')))
+
     conexao.commit()
     logging.info("✅ Tabelas criadas/verificadas com sucesso")
 
 
+def incrementar_versao_dados(conexao, tabela):
+    """
+    Registra que o conteúdo de uma tabela mudou
+    Não faz commit: a nova versão entra na mesma transação da escrita.
+
+    Args:
+        conexao: Conexão de escrita
+        tabela: Nome da tabela alterada
+    """
+    conexao.execute("""
+        INSERT INTO VersaoDados (tabela, versao, atualizada_em) VALUES (?, 1, ?)
+        ON CONFLICT (tabela) DO UPDATE SET versao = versao + 1, atualizada_em = excluded.atualizada_em
+    """, (tabela, datetime.now().isoformat(timespec='seconds')))
+
+
+def obter_versao_dados(conexao, tabela=None):
+    """
+    Retorna a versão dos dados de uma tabela ou do Data Warehouse
+
+    Args:
+        conexao: Conexão com o banco
+        tabela: Nome da tabela (None retorna a versão geral, que muda sempre
+            que qualquer tabela versionada muda)
+
+    Returns:
+        Versão (0 se a tabela nunca foi versionada; None se o banco é anterior
+        à tabela VersaoDados e não tem versão)
+    """
+    try:
+        if tabela is None:
+            cursor = conexao.execute(
+                "SELECT COALESCE(SUM(versao), 0) FROM VersaoDados WHERE tabela <> ?", (GERACAO_BANCO,))
+        else:
+            cursor = conexao.execute("SELECT COALESCE(MAX(versao), 0) FROM VersaoDados WHERE tabela = ?", (tabela,))
+    except sqlite3.OperationalError as e:
+        # Banco criado antes do versionamento (ex: validação standalone sem recarga)
+        if 'no such table' in str(e):
+            return None
+        raise
+
+    return cursor.fetchone()[0]
+
+
+def obter_versoes_dados(conexao, tabelas):
+    """
+    Retorna a geração do banco e as versões de um conjunto de tabelas, numa só consulta
+
+    Args:
+        conexao: Conexão com o banco
+        tabelas: Nomes das tabelas
+
+    Returns:
+        Tupla (geração, (versão de cada tabela, na ordem recebida)), com 0 para
+        tabelas nunca versionadas e geração None em bancos criados antes dela;
+        None se o banco é anterior à tabela VersaoDados
+    """
+    marcadores = ', '.join('?' * (len(tabelas) + 1))
+    try:
+        linhas = conexao.execute(
+            f"SELECT tabela, versao FROM VersaoDados WHERE tabela IN ({marcadores})",
+            (GERACAO_BANCO, *tabelas)).fetchall()
+    except sqlite3.OperationalError as e:
+        if 'no such table' in str(e):
+            return None
+        raise
+
+    versoes = dict(linhas)
+    return versoes.get(GERACAO_BANCO), tuple(versoes.get(tabela, 0) for tabela in tabelas)
+
+
+def migrar_fato_queimadas_para_mes(conexao):
+    """
+    Converte uma FatoQueimadas antiga (id_tempo do primeiro dia do mês) para o
+    grão de mês (ano, mes) e remove da DimTempo os dias fictícios que só ela
+    usava (dias referenciados pela FatoDesmatamento ou pela quarentena ficam)
+
+    Args:
+        conexao: Conexão com o banco SQLite
+    """
+    logging.info("🔧 Migrando FatoQueimadas para o grão de mês...")
+    cursor = conexao.cursor()
+
+    cursor.execute("""
+        CREATE TABLE FatoQueimadas_mensal (
+            ano INTEGER NOT NULL,
+            mes INTEGER NOT NULL CHECK (mes BETWEEN 1 AND 12),
+            focos INTEGER NOT NULL,
+            PRIMARY KEY (ano, mes)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO FatoQueimadas_mensal (ano, mes, focos)
+        SELECT t.ano, t.mes, q.focos
+        FROM FatoQueimadas q
+        JOIN DimTempo t ON q.id_tempo = t.id_tempo
+    """)
+    cursor.execute("""
+        DELETE FROM DimTempo
+        WHERE id_tempo IN (SELECT id_tempo FROM FatoQueimadas)
+          AND id_tempo NOT IN (SELECT id_tempo FROM FatoDesmatamento)
+          AND data_completa NOT IN (SELECT data_imagem FROM QuarentenaFatoDesmatamento
+                                    WHERE data_imagem IS NOT NULL)
+    """)
+    dias_removidos = cursor.rowcount
+
+    cursor.execute("DROP TABLE FatoQueimadas")
+    cursor.execute("ALTER TABLE FatoQueimadas_mensal RENAME TO FatoQueimadas")
+    conexao.commit()
+
+    logging.info(f"✅ FatoQueimadas migrada ({dias_removidos} dias fictícios removidos da DimTempo)")
+
+
+def migrar_fato_para_dim_tipo(conexao):
+    """
+    Converte uma FatoDesmatamento antiga (tipo_degradacao em texto) para o
+    modelo com a FK id_tipo: popula a DimTipoDegradacao com os tipos
+    existentes e reconstrói a tabela fato preservando id_fato e hash_registro.
+    As views da camada Gold são removidas e devem ser recriadas.
+
+    Args:
+        conexao: Conexão com o banco SQLite
+    """
+    logging.info("🔧 Migrando FatoDesmatamento para a DimTipoDegradacao...")
+    cursor = conexao.cursor()
+
+    # As views antigas referenciam f.tipo_degradacao e impedem a troca da tabela
+    for nome_view in ('vw_desmatamento_agregado', 'vw_desmatamento_por_ano_estado'):
+        cursor.execute(f"DROP VIEW IF EXISTS {nome_view}")
+
+    cursor.execute("SELECT DISTINCT tipo_degradacao FROM FatoDesmatamento")
+    cursor.executemany("""
+        INSERT OR IGNORE INTO DimTipoDegradacao (tipo_degradacao, tipo_desmatamento)
+        VALUES (?, ?)
+    """, [(tipo, obter_rotulo_tipo_desmatamento(tipo)) for (tipo,) in cursor.fetchall()])
+
+    cursor.execute(SQL_TABELA_FATO.format(nome_tabela='FatoDesmatamento_migracao'))
+    cursor.execute("""
+        INSERT INTO FatoDesmatamento_migracao
+            (id_fato, id_tempo, id_localidade, id_tipo, area_km, hash_registro)
+        SELECT f.id_fato, f.id_tempo, f.id_localidade, d.id_tipo, f.area_km, f.hash_registro
+        FROM FatoDesmatamento f
+        JOIN DimTipoDegradacao d ON f.tipo_degradacao = d.tipo_degradacao
+    """)
+    registros_migrados = cursor.rowcount
+
+    cursor.execute("DROP TABLE FatoDesmatamento")
+    cursor.execute("ALTER TABLE FatoDesmatamento_migracao RENAME TO FatoDesmatamento")
+    conexao.commit()
+
+    logging.info(f"   ✓ {registros_migrados} registros migrados para id_tipo")
+
+
 def obter_regiao_por_estado(estado):
     """
     Retorna a região do Brasil baseada no estado
@@ -146,6 +784,75 @@ def obter_regiao_por_estado(estado):
     return mapa_regioes.get(estado, 'Não Identificado')
 
 
+# Nomes dos meses (posição + 1 = número do mês), como nas colunas das séries mensais
+NOMES_MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+               'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+# Siglas das UFs pelo nome do estado (como vem nas séries do TerraBrasilis)
+SIGLAS_ESTADOS = {
+    'Acre': 'AC', 'Alagoas': 'AL', 'Amapá': 'AP', 'Amazonas': 'AM', 'Bahia': 'BA',
+    'Ceará': 'CE', 'Distrito Federal': 'DF', 'Espírito Santo': 'ES', 'Goiás': 'GO',
+    'Maranhão': 'MA', 'Mato Grosso': 'MT', 'Mato Grosso do Sul': 'MS', 'Minas Gerais': 'MG',
+    'Pará': 'PA', 'Paraíba': 'PB', 'Paraná': 'PR', 'Pernambuco': 'PE', 'Piauí': 'PI',
+    'Rio de Janeiro': 'RJ', 'Rio Grande do Norte': 'RN', 'Rio Grande do Sul': 'RS',
+    'Rondônia': 'RO', 'Roraima': 'RR', 'Santa Catarina': 'SC', 'São Paulo': 'SP',
+    'Sergipe': 'SE', 'Tocantins': 'TO'
+}
+
+
+def normalizar_nome_estado(nome_estado):
+    """
+    Normaliza o nome de um estado para comparação: sem acentos, espaços extras
+    nem diferença entre maiúsculas e minúsculas (ex: 'Rondônia' -> 'rondonia')
+    """
+    sem_acentos = unicodedata.normalize('NFKD', str(nome_estado)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acentos.split()).casefold()
+
+
+_SIGLAS_POR_NOME_NORMALIZADO = {normalizar_nome_estado(nome): sigla for nome, sigla in SIGLAS_ESTADOS.items()}
+
+
+@lru_cache(maxsize=None)
+def obter_sigla_estado(nome_estado):
+    """
+    Retorna a sigla da UF a partir do nome do estado
+    O resultado fica em cache: cada nome distinto é normalizado uma única vez.
+
+    Args:
+        nome_estado: Nome do estado (ex: Pará, RONDONIA) ou a própria sigla (ex: PA)
+
+    Returns:
+        Sigla do estado ou None se não for reconhecido
+    """
+    nome_normalizado = normalizar_nome_estado(nome_estado)
+
+    if nome_normalizado.upper() in SIGLAS_ESTADOS.values():
+        return nome_normalizado.upper()
+
+    return _SIGLAS_POR_NOME_NORMALIZADO.get(nome_normalizado)
+
+
+def obter_rotulo_tipo_desmatamento(tipo_degradacao):
+    """
+    Retorna o rótulo canônico do tipo de desmatamento usado na camada Gold
+
+    Args:
+        tipo_degradacao: Tipo de degradação como vem da Silver (ex: mineração)
+
+    Returns:
+        Rótulo do tipo de desmatamento
+    """
+    mapa_rotulos = {
+        'corte raso com solo exposto': 'Corte Raso com Solo Exposto',
+        'corte raso com vegetação': 'Corte Raso com Vegetação',
+        'desmatamento por degradação progressiva': 'Desmatamento por Degradação Progressiva',
+        'mineração': 'Mineração',
+        'floresta inundada': 'Floresta Inundada'
+    }
+
+    return mapa_rotulos.get(tipo_degradacao, 'Outros')
+
+
 def contar_registros_tabela(conexao, nome_tabela):
     """
     Conta quantos registros existem em uma tabela
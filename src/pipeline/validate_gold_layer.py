@@ -1,6 +1,8 @@
 # Script para validar a camada Gold (Views e arquivos CSV).
 # Pode ser executado de forma independente após a criação da camada Gold.
 
+import io
+import hashlib
 import logging
 import pandas as pd
 from pathlib import Path
@@ -8,6 +10,8 @@ import sys
 
 # Importa utilitários compartilhados
 from utils import conectar_banco, configurar_logs
+from create_gold_layer import ler_manifesto, PASTA_PARTICOES, ARQUIVO_MANIFESTO
+from gold_cache import cache_consultas_gold
 
 # --- Construção de Caminhos Absolutos ---
 # Define o caminho raiz do projeto (a pasta que contém 'src', 'data', etc.)
@@ -17,30 +21,33 @@ DEFAULT_DB_PATH = PROJECT_ROOT / 'db' / 'desmatamento.db'
 GOLD_DATA_PATH = PROJECT_ROOT / 'data' / 'gold'
 
 
-def validar_camada_gold(caminho_db=DEFAULT_DB_PATH, caminho_gold=GOLD_DATA_PATH):
+def validar_camada_gold(caminho_db=DEFAULT_DB_PATH, caminho_gold=GOLD_DATA_PATH, conexao=None):
     """
     Valida os artefatos da camada Gold (Views no banco e arquivos CSV).
 
     Args:
         caminho_db (Path): Caminho para o banco de dados.
         caminho_gold (Path): Caminho para a pasta da camada Gold.
+        conexao: Conexão (somente leitura) da pipeline (opcional). Quando informada, não é fechada ao final.
 
     Returns:
         bool: True se todas as validações passarem, False caso contrário.
     """
     logging.info("=" * 60)
-    logging.info("🔍 VALIDANDO A CAMADA GOLD (VIEW E CSV)")
+    logging.info("🔍 VALIDANDO A CAMADA GOLD (VIEW, CSV E PARTIÇÕES)")
     logging.info("=" * 60)
 
     todas_ok = True
-    conexao = None
+    conexao_propria = conexao is None
+    registros_view = None
 
     try:
         # --- Validação 1: View no Banco de Dados ---
         view_name = "vw_desmatamento_por_ano_estado"
         logging.info(f"1. Validando a VIEW '{view_name}' no banco de dados...")
 
-        conexao = conectar_banco(caminho_db)
+        if conexao_propria:
+            conexao = conectar_banco(caminho_db)
         cursor = conexao.cursor()
 
         # Checa se a view existe
@@ -51,11 +58,11 @@ def validar_camada_gold(caminho_db=DEFAULT_DB_PATH, caminho_gold=GOLD_DATA_PATH)
         else:
             logging.info(f"   ✅ View '{view_name}' encontrada.")
 
-            # Checa se a view tem registros
-            cursor.execute(f"SELECT COUNT(*) FROM {view_name}")
-            count = cursor.fetchone()[0]
-            if count > 0:
-                logging.info(f"   ✅ A view contém {count} registros.")
+            # Checa se a view tem registros (pelo cache da Gold: na pipeline, a leitura
+            # feita pela exportação da camada Gold é reaproveitada aqui)
+            registros_view = len(cache_consultas_gold.consultar(conexao, 'desmatamento_por_ano_estado'))
+            if registros_view > 0:
+                logging.info(f"   ✅ A view contém {registros_view} registros.")
             else:
                 logging.error(f"   ❌ A view '{view_name}' está vazia!")
                 todas_ok = False
@@ -74,7 +81,10 @@ def validar_camada_gold(caminho_db=DEFAULT_DB_PATH, caminho_gold=GOLD_DATA_PATH)
             # Checa se o CSV tem dados
             try:
                 df = pd.read_csv(caminho_arquivo_gold, sep=';')
-                if not df.empty:
+                if registros_view and len(df) != registros_view:
+                    logging.error(f"   ❌ O arquivo CSV contém {len(df)} registros e a view {registros_view}!")
+                    todas_ok = False
+                elif not df.empty:
                     logging.info(f"   ✅ O arquivo CSV contém {len(df)} registros.")
                 else:
                     logging.error("   ❌ O arquivo CSV está vazio!")
@@ -83,11 +93,47 @@ def validar_camada_gold(caminho_db=DEFAULT_DB_PATH, caminho_gold=GOLD_DATA_PATH)
                 logging.error("   ❌ O arquivo CSV está vazio!")
                 todas_ok = False
 
+        # --- Validação 3: Partições por ano e manifesto ---
+        logging.info("")
+        caminho_particoes = caminho_gold / PASTA_PARTICOES
+        logging.info(f"3. Validando as partições em '{PASTA_PARTICOES}/'...")
+
+        particoes = ler_manifesto(caminho_particoes).get('particoes', {})
+        if not particoes:
+            logging.error(f"   ❌ Manifesto '{ARQUIVO_MANIFESTO}' não encontrado ou sem partições!")
+            todas_ok = False
+        else:
+            particoes_com_falha = 0
+            for ano, particao in sorted(particoes.items()):
+                caminho_particao = caminho_particoes / particao['arquivo']
+                if not caminho_particao.exists():
+                    logging.error(f"   ❌ Partição {ano} não encontrada: {caminho_particao}")
+                    particoes_com_falha += 1
+                    continue
+
+                conteudo = caminho_particao.read_bytes()
+                if hashlib.sha256(conteudo).hexdigest() != particao['sha256']:
+                    logging.error(f"   ❌ Partição {ano}: checksum SHA-256 diferente do manifesto!")
+                    particoes_com_falha += 1
+                    continue
+
+                registros = len(pd.read_csv(io.BytesIO(conteudo), sep=';'))
+                if registros != particao['registros']:
+                    logging.error(f"   ❌ Partição {ano}: {registros} registros no arquivo, "
+                                  f"{particao['registros']} no manifesto!")
+                    particoes_com_falha += 1
+
+            if particoes_com_falha == 0:
+                logging.info(f"   ✅ {len(particoes)} partições conferidas com o manifesto.")
+            else:
+                logging.error(f"   ❌ {particoes_com_falha} de {len(particoes)} partições não conferem com o manifesto!")
+                todas_ok = False
+
     except Exception as e:
         logging.error(f"   ❌ Erro inesperado durante a validação da camada Gold: {e}")
         todas_ok = False
     finally:
-        if conexao:
+        if conexao_propria and conexao:
             conexao.close()
 
     logging.info("-" * 60)
@@ -0,0 +1,241 @@
+# Constrói a camada Silver a partir do DBF de avisos de desmatamento (INPE).
+# Substitui o caminho do notebook do Colab (extract.py): os registros do DBF são
+# lidos em streaming, em chunks tipados; cada chunk passa pela seleção de
+# colunas, renomeação e variáveis derivadas e é gravado direto na Silver, sem
+# carregar o DBF inteiro em memória e sem CSVs intermediários (Bronze validado).
+#
+# Uso: python src/silver/build_silver.py [caminho_dbf] [caminho_silver]
+# A extensão do arquivo de saída define o formato (.csv ou .parquet).
+
+import logging
+import sys
+import pandas as pd
+from pathlib import Path
+
+# Leitor de DBF (dependência da construção da Silver, não da pipeline de carga)
+try:
+    from dbfread import DBF
+except ImportError:
+    DBF = None
+
+# Gravação da Silver em Parquet é opcional (como na pipeline)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Utilitários compartilhados com a pipeline de carga
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'pipeline'))
+
+from utils import configurar_logs, pq, COMPRESSAO_PARQUET, TAMANHO_CHUNK_SILVER, TIPOS_SILVER_PARQUET
+from transform_silver import transformar_avisos
+from validate_silver import ResultadoValidacao, validar_chunk, REGRAS_SILVER
+
+# --- Caminhos padrão (raiz do projeto: silver -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_DBF_PATH = PROJECT_ROOT / 'data' / 'bronze' / 'yearly_deforestation_biome.dbf'
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+
+# Colunas do DBF usadas na Silver e seus nomes em português
+COLUNAS_DBF = {
+    'state': 'estado',
+    'sub_class': 'tipo_degradacao',
+    'image_date': 'data_imagem',
+    'area_km': 'area_km',
+}
+
+# Colunas da camada Silver, na ordem do arquivo
+COLUNAS_SILVER = ['estado', 'tipo_degradacao', 'data_imagem', 'area_km', 'ano', 'mes', 'dia', 'ano_mes', 'semestre']
+
+
+def ler_dbf_em_chunks(caminho_dbf, tamanho_chunk=TAMANHO_CHUNK_SILVER, codificacao=None):
+    """
+    Lê os registros do DBF em streaming, em DataFrames de até tamanho_chunk registros
+    Apenas as colunas de COLUNAS_DBF são mantidas de cada registro.
+
+    Args:
+        caminho_dbf: Caminho para o arquivo DBF
+        tamanho_chunk: Número máximo de registros por chunk
+        codificacao: Codificação dos textos do DBF (None usa a declarada no arquivo)
+
+    Yields:
+        DataFrame com as colunas do DBF (nomes originais, em minúsculas)
+    """
+    if DBF is None:
+        raise ImportError("dbfread não está instalado: não é possível ler o arquivo DBF")
+
+    tabela = DBF(caminho_dbf, load=False, lowernames=True, encoding=codificacao,
+                 recfactory=lambda campos: [valor for nome, valor in campos if nome in COLUNAS_DBF])
+
+    colunas = [nome for nome in tabela.field_names if nome in COLUNAS_DBF]
+    ausentes = set(COLUNAS_DBF) - set(colunas)
+    if ausentes:
+        raise ValueError(f"Colunas ausentes no DBF {caminho_dbf}: {', '.join(sorted(ausentes))}")
+
+    registros = []
+    for registro in tabela:
+        registros.append(registro)
+        if len(registros) == tamanho_chunk:
+            yield pd.DataFrame.from_records(registros, columns=colunas)
+            registros = []
+
+    if registros:
+        yield pd.DataFrame.from_records(registros, columns=colunas)
+
+
+def transformar_chunk(df_chunk):
+    """
+    Aplica a um chunk do DBF as transformações da camada Silver:
+    renomeia as colunas e aplica transformar_avisos (tipos, descarte de classes
+    dAAAA e datas inválidas, colunas derivadas da data)
+
+    Args:
+        df_chunk: DataFrame com as colunas de COLUNAS_DBF
+
+    Returns:
+        Tupla (df_silver, descartados): chunk no formato da Silver e dicionário
+        com o número de registros descartados por motivo
+    """
+    df_silver, descartados = transformar_avisos(df_chunk.rename(columns=COLUNAS_DBF))
+
+    return df_silver[COLUNAS_SILVER], descartados
+
+
+class EscritorSilver:
+    """
+    Grava a camada Silver chunk a chunk, em CSV ou Parquet (pela extensão)
+
+    Os chunks são gravados em um arquivo temporário, que só substitui a Silver
+    em fechar(): uma construção interrompida não deixa uma Silver incompleta.
+    No Parquet, cada chunk vira um row group, com os tipos de TIPOS_SILVER_PARQUET.
+    """
+
+    def __init__(self, caminho_saida):
+        self.caminho_saida = Path(caminho_saida)
+        self.caminho_temporario = self.caminho_saida.with_name(self.caminho_saida.name + '.tmp')
+        self.parquet = self.caminho_saida.suffix.lower() == '.parquet'
+        self.escritor_parquet = None
+        self.chunks_gravados = 0
+
+        if self.parquet and pq is None:
+            raise ImportError("pyarrow não está instalado: não é possível salvar a Silver em Parquet")
+
+        self.caminho_saida.parent.mkdir(parents=True, exist_ok=True)
+
+    def escrever(self, df_silver):
+        """
+        Acrescenta um chunk ao arquivo
+
+        Args:
+            df_silver: DataFrame com as colunas de COLUNAS_SILVER
+        """
+        if self.parquet:
+            df_tipado = df_silver.astype(TIPOS_SILVER_PARQUET)
+            df_tipado['data_imagem'] = df_tipado['data_imagem'].astype('datetime64[ms]')
+            tabela = pa.Table.from_pandas(df_tipado, preserve_index=False)
+
+            if self.escritor_parquet is None:
+                self.escritor_parquet = pq.ParquetWriter(self.caminho_temporario, tabela.schema,
+                                                         compression=COMPRESSAO_PARQUET)
+            self.escritor_parquet.write_table(tabela, row_group_size=TAMANHO_CHUNK_SILVER)
+        else:
+            df_silver.to_csv(self.caminho_temporario, index=False, date_format='%Y-%m-%d',
+                             mode='w' if self.chunks_gravados == 0 else 'a', header=self.chunks_gravados == 0)
+
+        self.chunks_gravados += 1
+
+    def fechar(self, sucesso=True):
+        """
+        Finaliza o arquivo e substitui a Silver (ou descarta o temporário)
+
+        Args:
+            sucesso: Se False, o arquivo temporário é removido e a Silver anterior é mantida
+        """
+        if self.escritor_parquet is not None:
+            self.escritor_parquet.close()
+
+        if sucesso and self.chunks_gravados > 0:
+            self.caminho_temporario.replace(self.caminho_saida)
+        else:
+            self.caminho_temporario.unlink(missing_ok=True)
+
+
+def construir_camada_silver(caminho_dbf=DEFAULT_DBF_PATH, caminho_silver=DEFAULT_SILVER_PATH,
+                            tamanho_chunk=TAMANHO_CHUNK_SILVER):
+    """
+    Constrói a camada Silver lendo o DBF em streaming
+    A memória fica limitada ao tamanho do chunk. Cada chunk transformado passa
+    pelas regras de qualidade de REGRAS_SILVER antes de ser gravado.
+
+    Args:
+        caminho_dbf: Caminho para o arquivo DBF de avisos
+        caminho_silver: Caminho do arquivo Silver (.csv ou .parquet)
+        tamanho_chunk: Número máximo de registros em memória por vez
+
+    Returns:
+        Dicionário com registros lidos, gravados, descartados por motivo e o
+        ResultadoValidacao da Silver gravada
+    """
+    logging.info("=" * 60)
+    logging.info(f"🥈 CONSTRUINDO A CAMADA SILVER (chunks de {tamanho_chunk} registros)")
+    logging.info("=" * 60)
+    logging.info(f"📂 DBF de origem: {caminho_dbf}")
+
+    registros_lidos = 0
+    registros_gravados = 0
+    descartados = {}
+    data_minima = None
+    data_maxima = None
+    validacao = ResultadoValidacao(REGRAS_SILVER)
+
+    escritor = EscritorSilver(caminho_silver)
+    sucesso = False
+
+    try:
+        for numero_chunk, df_chunk in enumerate(ler_dbf_em_chunks(caminho_dbf, tamanho_chunk), start=1):
+            registros_lidos += len(df_chunk)
+
+            df_silver, descartados_chunk = transformar_chunk(df_chunk)
+            validar_chunk(df_silver, validacao)
+            escritor.escrever(df_silver)
+            registros_gravados += len(df_silver)
+
+            for motivo, quantidade in descartados_chunk.items():
+                descartados[motivo] = descartados.get(motivo, 0) + quantidade
+
+            if len(df_silver) > 0:
+                menor, maior = df_silver['data_imagem'].min(), df_silver['data_imagem'].max()
+                data_minima = menor if data_minima is None else min(data_minima, menor)
+                data_maxima = maior if data_maxima is None else max(data_maxima, maior)
+
+            logging.info(f"📦 Chunk {numero_chunk}: {len(df_silver)} registros gravados "
+                         f"({registros_lidos} lidos no total)")
+
+        sucesso = True
+    finally:
+        escritor.fechar(sucesso)
+
+    logging.info("=" * 60)
+    logging.info("✅ Camada Silver construída!")
+    logging.info(f"   • Registros lidos do DBF: {registros_lidos}")
+    logging.info(f"   • Registros gravados na Silver: {registros_gravados}")
+    for motivo, quantidade in descartados.items():
+        logging.info(f"   • Descartados ({motivo}): {quantidade}")
+    if data_minima is not None:
+        logging.info(f"   • Período: {data_minima:%Y-%m-%d} a {data_maxima:%Y-%m-%d}")
+    logging.info(f"📁 Arquivo Silver: {caminho_silver}")
+    validacao.emitir()
+    logging.info("=" * 60)
+
+    return {
+        'registros_lidos': registros_lidos,
+        'registros_gravados': registros_gravados,
+        'descartados': descartados,
+        'validacao': validacao,
+    }
+
+
+if __name__ == "__main__":
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'build_silver.log')
+    construir_camada_silver(*sys.argv[1:3])
@@ -0,0 +1,128 @@
+# Transformações da camada Silver com operações vetorizadas.
+# As colunas derivadas da data (ano, mes, dia, ano_mes, semestre) são calculadas
+# com aritmética inteira sobre os dias do datetime64, sem .apply nem formatação
+# de texto linha a linha; a filtragem das classes dAAAA avalia a expressão regular apenas
+# nos valores distintos e propaga o resultado para as linhas pelos códigos.
+
+import re
+import numpy as np
+import pandas as pd
+
+# Classes no formato dAAAA (ex: d2008) não são tipos de degradação
+PADRAO_TIPO_INVALIDO = r'^d\d{4}$'
+
+
+def converter_datas(valores):
+    """
+    Converte as datas de origem (texto AAAA-MM-DD, date ou datetime) para datetime64
+    Valores inválidos ou nulos viram NaT.
+
+    Args:
+        valores: Series com as datas
+
+    Returns:
+        Series datetime64
+    """
+    if pd.api.types.is_datetime64_any_dtype(valores):
+        return valores
+
+    # Há poucas datas distintas: converte cada uma uma vez e distribui pelos códigos
+    codigos, distintas = pd.factorize(valores)
+    formato = '%Y-%m-%d' if pd.api.types.is_string_dtype(distintas) else None
+    datas_distintas = pd.to_datetime(pd.Index(distintas), format=formato, errors='coerce')
+
+    return pd.Series(datas_distintas.take(codigos, allow_fill=True, fill_value=pd.NaT), index=valores.index)
+
+
+def derivar_colunas_data(datas):
+    """
+    Calcula ano, mes, dia, ano_mes (AAAA-MM) e semestre a partir das datas
+
+    O texto de ano_mes é montado uma única vez para cada mês do intervalo; as
+    linhas guardam só o código do mês (categórico).
+
+    Args:
+        datas: Series datetime64 sem valores nulos (NaT)
+
+    Returns:
+        DataFrame (mesmo índice de datas) com ano (int16), mes, dia e semestre
+        (int8) e ano_mes (categórico de texto)
+    """
+    # Dias desde 1970-01-01 -> (ano, mês, dia) só com aritmética inteira
+    # (algoritmo civil_from_days de H. Hinnant, calendário gregoriano proléptico)
+    dias = datas.to_numpy(dtype='datetime64[D]').view(np.int64).astype(np.int32) + 719468
+    era = dias // 146097
+    dia_da_era = dias - era * 146097
+    ano_da_era = (dia_da_era - dia_da_era // 1460 + dia_da_era // 36524 - dia_da_era // 146096) // 365
+    dia_do_ano = dia_da_era - (365 * ano_da_era + ano_da_era // 4 - ano_da_era // 100)
+    mes_desde_marco = (5 * dia_do_ano + 2) // 153
+
+    dia = dia_do_ano - (153 * mes_desde_marco + 2) // 5 + 1
+    mes = np.where(mes_desde_marco < 10, mes_desde_marco + 3, mes_desde_marco - 9)
+    ano = ano_da_era + era * 400 + (mes <= 2)
+
+    # Meses desde 1970-01 (um inteiro por ano/mês)
+    meses_absolutos = (ano - 1970) * 12 + mes - 1
+
+    # Um rótulo por mês do intervalo coberto; cada linha indexa o seu pelo deslocamento
+    primeiro_mes = int(meses_absolutos.min()) if len(meses_absolutos) else 0
+    ultimo_mes = int(meses_absolutos.max()) if len(meses_absolutos) else -1
+    rotulos = [f"{valor // 12 + 1970:04d}-{valor % 12 + 1:02d}" for valor in range(primeiro_mes, ultimo_mes + 1)]
+
+    return pd.DataFrame({
+        'ano': ano.astype(np.int16),
+        'mes': mes.astype(np.int8),
+        'dia': dia.astype(np.int8),
+        'ano_mes': pd.Categorical.from_codes(meses_absolutos - primeiro_mes, categories=rotulos),
+        'semestre': np.where(mes <= 6, 1, 2).astype(np.int8),
+    }, index=datas.index)
+
+
+def identificar_tipos_invalidos(tipos, padrao=PADRAO_TIPO_INVALIDO):
+    """
+    Marca as linhas cujo tipo de degradação casa com o padrão (classes dAAAA)
+    A expressão regular é avaliada só nos valores distintos; valores nulos não casam.
+
+    Args:
+        tipos: Series com o tipo de degradação
+        padrao: Expressão regular das classes inválidas
+
+    Returns:
+        Array booleano (uma posição por linha)
+    """
+    codigos, distintos = pd.factorize(tipos)
+    expressao = re.compile(padrao)
+    distintos_invalidos = np.array([expressao.match(str(valor)) is not None for valor in distintos], dtype=bool)
+
+    # Código -1 (nulo) aponta para a posição extra, sempre válida
+    return np.append(distintos_invalidos, False)[codigos]
+
+
+def transformar_avisos(df_avisos):
+    """
+    Aplica as transformações da camada Silver aos avisos já renomeados:
+    tipa data e área, descarta classes dAAAA e datas inválidas e acrescenta as
+    colunas derivadas da data
+
+    Args:
+        df_avisos: DataFrame com estado, tipo_degradacao, data_imagem e area_km
+
+    Returns:
+        Tupla (df_silver, descartados): DataFrame transformado e dicionário com o
+        número de registros descartados por motivo
+    """
+    datas = converter_datas(df_avisos['data_imagem'])
+
+    tipo_invalido = identificar_tipos_invalidos(df_avisos['tipo_degradacao'])
+    data_invalida = datas.isna().to_numpy() & ~tipo_invalido
+    manter = ~(tipo_invalido | data_invalida)
+
+    df = df_avisos.assign(data_imagem=datas, area_km=pd.to_numeric(df_avisos['area_km'], errors='coerce'))[manter]
+    df = pd.concat([df, derivar_colunas_data(df['data_imagem'])], axis=1)
+
+    descartados = {
+        'tipo dAAAA': int(tipo_invalido.sum()),
+        'data inválida': int(data_invalida.sum()),
+    }
+
+    return df, descartados
@@ -0,0 +1,302 @@
+# Validação de qualidade da camada Silver.
+# Substitui o schema pandera do notebook (extract.py), que validava o DataFrame
+# inteiro duas vezes e materializava todos os failure_cases. As mesmas regras
+# (UF com 2 letras, tipo preenchido, area_km >= 0, faixas de ano/mês/dia e o
+# formato de ano_mes) são aplicadas de forma vetorizada chunk a chunk, ou
+# empurradas como SQL sobre uma tabela de staging. O resultado traz a contagem
+# de falhas por regra e poucos exemplos de linhas que falharam.
+#
+# Uso: python src/silver/validate_silver.py [caminho_silver] [--sql]
+
+import argparse
+import logging
+import sqlite3
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Utilitários compartilhados com a pipeline de carga
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'pipeline'))
+
+from utils import configurar_logs, ler_camada_silver, TAMANHO_CHUNK_SILVER, TIPOS_SILVER
+
+# --- Caminhos padrão (raiz do projeto: silver -> src -> PROJECT_ROOT) ---
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_SILVER_PATH = PROJECT_ROOT / 'data' / 'silver' / 'deforestation_silver_layer.csv'
+
+# Exemplos de linhas guardados por regra
+MAX_EXEMPLOS_FALHA = 5
+
+# Tabela de staging usada na validação em SQL
+TABELA_STAGING = 'staging_silver'
+
+# Tipos de leitura da validação: os mesmos de TIPOS_SILVER, mas com inteiros
+# anuláveis e largos, para que nulos e valores fora da faixa (mes vazio,
+# dia 300) sejam contados pelas regras em vez de interromper a leitura
+TIPOS_VALIDACAO_SILVER = {
+    **TIPOS_SILVER,
+    'ano': 'Int64',
+    'mes': 'Int64',
+    'dia': 'Int64',
+    'semestre': 'Int64',
+}
+
+
+class RegraQualidade:
+    """
+    Uma regra de qualidade sobre uma coluna da Silver
+
+    Args:
+        nome: Nome único da regra
+        coluna: Coluna validada
+        descricao: Descrição da falha (usada no log)
+        falha: Função que recebe a Series da coluna e devolve a máscara das
+            linhas que falham (valores nulos devem falhar)
+        falha_sql: Expressão SQL verdadeira para as linhas que falham
+    """
+
+    def __init__(self, nome, coluna, descricao, falha, falha_sql):
+        self.nome = nome
+        self.coluna = coluna
+        self.descricao = descricao
+        self.falha = falha
+        self.falha_sql = falha_sql
+
+    def avaliar(self, serie):
+        """
+        Aplica a regra a uma Series e devolve a máscara (array booleano) de falhas
+        Em colunas categóricas a regra é avaliada só nas categorias.
+        """
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            falhas_categorias = np.asarray(self.falha(pd.Series(serie.cat.categories)), dtype=bool)
+            # Código -1 (nulo) aponta para a posição extra: nulos falham
+            return np.append(falhas_categorias, True)[serie.cat.codes.to_numpy()]
+
+        # Em inteiros anuláveis a comparação com nulo dá <NA>: nulos falham
+        return pd.Series(self.falha(serie)).fillna(True).to_numpy(dtype=bool)
+
+    def __repr__(self):
+        return f"RegraQualidade({self.nome!r}, coluna={self.coluna!r})"
+
+
+# Regras do schema da Silver (as mesmas do pandera do notebook)
+REGRAS_SILVER = [
+    RegraQualidade('estado_uf', 'estado', 'estado não é uma UF de 2 letras',
+                   lambda serie: serie.str.len() != 2,
+                   "estado IS NULL OR length(estado) <> 2"),
+    RegraQualidade('tipo_degradacao_vazio', 'tipo_degradacao', 'tipo de degradação vazio',
+                   lambda serie: ~(serie.str.len() >= 1),
+                   "tipo_degradacao IS NULL OR length(tipo_degradacao) < 1"),
+    RegraQualidade('area_km_negativa', 'area_km', 'area_km negativa ou nula',
+                   lambda serie: ~(serie >= 0),
+                   "area_km IS NULL OR area_km < 0"),
+    RegraQualidade('ano_fora_da_faixa', 'ano', 'ano fora de 1980-2030',
+                   lambda serie: ~serie.between(1980, 2030),
+                   "ano IS NULL OR ano NOT BETWEEN 1980 AND 2030"),
+    RegraQualidade('mes_fora_da_faixa', 'mes', 'mês fora de 1-12',
+                   lambda serie: ~serie.between(1, 12),
+                   "mes IS NULL OR mes NOT BETWEEN 1 AND 12"),
+    RegraQualidade('dia_fora_da_faixa', 'dia', 'dia fora de 1-31',
+                   lambda serie: ~serie.between(1, 31),
+                   "dia IS NULL OR dia NOT BETWEEN 1 AND 31"),
+    RegraQualidade('ano_mes_formato', 'ano_mes', 'ano_mes fora do formato AAAA-MM',
+                   lambda serie: ~serie.str.fullmatch(r'\d{4}-\d{2}', na=False),
+                   "ano_mes IS NULL OR ano_mes NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]'"),
+]
+
+
+class ResultadoValidacao:
+    """
+    Contagem de falhas por regra e exemplos das linhas que falharam
+
+    Avaliado como booleano indica se nenhuma regra falhou.
+    """
+
+    def __init__(self, regras, max_exemplos=MAX_EXEMPLOS_FALHA):
+        self.regras = list(regras)
+        self.max_exemplos = max_exemplos
+        self.registros_validados = 0
+        self.falhas = {regra.nome: 0 for regra in self.regras}
+        self.exemplos = {regra.nome: [] for regra in self.regras}
+
+    def registrar(self, regra, quantidade, exemplos):
+        """
+        Soma as falhas de uma regra e guarda exemplos até max_exemplos
+
+        Args:
+            regra: RegraQualidade
+            quantidade: Número de linhas que falharam
+            exemplos: Lista de tuplas (linha, valor)
+        """
+        self.falhas[regra.nome] += quantidade
+        guardados = self.exemplos[regra.nome]
+        guardados.extend(exemplos[:self.max_exemplos - len(guardados)])
+
+    def emitir(self):
+        """
+        Loga o resultado: uma linha por regra com falhas
+        """
+        if self:
+            logging.info(f"✅ Validação da Silver: {self.registros_validados} registros, nenhuma falha")
+            return
+
+        logging.warning(f"⚠️ Validação da Silver: {self.registros_validados} registros, "
+                        f"{sum(self.falhas.values())} falhas")
+        for regra in self.regras:
+            quantidade = self.falhas[regra.nome]
+            if quantidade > 0:
+                exemplos = ', '.join(f"linha {linha}: {valor!r}" for linha, valor in self.exemplos[regra.nome])
+                logging.warning(f"   ⚠️ {quantidade} registros com {regra.descricao} (ex: {exemplos})")
+
+    def __bool__(self):
+        return not any(self.falhas.values())
+
+
+def validar_chunk(df_chunk, resultado):
+    """
+    Aplica as regras a um chunk e acumula as falhas no resultado
+    Só as linhas dos exemplos são materializadas; as demais viram apenas contagem.
+    As linhas dos exemplos são posições na Silver (contadas entre os chunks).
+
+    Args:
+        df_chunk: DataFrame com colunas da Silver (regras de colunas ausentes são ignoradas)
+        resultado: ResultadoValidacao acumulado entre os chunks
+    """
+    deslocamento = resultado.registros_validados
+    resultado.registros_validados += len(df_chunk)
+
+    for regra in resultado.regras:
+        if regra.coluna not in df_chunk.columns:
+            continue
+
+        serie = df_chunk[regra.coluna]
+        falhas = regra.avaliar(serie)
+        quantidade = int(falhas.sum())
+        if quantidade == 0:
+            continue
+
+        posicoes = np.flatnonzero(falhas)[:resultado.max_exemplos]
+        exemplos = list(zip((posicoes + deslocamento).tolist(), serie.iloc[posicoes].tolist()))
+        resultado.registrar(regra, quantidade, exemplos)
+
+
+def validar_em_chunks(chunks, regras=REGRAS_SILVER):
+    """
+    Valida uma sequência de chunks (DataFrames) da Silver
+
+    Args:
+        chunks: Iterável de DataFrames
+        regras: Lista de RegraQualidade
+
+    Returns:
+        ResultadoValidacao
+    """
+    resultado = ResultadoValidacao(regras)
+    for df_chunk in chunks:
+        validar_chunk(df_chunk, resultado)
+
+    return resultado
+
+
+def validar_tabela_sql(conexao, tabela=TABELA_STAGING, regras=REGRAS_SILVER):
+    """
+    Valida uma tabela com as colunas da Silver empurrando as regras para o SQLite
+    As contagens de todas as regras saem de uma única varredura; os exemplos,
+    de uma consulta com LIMIT por regra que falhou.
+
+    Args:
+        conexao: Conexão com o banco
+        tabela: Tabela (ou tabela de staging) com as colunas da Silver
+        regras: Lista de RegraQualidade
+
+    Returns:
+        ResultadoValidacao
+    """
+    cursor = conexao.cursor()
+    colunas = {coluna[1] for coluna in cursor.execute(f"PRAGMA table_info({tabela})")}
+    regras = [regra for regra in regras if regra.coluna in colunas]
+    resultado = ResultadoValidacao(regras)
+
+    somas = ''.join(f",\n            SUM(CASE WHEN {regra.falha_sql} THEN 1 ELSE 0 END)" for regra in regras)
+    cursor.execute(f"SELECT COUNT(*){somas}\n        FROM {tabela}")
+    registros, *falhas = cursor.fetchone()
+    resultado.registros_validados = registros
+
+    for regra, quantidade in zip(regras, falhas):
+        if not quantidade:
+            continue
+
+        cursor.execute(f"SELECT rowid - 1, {regra.coluna} FROM {tabela} WHERE {regra.falha_sql} LIMIT ?",
+                       (resultado.max_exemplos,))
+        resultado.registrar(regra, quantidade, cursor.fetchall())
+
+    return resultado
+
+
+def carregar_staging_silver(conexao, caminho_silver, tamanho_chunk=TAMANHO_CHUNK_SILVER, tabela=TABELA_STAGING):
+    """
+    Copia a Silver, chunk a chunk, para uma tabela de staging no SQLite
+    O rowid - 1 da tabela é a linha de origem na Silver.
+
+    Args:
+        conexao: Conexão com o banco
+        caminho_silver: Caminho para o arquivo Silver
+        tamanho_chunk: Número máximo de registros em memória por vez
+        tabela: Nome da tabela de staging (recriada)
+    """
+    conexao.execute(f"DROP TABLE IF EXISTS {tabela}")
+
+    for df_chunk in ler_camada_silver(caminho_silver, tamanho_chunk=tamanho_chunk, tipos=TIPOS_VALIDACAO_SILVER):
+        df_chunk = df_chunk.assign(data_imagem=df_chunk['data_imagem'].dt.strftime('%Y-%m-%d'))
+        df_chunk.to_sql(tabela, conexao, if_exists='append', index=False)
+
+    conexao.commit()
+
+
+def validar_camada_silver(caminho_silver=DEFAULT_SILVER_PATH, tamanho_chunk=TAMANHO_CHUNK_SILVER, usar_sql=False):
+    """
+    Valida o arquivo da camada Silver com memória limitada ao chunk
+
+    Args:
+        caminho_silver: Caminho para o arquivo Silver (.csv ou .parquet)
+        tamanho_chunk: Número máximo de registros em memória por vez
+        usar_sql: Se True, copia a Silver para uma tabela de staging (banco
+            temporário em disco) e valida em SQL
+
+    Returns:
+        ResultadoValidacao
+    """
+    logging.info("=" * 60)
+    logging.info(f"🔎 VALIDANDO A CAMADA SILVER ({'SQL' if usar_sql else 'chunks'})")
+    logging.info("=" * 60)
+
+    if usar_sql:
+        # Banco temporário em disco, removido ao fechar a conexão
+        conexao = sqlite3.connect('')
+        try:
+            carregar_staging_silver(conexao, caminho_silver, tamanho_chunk)
+            resultado = validar_tabela_sql(conexao)
+        finally:
+            conexao.close()
+    else:
+        resultado = validar_em_chunks(ler_camada_silver(caminho_silver, tamanho_chunk=tamanho_chunk,
+                                                        tipos=TIPOS_VALIDACAO_SILVER))
+
+    resultado.emitir()
+    logging.info("=" * 60)
+
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validação de qualidade da camada Silver")
+    parser.add_argument('caminho_silver', nargs='?', default=DEFAULT_SILVER_PATH)
+    parser.add_argument('--sql', action='store_true', help="valida em SQL sobre uma tabela de staging")
+    argumentos = parser.parse_args()
+
+    configurar_logs(caminho_log=PROJECT_ROOT / 'logs' / 'validate_silver.log')
+    resultado = validar_camada_silver(argumentos.caminho_silver, usar_sql=argumentos.sql)
+
+    sys.exit(0 if resultado else 1)
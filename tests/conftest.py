@@ -0,0 +1,9 @@
+# Os módulos da pipeline são scripts planos (importados como "from utils import ...");
+# o gerador de Silver sintética dos benchmarks também é usado nos testes
+import sys
+from pathlib import Path
+
+RAIZ_SRC = Path(__file__).resolve().parents[1] / 'src'
+
+for pasta in ('pipeline', 'silver', 'benchmarks'):
+    sys.path.insert(0, str(RAIZ_SRC / pasta))
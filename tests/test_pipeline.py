@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+import load_fato_desmatamento
+from materialize_gold import atualizar_gold_materializado, SQL_SELECT_GOLD, TABELA_GOLD
+from run_pipeline import executar_pipeline
+from synthetic_silver import gerar_silver_sintetica
+from utils import conectar_banco
+
+REGISTROS_SILVER = 3000
+
+ARQUIVO_GOLD = 'desmatamento_por_ano_estado.csv'
+
+SQL_GOLD_ORDENADO = SQL_SELECT_GOLD + " ORDER BY ano, safra_ocorrido, estado, regiao, tipo_desmatamento"
+
+TABELAS_CONTADAS = ['DimTempo', 'DimLocalidade', 'DimTipoDegradacao', 'FatoDesmatamento',
+                    'FatoDesmatamentoAnual', 'FatoQueimadas', TABELA_GOLD]
+
+
+@pytest.fixture(scope='module')
+def silver(tmp_path_factory):
+    return gerar_silver_sintetica(tmp_path_factory.mktemp('silver') / 'silver.csv', REGISTROS_SILVER,
+                                  tamanho_chunk=1000)
+
+
+def executar(caminho_csv, pasta, tamanho_chunk=None):
+    resultado = executar_pipeline(caminho_csv, pasta / 'dw.db', pasta / 'gold', tamanho_chunk=tamanho_chunk,
+                                  caminho_metricas=None)
+    assert resultado, resultado.metricas
+    return resultado
+
+
+def consultar(caminho_db, sql):
+    conexao = sqlite3.connect(caminho_db)
+    try:
+        return conexao.execute(sql).fetchall()
+    finally:
+        conexao.close()
+
+
+def contar_tabelas(caminho_db):
+    return {tabela: consultar(caminho_db, f"SELECT COUNT(*) FROM {tabela}")[0][0] for tabela in TABELAS_CONTADAS}
+
+
+def test_recarga_idempotente(silver, tmp_path, monkeypatch):
+    executar(silver, tmp_path)
+    contagens = contar_tabelas(tmp_path / 'dw.db')
+    versoes = consultar(tmp_path / 'dw.db', "SELECT tabela, versao FROM VersaoDados ORDER BY tabela")
+    gold_csv = (tmp_path / 'gold' / ARQUIVO_GOLD).read_bytes()
+
+    # Registros enviados ao INSERT da fato na recarga
+    inserir_original = load_fato_desmatamento.inserir_fatos_em_lotes
+    enviados = []
+
+    def inserir_contando(conexao, df_fato, *args, **kwargs):
+        enviados.append(len(df_fato))
+        return inserir_original(conexao, df_fato, *args, **kwargs)
+
+    monkeypatch.setattr(load_fato_desmatamento, 'inserir_fatos_em_lotes', inserir_contando)
+    resultado = executar(silver, tmp_path)
+
+    # Os registros já carregados são descartados antes do INSERT
+    assert sum(enviados) == 0
+    metricas_fato = next(metrica for metrica in resultado.metricas if metrica['etapa'] == 'fato_desmatamento')
+    assert metricas_fato['registros_lidos'] == REGISTROS_SILVER
+    assert metricas_fato['registros_inseridos'] == 0
+
+    assert contagens['FatoDesmatamento'] == REGISTROS_SILVER
+    assert contar_tabelas(tmp_path / 'dw.db') == contagens
+    # Nenhuma tabela mudou de conteúdo na segunda carga
+    assert consultar(tmp_path / 'dw.db', "SELECT tabela, versao FROM VersaoDados ORDER BY tabela") == versoes
+    assert (tmp_path / 'gold' / ARQUIVO_GOLD).read_bytes() == gold_csv
+
+
+def test_streaming_igual_carga_em_memoria(silver, tmp_path):
+    pasta_memoria, pasta_streaming = tmp_path / 'memoria', tmp_path / 'streaming'
+    executar(silver, pasta_memoria)
+    executar(silver, pasta_streaming, tamanho_chunk=700)
+
+    assert contar_tabelas(pasta_streaming / 'dw.db') == contar_tabelas(pasta_memoria / 'dw.db')
+    assert (consultar(pasta_streaming / 'dw.db', SQL_GOLD_ORDENADO)
+            == consultar(pasta_memoria / 'dw.db', SQL_GOLD_ORDENADO))
+    assert (pasta_streaming / 'gold' / ARQUIVO_GOLD).read_bytes() == (pasta_memoria / 'gold' / ARQUIVO_GOLD).read_bytes()
+
+
+def test_gold_incremental_igual_reconstrucao_completa(silver, tmp_path):
+    # Primeira carga com parte da Silver; a segunda traz os fatos restantes
+    parcial = tmp_path / 'silver_parcial.csv'
+    with open(silver, encoding='utf-8') as origem:
+        parcial.write_text(''.join(origem.readlines()[:REGISTROS_SILVER * 2 // 3 + 1]), encoding='utf-8')
+
+    executar(parcial, tmp_path)
+    executar(silver, tmp_path)
+    caminho_db = tmp_path / 'dw.db'
+    gold_incremental = consultar(caminho_db, SQL_GOLD_ORDENADO)
+
+    conexao = conectar_banco(caminho_db)
+    try:
+        conexao.execute("DELETE FROM ControleGold WHERE tabela = ?", (TABELA_GOLD,))
+        conexao.commit()
+        atualizar_gold_materializado(conexao=conexao)
+    finally:
+        conexao.close()
+
+    assert consultar(caminho_db, "SELECT COUNT(*) FROM FatoDesmatamento")[0][0] == REGISTROS_SILVER
+    assert consultar(caminho_db, SQL_GOLD_ORDENADO) == gold_incremental
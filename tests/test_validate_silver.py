@@ -0,0 +1,43 @@
+import pytest
+
+from validate_silver import validar_camada_silver
+
+CABECALHO = 'estado,tipo_degradacao,data_imagem,area_km,ano,mes,dia,ano_mes,semestre\n'
+
+
+@pytest.fixture
+def silver_suja(tmp_path):
+    caminho = tmp_path / 'silver.csv'
+    caminho.write_text(
+        CABECALHO
+        + 'MT,cicatriz de queimada,2023-07-27,0.08,2023,7,27,2023-07,2\n'
+        + 'PA,desmatamento,2023-08-01,1.5,2023,,1,2023-08,2\n'        # mes nulo
+        + 'AMZ,,2023-08-02,-3.0,2050,13,300,2023-8,2\n'              # fora da faixa
+        + 'RO,degradacao,2023-09-10,0.5,,9,,2023-09,2\n',             # ano e dia nulos
+        encoding='utf-8')
+    return caminho
+
+
+@pytest.mark.parametrize('usar_sql', [False, True])
+def test_nulos_e_fora_da_faixa_sao_contados(silver_suja, usar_sql):
+    resultado = validar_camada_silver(silver_suja, tamanho_chunk=2, usar_sql=usar_sql)
+
+    assert not resultado
+    assert resultado.registros_validados == 4
+    assert resultado.falhas == {
+        'estado_uf': 1,
+        'tipo_degradacao_vazio': 1,
+        'area_km_negativa': 1,
+        'ano_fora_da_faixa': 2,
+        'mes_fora_da_faixa': 2,
+        'dia_fora_da_faixa': 2,
+        'ano_mes_formato': 1,
+    }
+    assert [linha for linha, _ in resultado.exemplos['mes_fora_da_faixa']] == [1, 2]
+
+
+def test_silver_limpa_passa(tmp_path):
+    caminho = tmp_path / 'silver.csv'
+    caminho.write_text(CABECALHO + 'MT,cicatriz de queimada,2023-07-27,0.08,2023,7,27,2023-07,2\n', encoding='utf-8')
+
+    assert validar_camada_silver(caminho)